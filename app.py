@@ -26,41 +26,51 @@ import matplotlib
 matplotlib.use('Agg')
 import os
 import sys
-import traceback
-from datetime import date, datetime
-from typing import Optional, Tuple, List, Dict
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from string import Template
+from datetime import date
+from typing import Optional, Tuple, List, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+from PIL import Image
 
 # FastAPI & Gradio
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 import gradio as gr
 
 # Configuration
 from config import (
     APP_VERSION, APP_TITLE, APP_DESCRIPTION, CONTACT_WA, BASE_URL,
     BASE_DIR, STATIC_DIR, OUTPUTS_DIR, PYGROWUP_DIR,
-    UI_THEMES, PREMIUM_PACKAGES, MOTIVATIONAL_QUOTES
+    UI_THEMES, PREMIUM_PACKAGES, MOTIVATIONAL_QUOTES, WARM_NORMAL_RANGES
 )
 
 # Utilities
 from modules.utilities import (
     as_float, parse_date, calculate_age_from_dates, calculate_age_text,
     z_to_percentile, format_zscore, get_zscore_color, get_zscore_status_emoji,
-    validate_anthropometry, get_random_quote, get_sex_code, get_sex_text
+    validate_anthropometry, validate_anthropometry_vec, get_random_quote,
+    get_sex_code, get_sex_text, log_exception
 )
 
 # WHO Calculator
 from modules.who_calculator import (
-    calculate_all_zscores, classify_permenkes_2020, classify_who_standards,
-    validate_zscores, get_normal_ranges
+    calculate_all_zscores, compute_and_classify, get_normal_ranges, warm_normal_ranges,
+    calculate_all_zscores_vec, classify_permenkes_2020_vec
 )
 
 # Growth Charts
 from modules.growth_charts import (
     plot_weight_for_age, plot_height_for_age, 
     plot_head_circumference_for_age, plot_weight_for_length,
-    plot_zscore_summary_bars, cleanup_matplotlib_figures
+    plot_zscore_summary_bars, cleanup_matplotlib_figures, figure_to_pil,
+    render_growth_chart_svg, SVG_CHART_SPECS
 )
 
 # Checklist
@@ -86,16 +96,13 @@ from modules.mother import (
 
 # Kejar Tumbuh
 from modules.kejar_tumbuh import (
-    analyze_growth_velocity, kalkulator_kejar_tumbuh_handler
+    analyze_growth_velocity, kalkulator_kejar_tumbuh_handler, parse_measurement_text
 )
 
 # Library
-from modules.library import generate_library_html, get_article_html
+from modules.library import iter_library_html, get_article_html
 
-# PDF Export
-from modules.pdf_export import (
-    generate_growth_report_pdf, export_data_to_csv
-)
+# PDF Export (ReportLab) is imported lazily inside the export handlers
 
 # Data
 from data.articles import ARTIKEL_DATABASE, search_articles, get_categories
@@ -106,7 +113,9 @@ from data.kpsp import get_kpsp_questions_for_month
 # FASTAPI SETUP
 # ==============================================================================
 
-app = FastAPI(
+# Bare FastAPI app; the module attribute `app` (see __getattr__ at the end)
+# is this app with the Gradio interface mounted
+api = FastAPI(
     title=APP_TITLE,
     description=APP_DESCRIPTION,
     version=APP_VERSION
@@ -114,28 +123,56 @@ app = FastAPI(
 
 # Mount static files
 if os.path.exists(STATIC_DIR):
-    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+    api.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 if os.path.exists(OUTPUTS_DIR):
-    app.mount("/outputs", StaticFiles(directory=OUTPUTS_DIR), name="outputs")
+    api.mount("/outputs", StaticFiles(directory=OUTPUTS_DIR), name="outputs")
 
 # ==============================================================================
 # GLOBAL STATE
 # ==============================================================================
 
-# Store data untuk multi-measurement (kejar tumbuh)
-measurement_history = []
+# Worker threads for the five independent WHO charts
+CHART_POOL = ThreadPoolExecutor(max_workers=5, thread_name_prefix="chart")
+
+# Single worker for startup cache warming
+BACKGROUND_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
 
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
 
-def get_theme_css(theme_name: str = "pink_pastel") -> str:
-    """Generate CSS for selected theme"""
+# Cached HTML below this size is interned so repeated hits share one object
+_INTERN_MAX_LEN = 4096
+
+
+def memoize_html(maxsize: int = 64):
+    """
+    lru_cache for deterministic HTML generators with small, hashable inputs
+    
+    Args:
+        maxsize: Maximum number of cached results
+        
+    Returns:
+        Decorator wrapping the generator in an LRU cache
+    """
+    def decorator(func):
+        @lru_cache(maxsize=maxsize)
+        @wraps(func)
+        def cached(*args):
+            html = func(*args)
+            if isinstance(html, str) and len(html) < _INTERN_MAX_LEN:
+                html = sys.intern(html)
+            return html
+        return cached
+    return decorator
+
+
+def _build_theme_css(theme_name: str) -> str:
+    """Generate the stylesheet body for selected theme"""
     theme = UI_THEMES.get(theme_name, UI_THEMES["pink_pastel"])
     
     return f"""
-    <style>
         :root {{
             --primary-color: {theme['primary']};
             --secondary-color: {theme['secondary']};
@@ -167,14 +204,219 @@ def get_theme_css(theme_name: str = "pink_pastel") -> str:
             border-radius: 15px;
             margin-bottom: 20px;
         }}
-    </style>
     """
 
+
+# UI_THEMES is static, so every theme stylesheet is rendered once at import
+THEME_CSS = {name: f"<style>{_build_theme_css(name)}</style>" for name in UI_THEMES}
+
+# Theme stylesheets are also written under /static so browsers can cache them
+THEMES_STATIC_DIR = os.path.join(STATIC_DIR, "themes")
+
+
+def write_theme_stylesheets() -> None:
+    """Render every theme to static/themes/<name>.css"""
+    try:
+        os.makedirs(THEMES_STATIC_DIR, exist_ok=True)
+        for name in UI_THEMES:
+            with open(os.path.join(THEMES_STATIC_DIR, f"{name}.css"), 'w', encoding='utf-8') as f:
+                f.write(_build_theme_css(name))
+    except OSError as e:
+        print(f"❌ Error in write_theme_stylesheets: {e}")
+
+
+def get_theme_css(theme_name: str = "pink_pastel") -> str:
+    """Get the precomputed CSS for selected theme"""
+    return THEME_CSS.get(theme_name, THEME_CSS["pink_pastel"])
+
+
+def get_theme_link(theme_name: str = "pink_pastel") -> str:
+    """Get a <link> tag for the browser-cacheable stylesheet of selected theme"""
+    if theme_name not in UI_THEMES:
+        theme_name = "pink_pastel"
+    return f"<link rel='stylesheet' href='/static/themes/{theme_name}.css'>"
+
+# ==============================================================================
+# HTML TEMPLATES (compiled once at import)
+# ==============================================================================
+
+# Dropdown choices (fixed for the process lifetime)
+THEME_CHOICES = tuple(UI_THEMES)
+CATEGORY_CHOICES = ("Semua Kategori", *get_categories())
+
+# Static page header/footer (config values are fixed for the process lifetime)
+# Built once and interned: forked workers share these long constants copy-on-write
+APP_HEADER_HTML = sys.intern(f"""
+    <div style='background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 50%, #fecfef 100%);
+                padding: 30px; border-radius: 20px; text-align: center; margin-bottom: 20px;'>
+        <h1 style='color: #c2185b; margin: 0; font-size: 2.5em;'>🍼 {APP_TITLE}</h1>
+        <p style='color: #880e4f; margin: 10px 0 0 0; font-size: 1.1em;'>
+            {APP_DESCRIPTION}
+        </p>
+        <p style='color: #666; margin: 5px 0 0 0; font-size: 0.9em;'>
+            Versi {APP_VERSION} | Standar WHO 2006 & Permenkes RI 2020
+        </p>
+    </div>
+    """)
+
+APP_FOOTER_HTML = sys.intern(f"""
+    <div style='margin-top: 30px; padding: 20px; background: #f5f5f5; 
+                border-radius: 15px; text-align: center;'>
+        <p style='margin: 0; color: #666;'>
+            <strong>{APP_TITLE}</strong> v{APP_VERSION}<br>
+            Dibuat dengan ❤️ untuk Ibu dan Anak Indonesia<br>
+            📞 Kontak: {CONTACT_WA}
+        </p>
+        <p style='margin: 10px 0 0 0; color: #888; font-size: 0.85em;'>
+            ⚠️ Aplikasi ini untuk edukasi. Selalu konsultasikan ke tenaga kesehatan.
+        </p>
+    </div>
+    """)
+
+WHO_RESULT_HEADER_TPL = Template("""
+        <div style='background: linear-gradient(135deg, ${primary}44 0%, ${secondary}44 100%);
+                    padding: 25px; border-radius: 20px; margin-bottom: 20px;'>
+            <h2 style='color: ${primary}; margin: 0 0 10px 0;'>
+                📊 Hasil Analisis Pertumbuhan
+            </h2>
+            <p style='color: #666; margin: 0;'>
+                <strong>${nama}</strong> | ${jenis_kelamin} | ${age_text}
+            </p>
+        </div>
+        """)
+
+WHO_MEASUREMENTS_TPL = Template("""
+        <div style='background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
+                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
+            <h3 style='color: #333; margin: 0 0 15px 0;'>📏 Data Pengukuran</h3>
+            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px;'>
+                <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Berat Badan</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #1565c0;'>${bb} kg</div>
+                </div>
+                <div style='background: #e8f5e9; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Tinggi/Panjang Badan</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #2e7d32;'>${tb} cm</div>
+                </div>
+        ${head_circ}</div></div>""")
+
+WHO_HEAD_CIRC_TPL = Template("""
+                <div style='background: #fff3e0; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Lingkar Kepala</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #e65100;'>${lk} cm</div>
+                </div>
+            """)
+
+WHO_SECTION_OPEN_TPL = Template("""
+        <div style='background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
+                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
+            <h3 style='color: #333; margin: 0 0 15px 0;'>${title}</h3>
+            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(${min_width}px, 1fr)); gap: 15px;'>
+        """)
+
+WHO_ZSCORE_CARD_TPL = Template("""
+                <div style='background: ${color}22; padding: 15px; border-radius: 10px; 
+                            border-left: 4px solid ${color};'>
+                    <div style='font-size: 0.85em; color: #666;'>${label}</div>
+                    <div style='font-size: 1.8em; font-weight: bold; color: ${color};'>
+                        ${emoji} ${zscore}
+                    </div>
+                    <div style='font-size: 0.8em; color: #888;'>Persentil: ${percentile}%</div>
+                </div>
+                """)
+
+WHO_STATUS_CARD_TPL = Template("""
+            <div style='background: #f5f5f5; padding: 12px; border-radius: 8px;'>
+                <div style='font-size: 0.85em; color: #666;'>${category}</div>
+                <div style='font-weight: bold; color: ${color};'>${status}</div>
+            </div>
+            """)
+
+WHO_WARNINGS_TPL = Template("""
+            <div style='background: #fff3e0; padding: 15px; border-radius: 10px; margin-bottom: 20px;
+                        border-left: 4px solid #ff9800;'>
+                <h4 style='color: #e65100; margin: 0 0 10px 0;'>⚠️ Perhatian</h4>
+                <ul style='margin: 0; padding-left: 20px;'>
+            ${items}</ul></div>""")
+
+WHO_QUOTE_TPL = Template("""
+        <div style='background: linear-gradient(135deg, ${primary}22, ${secondary}22);
+                    padding: 15px; border-radius: 10px; text-align: center; font-style: italic; color: #666;'>
+            💬 "${quote}"
+        </div>
+        """)
+
+SECTION_CLOSE_HTML = "</div></div>"
+
+# Theme-dependent inline styles, pre-filled per theme:
+# THEME_INLINE[(theme, 'header' | 'quote')] -> Template
+THEME_INLINE = {}
+for _name, _theme in UI_THEMES.items():
+    for _part, _tpl in (('header', WHO_RESULT_HEADER_TPL), ('quote', WHO_QUOTE_TPL)):
+        THEME_INLINE[(_name, _part)] = Template(
+            _tpl.safe_substitute(primary=_theme['primary'], secondary=_theme['secondary'])
+        )
+
+ZSCORE_LABELS = {
+    'waz': ('BB/U', 'Berat untuk Usia'),
+    'haz': ('TB/U', 'Tinggi untuk Usia'),
+    'whz': ('BB/TB', 'Berat untuk Tinggi'),
+    'baz': ('IMT/U', 'BMI untuk Usia'),
+    'hcz': ('LK/U', 'Lingkar Kepala untuk Usia')
+}
+
+NORMAL_RANGES_HEADER_TPL = Template("""
+        <div style='background: linear-gradient(135deg, #e8f5e9 0%, #c8e6c9 100%);
+                    padding: 20px; border-radius: 15px; margin-bottom: 20px;'>
+            <h2 style='color: #2e7d32; margin: 0;'>📋 Rentang Normal untuk Usia ${age} Bulan</h2>
+            <p style='color: #1b5e20; margin: 5px 0 0 0;'>${jenis_kelamin}</p>
+        </div>
+        
+        <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px;'>
+        """)
+
+NORMAL_RANGE_CARD_TPL = Template("""
+        <div style='background: white; padding: 20px; border-radius: 15px; 
+                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
+            <h3 style='color: ${color}; margin: 0 0 15px 0;'>${title}</h3>
+            <div style='text-align: center; padding: 15px; background: ${bg}; border-radius: 10px;'>
+                <div style='font-size: 1.8em; font-weight: bold; color: ${color};'>
+                    ${min_normal} - ${max_normal} ${unit}
+                </div>
+                <div style='color: #666; font-size: 0.9em;'>Median: ${median} ${unit}</div>
+            </div>
+        </div>
+        """)
+
+NORMAL_RANGES_FOOTER_HTML = """
+        </div>
+        <p style='margin-top: 20px; color: #666; font-size: 0.9em; text-align: center;'>
+            📌 Rentang normal = Z-score -2 SD hingga +2 SD berdasarkan standar WHO 2006
+        </p>
+        """
+
+# (ranges key, title, text color, background, unit)
+NORMAL_RANGE_CARDS = (
+    ('weight', '⚖️ Berat Badan', '#1565c0', '#e3f2fd', 'kg'),
+    ('height', '📏 Tinggi Badan', '#2e7d32', '#e8f5e9', 'cm'),
+    ('head_circ', '🎯 Lingkar Kepala', '#e65100', '#fff3e0', 'cm'),
+)
+
 # ==============================================================================
 # KALKULATOR WHO - MAIN HANDLER
 # ==============================================================================
 
-def kalkulator_who_handler(
+def _render_chart(plot_func, payload: Dict, theme: str):
+    """Plot one chart, render it to an in-memory PIL image and release the figure"""
+    fig = plot_func(payload, theme)
+    try:
+        return figure_to_pil(fig)
+    finally:
+        cleanup_matplotlib_figures(fig)
+
+
+
+async def kalkulator_who_handler(
     nama: str,
     tgl_lahir: str,
     tgl_ukur: str,
@@ -183,12 +425,14 @@ def kalkulator_who_handler(
     tinggi_badan: str,
     lingkar_kepala: str,
     theme: str = "pink_pastel"
-) -> Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]:
+) -> Tuple[str, Optional[Image.Image], Optional[Image.Image], Optional[Image.Image],
+           Optional[Image.Image], Optional[Image.Image]]:
     """
     Main handler for WHO Calculator
     
     Returns:
         Tuple of (hasil_html, wfa_plot, hfa_plot, hcfa_plot, wfl_plot, summary_plot)
+        with the plots as in-memory PIL images
     """
     try:
         # Parse inputs
@@ -218,166 +462,298 @@ def kalkulator_who_handler(
         
         # Validate measurements
         sex_code = get_sex_code(jenis_kelamin)
-        validation = validate_anthropometry(bb, tb, lk, age_months, sex_code)
+        input_errors, input_warnings = validate_anthropometry(age_months, bb, tb, lk)
         
-        if not validation['valid']:
-            warnings = "<br>".join(validation['warnings'])
-            return (f"⚠️ Data pengukuran tidak valid:<br>{warnings}", 
+        if input_errors:
+            errors = "<br>".join(input_errors)
+            return (f"⚠️ Data pengukuran tidak valid:<br>{errors}", 
                     None, None, None, None, None)
         
-        # Calculate Z-scores
-        zscores = calculate_all_zscores(
+        # Z-scores, classifications and validation in one pass
+        report = compute_and_classify(
             weight=bb,
             height=tb,
             head_circ=lk,
             age_months=age_months,
             sex=sex_code
         )
+        zscores = report.zscores
         
         if not zscores or all(v is None for v in zscores.values()):
             return ("⚠️ Tidak dapat menghitung Z-score. Periksa data input.", 
                     None, None, None, None, None)
         
-        # Classifications
-        permenkes = classify_permenkes_2020(zscores)
-        who_class = classify_who_standards(zscores)
-        zscore_validation = validate_zscores(zscores)
+        permenkes = report.permenkes
+        zscore_errors, zscore_warnings = report.errors, report.warnings
         
         # Generate result HTML
-        theme_data = UI_THEMES.get(theme, UI_THEMES["pink_pastel"])
+        if theme not in UI_THEMES:
+            theme = "pink_pastel"
         
-        html = f"""
-        <div style='background: linear-gradient(135deg, {theme_data['primary']}44 0%, {theme_data['secondary']}44 100%);
-                    padding: 25px; border-radius: 20px; margin-bottom: 20px;'>
-            <h2 style='color: {theme_data['primary']}; margin: 0 0 10px 0;'>
-                📊 Hasil Analisis Pertumbuhan
-            </h2>
-            <p style='color: #666; margin: 0;'>
-                <strong>{nama or 'Anak'}</strong> | {jenis_kelamin} | {age_text}
-            </p>
-        </div>
-        """
+        parts = [
+            THEME_INLINE[(theme, 'header')].substitute(
+                nama=nama or 'Anak', jenis_kelamin=jenis_kelamin, age_text=age_text
+            ),
+            # Data Pengukuran
+            WHO_MEASUREMENTS_TPL.substitute(
+                bb=f"{bb:.2f}", tb=f"{tb:.1f}",
+                head_circ=WHO_HEAD_CIRC_TPL.substitute(lk=f"{lk:.1f}") if lk else ""
+            ),
+            # Z-Scores
+            WHO_SECTION_OPEN_TPL.substitute(title="📈 Nilai Z-Score", min_width=180),
+        ]
         
-        # Data Pengukuran
-        html += f"""
-        <div style='background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-            <h3 style='color: #333; margin: 0 0 15px 0;'>📏 Data Pengukuran</h3>
-            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px;'>
-                <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; text-align: center;'>
-                    <div style='font-size: 0.9em; color: #666;'>Berat Badan</div>
-                    <div style='font-size: 1.5em; font-weight: bold; color: #1565c0;'>{bb:.2f} kg</div>
-                </div>
-                <div style='background: #e8f5e9; padding: 15px; border-radius: 10px; text-align: center;'>
-                    <div style='font-size: 0.9em; color: #666;'>Tinggi/Panjang Badan</div>
-                    <div style='font-size: 1.5em; font-weight: bold; color: #2e7d32;'>{tb:.1f} cm</div>
-                </div>
-        """
-        
-        if lk:
-            html += f"""
-                <div style='background: #fff3e0; padding: 15px; border-radius: 10px; text-align: center;'>
-                    <div style='font-size: 0.9em; color: #666;'>Lingkar Kepala</div>
-                    <div style='font-size: 1.5em; font-weight: bold; color: #e65100;'>{lk:.1f} cm</div>
-                </div>
-            """
-        
-        html += "</div></div>"
-        
-        # Z-Scores
-        html += """
-        <div style='background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-            <h3 style='color: #333; margin: 0 0 15px 0;'>📈 Nilai Z-Score</h3>
-            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 15px;'>
-        """
-        
-        zscore_labels = {
-            'waz': ('BB/U', 'Berat untuk Usia'),
-            'haz': ('TB/U', 'Tinggi untuk Usia'),
-            'whz': ('BB/TB', 'Berat untuk Tinggi'),
-            'baz': ('IMT/U', 'BMI untuk Usia'),
-            'hcz': ('LK/U', 'Lingkar Kepala untuk Usia')
-        }
-        
-        for key, (short, full) in zscore_labels.items():
+        for key, (short, full) in ZSCORE_LABELS.items():
             z = zscores.get(key)
             if z is not None:
-                color = get_zscore_color(z)
-                emoji = get_zscore_status_emoji(z)
-                percentile = z_to_percentile(z)
-                
-                html += f"""
-                <div style='background: {color}22; padding: 15px; border-radius: 10px; 
-                            border-left: 4px solid {color};'>
-                    <div style='font-size: 0.85em; color: #666;'>{full}</div>
-                    <div style='font-size: 1.8em; font-weight: bold; color: {color};'>
-                        {emoji} {format_zscore(z)}
-                    </div>
-                    <div style='font-size: 0.8em; color: #888;'>Persentil: {percentile:.1f}%</div>
-                </div>
-                """
+                parts.append(WHO_ZSCORE_CARD_TPL.substitute(
+                    color=get_zscore_color(z),
+                    label=full,
+                    emoji=get_zscore_status_emoji(z),
+                    zscore=format_zscore(z),
+                    percentile=f"{z_to_percentile(z):.1f}"
+                ))
         
-        html += "</div></div>"
+        parts.append(SECTION_CLOSE_HTML)
         
         # Klasifikasi Permenkes
-        html += f"""
-        <div style='background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-            <h3 style='color: #333; margin: 0 0 15px 0;'>🏥 Klasifikasi (Permenkes RI 2020)</h3>
-            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px;'>
-        """
-        
+        parts.append(WHO_SECTION_OPEN_TPL.substitute(
+            title="🏥 Klasifikasi (Permenkes RI 2020)", min_width=200
+        ))
         for category, status in permenkes.items():
             status_color = "#388e3c" if "Normal" in status else "#f57c00" if "Risiko" in status else "#d32f2f"
-            html += f"""
-            <div style='background: #f5f5f5; padding: 12px; border-radius: 8px;'>
-                <div style='font-size: 0.85em; color: #666;'>{category}</div>
-                <div style='font-weight: bold; color: {status_color};'>{status}</div>
-            </div>
-            """
-        
-        html += "</div></div>"
+            parts.append(WHO_STATUS_CARD_TPL.substitute(
+                category=category, color=status_color, status=status
+            ))
+        parts.append(SECTION_CLOSE_HTML)
         
         # Warnings if any
-        if zscore_validation['warnings']:
-            html += """
-            <div style='background: #fff3e0; padding: 15px; border-radius: 10px; margin-bottom: 20px;
-                        border-left: 4px solid #ff9800;'>
-                <h4 style='color: #e65100; margin: 0 0 10px 0;'>⚠️ Perhatian</h4>
-                <ul style='margin: 0; padding-left: 20px;'>
-            """
-            for warning in zscore_validation['warnings']:
-                html += f"<li style='margin: 5px 0;'>{warning}</li>"
-            html += "</ul></div>"
+        attention = zscore_errors + input_warnings + zscore_warnings
+        if attention:
+            parts.append(WHO_WARNINGS_TPL.substitute(
+                items="".join(f"<li style='margin: 5px 0;'>{msg}</li>" for msg in attention)
+            ))
         
         # Motivational quote
-        quote = get_random_quote()
-        html += f"""
-        <div style='background: linear-gradient(135deg, {theme_data['primary']}22, {theme_data['secondary']}22);
-                    padding: 15px; border-radius: 10px; text-align: center; font-style: italic; color: #666;'>
-            💬 "{quote}"
-        </div>
-        """
+        parts.append(THEME_INLINE[(theme, 'quote')].substitute(quote=get_random_quote()))
+        
+        html = "".join(parts)
         
         # Generate plots
-        wfa_plot = plot_weight_for_age(age_months, bb, sex_code, theme)
-        hfa_plot = plot_height_for_age(age_months, tb, sex_code, theme)
-        hcfa_plot = plot_head_circumference_for_age(age_months, lk, sex_code, theme) if lk else None
-        wfl_plot = plot_weight_for_length(tb, bb, sex_code, theme)
-        summary_plot = plot_zscore_summary_bars(zscores, theme)
+        payload = {
+            'sex': sex_code,
+            'age_mo': age_months,
+            'w': bb,
+            'h': tb,
+            'hc': lk,
+            'z': zscores,
+            'name_child': nama or 'Anak'
+        }
+        
+        chart_plan = {
+            'wfa': plot_weight_for_age,
+            'hfa': plot_height_for_age,
+            'hcfa': plot_head_circumference_for_age if lk else None,
+            'wfl': plot_weight_for_length,
+            'summary': plot_zscore_summary_bars,
+        }
         
-        # Cleanup
-        cleanup_matplotlib_figures()
+        # Render off the event loop; awaiting keeps other requests flowing
+        loop = asyncio.get_running_loop()
+        
+        async def render(plot_func):
+            if plot_func is None:
+                return None
+            return await loop.run_in_executor(CHART_POOL, _render_chart, plot_func, payload, theme)
+        
+        wfa_plot, hfa_plot, hcfa_plot, wfl_plot, summary_plot = await asyncio.gather(
+            *(render(chart_plan[key]) for key in ('wfa', 'hfa', 'hcfa', 'wfl', 'summary'))
+        )
         
         return (html, wfa_plot, hfa_plot, hcfa_plot, wfl_plot, summary_plot)
         
     except Exception as e:
-        print(f"❌ Error in kalkulator_who_handler: {e}")
-        traceback.print_exc()
+        log_exception("kalkulator_who_handler", e)
         return (f"❌ Terjadi kesalahan: {str(e)}", None, None, None, None, None)
 
 
+# ==============================================================================
+# KALKULATOR WHO - BATCH (CSV) HANDLER
+# ==============================================================================
+
+BATCH_ZSCORE_COLUMNS = {
+    'waz': 'Z_BB_U',
+    'haz': 'Z_TB_U',
+    'whz': 'Z_BB_TB',
+    'baz': 'Z_IMT_U',
+    'hcz': 'Z_LK_U'
+}
+
+BATCH_STATUS_COLUMNS = {
+    'waz': 'Status_BB_U',
+    'haz': 'Status_TB_U',
+    'whz': 'Status_BB_TB',
+    'baz': 'Status_IMT_U',
+    'hcz': 'Status_LK_U'
+}
+
+
+# Accepted jenis_kelamin labels (upper-cased); anything else is invalid
+BATCH_SEX_CODES = {
+    'L': 'M', 'M': 'M', 'LAKI-LAKI': 'M',
+    'P': 'F', 'F': 'F', 'PEREMPUAN': 'F',
+}
+
+
+def _batch_numeric_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Read a numeric CSV column (accepting comma decimals) as a float array"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    values = df[column].astype(str).str.replace(",", ".", regex=False).str.strip()
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _batch_date_column(df: pd.DataFrame, column: str) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Parse a date column with the single-child rules (parse_date), row by row
+    
+    Returns:
+        Tuple of (datetime64 series, NaT where empty or invalid; mask of
+        non-empty values that could not be parsed)
+    """
+    raw = df[column].fillna('').astype(str).str.strip()
+    dates = pd.to_datetime(raw.map(parse_date), errors='coerce')
+    return dates, (raw != '').to_numpy() & dates.isna().to_numpy()
+
+
+def kalkulator_who_batch_handler(csv_file) -> Tuple[str, Optional[str]]:
+    """
+    Batch handler for WHO Calculator (many children from one CSV file)
+    
+    Expected columns: nama, jenis_kelamin, berat_badan, tinggi_badan,
+    lingkar_kepala (opsional) and either usia_bulan or tgl_lahir + tgl_ukur.
+    
+    Returns:
+        Tuple of (summary_html, result_csv_path)
+    """
+    try:
+        if csv_file is None:
+            return "⚠️ Unggah file CSV terlebih dahulu.", None
+        
+        csv_path = getattr(csv_file, 'name', csv_file)
+        df = pd.read_csv(csv_path, sep=None, engine='python', dtype=str)
+        df.columns = [str(c).strip().lower() for c in df.columns]
+        
+        if df.empty:
+            return "⚠️ File CSV kosong.", None
+        
+        if 'jenis_kelamin' not in df.columns:
+            return "⚠️ Kolom jenis_kelamin wajib ada di file CSV.", None
+        
+        # Age: usia_bulan directly, or derived from tgl_lahir / tgl_ukur
+        bad_date = np.zeros(len(df), dtype=bool)
+        if 'usia_bulan' in df.columns:
+            age_months = _batch_numeric_column(df, 'usia_bulan')
+        elif 'tgl_lahir' in df.columns:
+            dob, _ = _batch_date_column(df, 'tgl_lahir')
+            bad_date = dob.isna().to_numpy()
+            if 'tgl_ukur' in df.columns:
+                # An empty tgl_ukur means measured today
+                measured, bad_measured = _batch_date_column(df, 'tgl_ukur')
+                measured = measured.fillna(pd.Timestamp(date.today()))
+                bad_date |= bad_measured
+            else:
+                measured = pd.Series(pd.Timestamp(date.today()), index=df.index)
+            age_months = np.round((measured - dob).dt.days.to_numpy(dtype=np.float64) / 30.4375, 2)
+            age_months[bad_date] = np.nan
+        else:
+            return "⚠️ Kolom usia_bulan atau tgl_lahir wajib ada di file CSV.", None
+        
+        bb = _batch_numeric_column(df, 'berat_badan')
+        tb = _batch_numeric_column(df, 'tinggi_badan')
+        lk = _batch_numeric_column(df, 'lingkar_kepala')
+        sex_codes = df['jenis_kelamin'].fillna('').str.strip().str.upper().map(BATCH_SEX_CODES)
+        known_sex = sex_codes.notna().to_numpy()
+        sex = sex_codes.fillna('M').to_numpy(dtype=str)
+        
+        # Implausible rows, unknown sex and out-of-range ages are excluded from the WHO analysis
+        invalid, warning_codes = validate_anthropometry_vec(age_months, bb, tb, lk)
+        invalid |= ~known_sex
+        valid_age = (age_months >= 0) & (age_months <= 60)
+        excluded = invalid | ~valid_age | bad_date
+        
+        zscores = calculate_all_zscores_vec(bb, tb, lk, np.where(valid_age, age_months, np.nan), sex)
+        for values in zscores.values():
+            values[excluded] = np.nan
+        permenkes = classify_permenkes_2020_vec(zscores)
+        
+        result = {
+            'nama': df['nama'].fillna('').to_numpy(dtype=str) if 'nama' in df.columns
+                    else np.array([f"Anak {i + 1}" for i in range(len(df))]),
+            'usia_bulan': age_months,
+            'berat_badan': bb,
+            'tinggi_badan': tb,
+            'lingkar_kepala': lk,
+        }
+        for key, column in BATCH_ZSCORE_COLUMNS.items():
+            result[column] = zscores[key]
+        for key, column in BATCH_STATUS_COLUMNS.items():
+            result[column] = permenkes[key]
+        result['Validasi'] = np.select(
+            [bad_date, invalid, ~valid_age, warning_codes != 0],
+            ["Tanggal tidak valid", "Data tidak valid", "Usia di luar 0-60 bulan", "Perlu verifikasi ulang"],
+            default="OK"
+        )
+        
+        # Unique name: OUTPUTS_DIR is served publicly, so two uploads in the
+        # same second must not share (and overwrite) one result file
+        with tempfile.NamedTemporaryFile(dir=OUTPUTS_DIR, prefix="batch_zscore_",
+                                         suffix=".csv", delete=False) as handle:
+            output_path = handle.name
+        from modules.pdf_export import write_columns_csv
+        write_columns_csv(output_path, result)
+        
+        # Summary HTML
+        total = len(df)
+        stunted = int(np.count_nonzero(zscores['haz'] < -2))
+        wasted = int(np.count_nonzero(zscores['whz'] < -2))
+        underweight = int(np.count_nonzero(zscores['waz'] < -2))
+        
+        html = f"""
+        <div style='background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
+                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
+            <h3 style='color: #333; margin: 0 0 15px 0;'>📂 Hasil Analisis Massal</h3>
+            <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); gap: 15px;'>
+                <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Jumlah Anak</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #1565c0;'>{total}</div>
+                </div>
+                <div style='background: #ffebee; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Stunting (TB/U &lt; -2)</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #d32f2f;'>{stunted}</div>
+                </div>
+                <div style='background: #fff3e0; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Wasting (BB/TB &lt; -2)</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #e65100;'>{wasted}</div>
+                </div>
+                <div style='background: #fce4ec; padding: 15px; border-radius: 10px; text-align: center;'>
+                    <div style='font-size: 0.9em; color: #666;'>Underweight (BB/U &lt; -2)</div>
+                    <div style='font-size: 1.5em; font-weight: bold; color: #c2185b;'>{underweight}</div>
+                </div>
+            </div>
+            <p style='color: #666; margin: 15px 0 0 0; font-size: 0.9em;'>
+                📥 Unduh file hasil untuk melihat Z-score dan klasifikasi Permenkes setiap anak.
+            </p>
+        </div>
+        """
+        
+        return html, output_path
+        
+    except Exception as e:
+        log_exception("kalkulator_who_batch_handler", e)
+        return f"❌ Terjadi kesalahan: {str(e)}", None
+
+
 # ==============================================================================
 # MODE MUDAH HANDLER
 # ==============================================================================
@@ -393,77 +769,30 @@ def mode_mudah_handler(
             return "⚠️ Masukkan usia valid (0-60 bulan)"
         
         sex_code = get_sex_code(jenis_kelamin)
-        ranges = get_normal_ranges(age, sex_code)
+        # Whole months keep the get_normal_ranges cache to <= 122 entries
+        ranges = get_normal_ranges(sex_code, int(age))
         
         if not ranges:
             return "⚠️ Tidak dapat mengambil data rentang normal"
         
-        html = f"""
-        <div style='background: linear-gradient(135deg, #e8f5e9 0%, #c8e6c9 100%);
-                    padding: 20px; border-radius: 15px; margin-bottom: 20px;'>
-            <h2 style='color: #2e7d32; margin: 0;'>📋 Rentang Normal untuk Usia {int(age)} Bulan</h2>
-            <p style='color: #1b5e20; margin: 5px 0 0 0;'>{jenis_kelamin}</p>
-        </div>
-        
-        <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px;'>
-        """
-        
-        # Weight
-        w = ranges.get('weight', {})
-        html += f"""
-        <div style='background: white; padding: 20px; border-radius: 15px; 
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-            <h3 style='color: #1565c0; margin: 0 0 15px 0;'>⚖️ Berat Badan</h3>
-            <div style='text-align: center; padding: 15px; background: #e3f2fd; border-radius: 10px;'>
-                <div style='font-size: 1.8em; font-weight: bold; color: #1565c0;'>
-                    {w.get('min', 0):.1f} - {w.get('max', 0):.1f} kg
-                </div>
-                <div style='color: #666; font-size: 0.9em;'>Median: {w.get('median', 0):.1f} kg</div>
-            </div>
-        </div>
-        """
-        
-        # Height
-        h = ranges.get('height', {})
-        html += f"""
-        <div style='background: white; padding: 20px; border-radius: 15px; 
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-            <h3 style='color: #2e7d32; margin: 0 0 15px 0;'>📏 Tinggi Badan</h3>
-            <div style='text-align: center; padding: 15px; background: #e8f5e9; border-radius: 10px;'>
-                <div style='font-size: 1.8em; font-weight: bold; color: #2e7d32;'>
-                    {h.get('min', 0):.1f} - {h.get('max', 0):.1f} cm
-                </div>
-                <div style='color: #666; font-size: 0.9em;'>Median: {h.get('median', 0):.1f} cm</div>
-            </div>
-        </div>
-        """
+        parts = [NORMAL_RANGES_HEADER_TPL.substitute(age=int(age), jenis_kelamin=jenis_kelamin)]
         
-        # Head circumference
-        hc = ranges.get('head_circ', {})
-        html += f"""
-        <div style='background: white; padding: 20px; border-radius: 15px; 
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-            <h3 style='color: #e65100; margin: 0 0 15px 0;'>🎯 Lingkar Kepala</h3>
-            <div style='text-align: center; padding: 15px; background: #fff3e0; border-radius: 10px;'>
-                <div style='font-size: 1.8em; font-weight: bold; color: #e65100;'>
-                    {hc.get('min', 0):.1f} - {hc.get('max', 0):.1f} cm
-                </div>
-                <div style='color: #666; font-size: 0.9em;'>Median: {hc.get('median', 0):.1f} cm</div>
-            </div>
-        </div>
-        """
+        for key, title, color, bg, unit in NORMAL_RANGE_CARDS:
+            r = ranges.get(key, {})
+            parts.append(NORMAL_RANGE_CARD_TPL.substitute(
+                title=title, color=color, bg=bg, unit=unit,
+                min_normal=f"{r.get('min_normal', 0):.1f}",
+                max_normal=f"{r.get('max_normal', 0):.1f}",
+                median=f"{r.get('median', 0):.1f}"
+            ))
         
-        html += """
-        </div>
-        <p style='margin-top: 20px; color: #666; font-size: 0.9em; text-align: center;'>
-            📌 Rentang normal = Z-score -2 SD hingga +2 SD berdasarkan standar WHO 2006
-        </p>
-        """
+        parts.append(NORMAL_RANGES_FOOTER_HTML)
+        html = "".join(parts)
         
         return html
         
     except Exception as e:
-        print(f"❌ Error in mode_mudah_handler: {e}")
+        log_exception("mode_mudah_handler", e)
         return f"❌ Terjadi kesalahan: {str(e)}"
 
 
@@ -471,6 +800,10 @@ def mode_mudah_handler(
 # CHECKLIST HANDLER
 # ==============================================================================
 
+# Checklist without z-score personalisation depends only on the month
+_monthly_checklist_html = memoize_html(maxsize=64)(generate_monthly_checklist)
+
+
 def checklist_handler(usia_bulan: str) -> str:
     """Handler for monthly checklist"""
     try:
@@ -478,10 +811,10 @@ def checklist_handler(usia_bulan: str) -> str:
         if age is None or age < 0 or age > 60:
             return "⚠️ Masukkan usia valid (0-60 bulan)"
         
-        return generate_monthly_checklist(int(age))
+        return _monthly_checklist_html(int(age))
         
     except Exception as e:
-        print(f"❌ Error in checklist_handler: {e}")
+        log_exception("checklist_handler", e)
         return f"❌ Terjadi kesalahan: {str(e)}"
 
 
@@ -489,6 +822,12 @@ def checklist_handler(usia_bulan: str) -> str:
 # MPASI HANDLERS
 # ==============================================================================
 
+# Handler output only depends on the (small) month value, so cache per month
+_mpasi_by_month_html = memoize_html(maxsize=64)(generate_mpasi_by_month_html)
+_recipes_html = memoize_html(maxsize=64)(generate_recipes_html)
+
+
+@lru_cache(maxsize=1)
 def mpasi_overview_handler() -> str:
     """Handler for MPASI overview"""
     return generate_mpasi_overview_html()
@@ -500,11 +839,12 @@ def mpasi_by_month_handler(usia_bulan: str) -> str:
         age = as_float(usia_bulan)
         if age is None or age < 6:
             return "⚠️ MPASI dimulai pada usia 6 bulan"
-        return generate_mpasi_by_month_html(int(age))
+        return _mpasi_by_month_html(int(age))
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
 
+@lru_cache(maxsize=1)
 def mpasi_allergy_handler() -> str:
     """Handler for allergy guide"""
     return generate_allergy_guide_html()
@@ -514,7 +854,7 @@ def mpasi_recipe_handler(usia_bulan: str) -> str:
     """Handler for MPASI recipes"""
     try:
         age = as_float(usia_bulan) or 6
-        return generate_recipes_html(int(age))
+        return _recipes_html(int(age))
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
@@ -535,6 +875,7 @@ def first1000days_handler(tgl_lahir: str) -> str:
         return f"❌ Error: {str(e)}"
 
 
+@lru_cache(maxsize=1)
 def first1000days_timeline_handler() -> str:
     """Handler for 1000 days timeline"""
     return generate_1000_days_timeline()
@@ -544,16 +885,19 @@ def first1000days_timeline_handler() -> str:
 # MOTHER HANDLERS
 # ==============================================================================
 
+@memoize_html(maxsize=8)
 def mother_nutrition_handler(fase: str) -> str:
     """Handler for mother nutrition"""
     return generate_mother_nutrition_html(fase)
 
 
+@lru_cache(maxsize=1)
 def mother_laktasi_handler() -> str:
     """Handler for lactation guide"""
     return generate_laktasi_guide_html()
 
 
+@lru_cache(maxsize=1)
 def mother_mental_handler() -> str:
     """Handler for mental health"""
     return generate_mental_health_html()
@@ -563,16 +907,76 @@ def mother_mental_handler() -> str:
 # LIBRARY HANDLERS
 # ==============================================================================
 
-def library_handler(kategori: str, search_query: str) -> str:
-    """Handler for article library"""
-    return generate_library_html(kategori, search_query)
+def library_handler(kategori: str, search_query: str) -> Iterator[str]:
+    """
+    Handler for article library, streamed card by card
+    
+    Gradio sends only the appended suffix of each yielded string, so the
+    header shows up before the remaining cards are rendered. Finished pages
+    are cached by modules.library (cleared by invalidate_library_cache), so
+    cached pages arrive in a single yield.
+    """
+    html = ""
+    for chunk in iter_library_html(kategori, search_query):
+        html += chunk
+        yield html
 
 
 def article_detail_handler(article_id: int) -> str:
-    """Handler for article detail"""
+    """Handler for article detail (get_article_html is cached by modules.library)"""
     return get_article_html(article_id)
 
 
+def prewarm_handler_caches() -> None:
+    """Fill the static handler caches so first requests are dict lookups"""
+    try:
+        mpasi_overview_handler()
+        mpasi_allergy_handler()
+        first1000days_timeline_handler()
+        mother_laktasi_handler()
+        mother_mental_handler()
+        for month in range(6, 25):
+            mpasi_by_month_handler(str(month))
+            mpasi_recipe_handler(str(month))
+    except Exception as e:
+        print(f"❌ Error in prewarm_handler_caches: {e}")
+
+
+# ==============================================================================
+# CHART API (SVG)
+# ==============================================================================
+
+@api.get("/chart/{indicator}.svg")
+def growth_chart_svg(indicator: str, sex: str, age: float,
+                     w: Optional[float] = None, h: Optional[float] = None,
+                     hc: Optional[float] = None, theme: str = "pink_pastel"):
+    """
+    Lightweight growth chart as SVG (cached backdrop + child's data point)
+    
+    Example: /chart/wfa.svg?sex=L&age=12&w=9&h=75
+    """
+    if indicator not in SVG_CHART_SPECS or not (0 <= age <= 60):
+        return Response(status_code=404)
+    
+    sex_code = get_sex_code(sex) if sex not in ('M', 'F') else sex
+    if theme not in UI_THEMES:
+        theme = "pink_pastel"
+    
+    payload = {
+        'sex': sex_code,
+        'age_mo': age,
+        'w': w,
+        'h': h,
+        'hc': hc,
+        'z': calculate_all_zscores(sex_code, age, w, h, hc),
+    }
+    return Response(
+        content=render_growth_chart_svg(indicator, payload, theme),
+        media_type="image/svg+xml",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
 # ==============================================================================
 # GRADIO INTERFACE
 # ==============================================================================
@@ -588,6 +992,7 @@ def create_gradio_interface():
     with gr.Blocks(
         theme=theme,
         title=APP_TITLE,
+        analytics_enabled=False,
         css="""
         .gradio-container { max-width: 1200px !important; }
         footer { display: none !important; }
@@ -595,18 +1000,10 @@ def create_gradio_interface():
     ) as demo:
         
         # Header
-        gr.HTML(f"""
-        <div style='background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 50%, #fecfef 100%);
-                    padding: 30px; border-radius: 20px; text-align: center; margin-bottom: 20px;'>
-            <h1 style='color: #c2185b; margin: 0; font-size: 2.5em;'>🍼 {APP_TITLE}</h1>
-            <p style='color: #880e4f; margin: 10px 0 0 0; font-size: 1.1em;'>
-                {APP_DESCRIPTION}
-            </p>
-            <p style='color: #666; margin: 5px 0 0 0; font-size: 0.9em;'>
-                Versi {APP_VERSION} | Standar WHO 2006 & Permenkes RI 2020
-            </p>
-        </div>
-        """)
+        gr.HTML(APP_HEADER_HTML)
+        
+        # Theme stylesheet (static file, only the href changes per theme)
+        theme_link = gr.HTML(get_theme_link("pink_pastel"), visible=False)
         
         # Main Tabs
         with gr.Tabs():
@@ -626,7 +1023,7 @@ def create_gradio_interface():
                         calc_tb = gr.Textbox(label="Tinggi/Panjang Badan (cm)", placeholder="Contoh: 72.5")
                         calc_lk = gr.Textbox(label="Lingkar Kepala (cm) - opsional", placeholder="Contoh: 44.0")
                         calc_theme = gr.Dropdown(
-                            choices=list(UI_THEMES.keys()),
+                            choices=list(THEME_CHOICES),
                             value="pink_pastel",
                             label="🎨 Tema Warna"
                         )
@@ -636,21 +1033,46 @@ def create_gradio_interface():
                         calc_result = gr.HTML(label="Hasil Analisis")
                         
                         with gr.Row():
-                            calc_wfa = gr.Image(label="BB/U", type="filepath")
-                            calc_hfa = gr.Image(label="TB/U", type="filepath")
+                            calc_wfa = gr.Image(label="BB/U", type="pil")
+                            calc_hfa = gr.Image(label="TB/U", type="pil")
                         
                         with gr.Row():
-                            calc_hcfa = gr.Image(label="LK/U", type="filepath")
-                            calc_wfl = gr.Image(label="BB/TB", type="filepath")
+                            calc_hcfa = gr.Image(label="LK/U", type="pil")
+                            calc_wfl = gr.Image(label="BB/TB", type="pil")
                         
-                        calc_summary = gr.Image(label="Ringkasan Z-Score", type="filepath")
+                        calc_summary = gr.Image(label="Ringkasan Z-Score", type="pil")
+                
+                # Wiring bound once; the input count must match the handler signature
+                calc_inputs = (calc_nama, calc_tgl_lahir, calc_tgl_ukur, calc_jk,
+                               calc_bb, calc_tb, calc_lk, calc_theme)
+                calc_outputs = (calc_result, calc_wfa, calc_hfa, calc_hcfa, calc_wfl, calc_summary)
+                assert len(calc_inputs) == kalkulator_who_handler.__code__.co_argcount
                 
                 calc_btn.click(
                     fn=kalkulator_who_handler,
-                    inputs=[calc_nama, calc_tgl_lahir, calc_tgl_ukur, calc_jk, 
-                           calc_bb, calc_tb, calc_lk, calc_theme],
-                    outputs=[calc_result, calc_wfa, calc_hfa, calc_hcfa, calc_wfl, calc_summary]
+                    inputs=calc_inputs,
+                    outputs=calc_outputs,
+                    api_name="kalkulator_who"
                 )
+                calc_theme.change(fn=get_theme_link, inputs=[calc_theme], outputs=[theme_link],
+                                  show_api=False)
+                
+                with gr.Accordion("📂 Analisis Massal (CSV)", open=False):
+                    gr.Markdown("""
+                    Unggah file CSV dengan kolom: `nama, jenis_kelamin, usia_bulan, berat_badan, tinggi_badan, lingkar_kepala`
+                    (kolom `usia_bulan` dapat diganti dengan `tgl_lahir` dan `tgl_ukur`).
+                    """)
+                    batch_file = gr.File(label="File CSV", file_types=[".csv"])
+                    batch_btn = gr.Button("📊 Analisis Semua Data", variant="primary")
+                    batch_result = gr.HTML()
+                    batch_output = gr.File(label="Hasil Analisis (CSV)")
+                    
+                    batch_btn.click(
+                        fn=kalkulator_who_batch_handler,
+                        inputs=(batch_file,),
+                        outputs=(batch_result, batch_output),
+                        api_name="kalkulator_who_batch"
+                    )
             
             # ==================== TAB 2: MODE MUDAH ====================
             with gr.TabItem("📋 Mode Mudah", id="easy_mode"):
@@ -666,7 +1088,8 @@ def create_gradio_interface():
                 easy_btn = gr.Button("📊 Lihat Rentang Normal", variant="primary")
                 easy_result = gr.HTML()
                 
-                easy_btn.click(fn=mode_mudah_handler, inputs=[easy_usia, easy_jk], outputs=easy_result)
+                easy_btn.click(fn=mode_mudah_handler, inputs=(easy_usia, easy_jk), outputs=easy_result,
+                              api_name="mode_mudah")
             
             # ==================== TAB 3: CHECKLIST ====================
             with gr.TabItem("✅ Checklist Sehat", id="checklist"):
@@ -679,13 +1102,14 @@ def create_gradio_interface():
                 checklist_btn = gr.Button("📋 Tampilkan Checklist", variant="primary")
                 checklist_result = gr.HTML()
                 
-                checklist_btn.click(fn=checklist_handler, inputs=[checklist_usia], outputs=checklist_result)
+                checklist_btn.click(fn=checklist_handler, inputs=[checklist_usia], outputs=checklist_result,
+                                    api_name="checklist")
             
             # ==================== TAB 4: MPASI ====================
-            with gr.TabItem("🍽️ Panduan MPASI", id="mpasi"):
+            with gr.TabItem("🍽️ Panduan MPASI", id="mpasi") as mpasi_tab:
                 with gr.Tabs():
-                    with gr.TabItem("📚 Pengantar"):
-                        mpasi_overview = gr.HTML(value=generate_mpasi_overview_html())
+                    with gr.TabItem("📚 Pengantar") as mpasi_overview_tab:
+                        mpasi_overview = gr.HTML()
                     
                     with gr.TabItem("📅 Per Bulan"):
                         mpasi_usia = gr.Slider(minimum=6, maximum=24, step=1, value=6, 
@@ -693,7 +1117,8 @@ def create_gradio_interface():
                         mpasi_btn = gr.Button("Lihat Panduan", variant="primary")
                         mpasi_result = gr.HTML()
                         mpasi_btn.click(fn=mpasi_by_month_handler, 
-                                       inputs=[mpasi_usia], outputs=mpasi_result)
+                                       inputs=[mpasi_usia], outputs=mpasi_result,
+                                       api_name="mpasi_by_month")
                     
                     with gr.TabItem("🍳 Resep"):
                         recipe_usia = gr.Slider(minimum=6, maximum=24, step=1, value=6,
@@ -701,10 +1126,16 @@ def create_gradio_interface():
                         recipe_btn = gr.Button("Lihat Resep", variant="primary")
                         recipe_result = gr.HTML()
                         recipe_btn.click(fn=mpasi_recipe_handler,
-                                        inputs=[recipe_usia], outputs=recipe_result)
+                                        inputs=[recipe_usia], outputs=recipe_result,
+                                        api_name="mpasi_recipe")
                     
-                    with gr.TabItem("⚠️ Alergi"):
-                        allergy_result = gr.HTML(value=generate_allergy_guide_html())
+                    with gr.TabItem("⚠️ Alergi") as allergy_tab:
+                        allergy_result = gr.HTML()
+                
+                # Static guides render on first visit (handlers are cached)
+                mpasi_tab.select(fn=mpasi_overview_handler, outputs=mpasi_overview, show_api=False)
+                mpasi_overview_tab.select(fn=mpasi_overview_handler, outputs=mpasi_overview, show_api=False)
+                allergy_tab.select(fn=mpasi_allergy_handler, outputs=allergy_result, show_api=False)
             
             # ==================== TAB 5: 1000 HARI ====================
             with gr.TabItem("🌟 1000 Hari", id="first1000"):
@@ -718,10 +1149,12 @@ def create_gradio_interface():
                         f1000_tgl = gr.Textbox(label="Tanggal Lahir Anak", placeholder="YYYY-MM-DD")
                         f1000_btn = gr.Button("Lihat Progress", variant="primary")
                         f1000_result = gr.HTML()
-                        f1000_btn.click(fn=first1000days_handler, inputs=[f1000_tgl], outputs=f1000_result)
+                        f1000_btn.click(fn=first1000days_handler, inputs=[f1000_tgl], outputs=f1000_result,
+                                       api_name="first1000days")
                     
-                    with gr.TabItem("📅 Timeline"):
-                        timeline_result = gr.HTML(value=generate_1000_days_timeline())
+                    with gr.TabItem("📅 Timeline") as timeline_tab:
+                        timeline_result = gr.HTML()
+                timeline_tab.select(fn=first1000days_timeline_handler, outputs=timeline_result, show_api=False)
             
             # ==================== TAB 6: FITUR IBU ====================
             with gr.TabItem("👩 Fitur Ibu", id="mother"):
@@ -736,13 +1169,16 @@ def create_gradio_interface():
                         mother_nut_btn = gr.Button("Lihat Panduan", variant="primary")
                         mother_nut_result = gr.HTML()
                         mother_nut_btn.click(fn=mother_nutrition_handler, 
-                                            inputs=[mother_fase], outputs=mother_nut_result)
+                                            inputs=[mother_fase], outputs=mother_nut_result,
+                                            api_name="mother_nutrition")
                     
-                    with gr.TabItem("🤱 Laktasi"):
-                        laktasi_result = gr.HTML(value=generate_laktasi_guide_html())
+                    with gr.TabItem("🤱 Laktasi") as laktasi_tab:
+                        laktasi_result = gr.HTML()
                     
-                    with gr.TabItem("💜 Kesehatan Mental"):
-                        mental_result = gr.HTML(value=generate_mental_health_html())
+                    with gr.TabItem("💜 Kesehatan Mental") as mental_tab:
+                        mental_result = gr.HTML()
+                laktasi_tab.select(fn=mother_laktasi_handler, outputs=laktasi_result, show_api=False)
+                mental_tab.select(fn=mother_mental_handler, outputs=mental_result, show_api=False)
             
             # ==================== TAB 7: PERPUSTAKAAN ====================
             with gr.TabItem("📚 Perpustakaan", id="library"):
@@ -750,7 +1186,7 @@ def create_gradio_interface():
                 
                 with gr.Row():
                     lib_kategori = gr.Dropdown(
-                        choices=["Semua Kategori"] + get_categories(),
+                        choices=list(CATEGORY_CHOICES),
                         value="Semua Kategori",
                         label="Kategori"
                     )
@@ -759,7 +1195,8 @@ def create_gradio_interface():
                 lib_btn = gr.Button("🔍 Cari", variant="primary")
                 lib_result = gr.HTML()
                 
-                lib_btn.click(fn=library_handler, inputs=[lib_kategori, lib_search], outputs=lib_result)
+                lib_btn.click(fn=library_handler, inputs=(lib_kategori, lib_search), outputs=lib_result,
+                              api_name="library")
             
             # ==================== TAB 8: KEJAR TUMBUH ====================
             with gr.TabItem("📈 Kejar Tumbuh", id="catch_up"):
@@ -788,46 +1225,30 @@ def create_gradio_interface():
                 kejar_jk = gr.Radio(["Laki-laki", "Perempuan"], label="Jenis Kelamin", value="Laki-laki")
                 kejar_btn = gr.Button("📊 Analisis", variant="primary")
                 kejar_result = gr.HTML()
-                kejar_plot = gr.Image(label="Grafik Trajectory", type="filepath")
+                kejar_plot = gr.Image(label="Grafik Trajectory", type="pil")
                 
                 def process_kejar_tumbuh(data_str, gender):
                     try:
-                        lines = data_str.strip().split('\n')
-                        data_list = []
-                        for line in lines:
-                            parts = [p.strip() for p in line.split(',')]
-                            if len(parts) >= 3:
-                                data_list.append({
-                                    'usia_bulan': float(parts[0]),
-                                    'bb': float(parts[1]),
-                                    'tb': float(parts[2])
-                                })
+                        measurements = parse_measurement_text(data_str)
                         
-                        if len(data_list) < 2:
+                        if measurements.shape[0] < 2:
                             return "⚠️ Minimal 2 data pengukuran diperlukan", None
                         
-                        return kalkulator_kejar_tumbuh_handler(data_list, gender)
+                        return kalkulator_kejar_tumbuh_handler(measurements, gender)
                     except Exception as e:
                         return f"❌ Error: {str(e)}", None
                 
+                kejar_inputs = (kejar_data, kejar_jk)
+                kejar_outputs = (kejar_result, kejar_plot)
+                assert len(kejar_inputs) == process_kejar_tumbuh.__code__.co_argcount
+                
                 kejar_btn.click(fn=process_kejar_tumbuh, 
-                               inputs=[kejar_data, kejar_jk], 
-                               outputs=[kejar_result, kejar_plot])
+                               inputs=kejar_inputs, 
+                               outputs=kejar_outputs,
+                               api_name="kejar_tumbuh")
         
         # Footer
-        gr.HTML(f"""
-        <div style='margin-top: 30px; padding: 20px; background: #f5f5f5; 
-                    border-radius: 15px; text-align: center;'>
-            <p style='margin: 0; color: #666;'>
-                <strong>{APP_TITLE}</strong> v{APP_VERSION}<br>
-                Dibuat dengan ❤️ untuk Ibu dan Anak Indonesia<br>
-                📞 Kontak: {CONTACT_WA}
-            </p>
-            <p style='margin: 10px 0 0 0; color: #888; font-size: 0.85em;'>
-                ⚠️ Aplikasi ini untuk edukasi. Selalu konsultasikan ke tenaga kesehatan.
-            </p>
-        </div>
-        """)
+        gr.HTML(APP_FOOTER_HTML)
     
     return demo
 
@@ -836,13 +1257,59 @@ def create_gradio_interface():
 # MAIN
 # ==============================================================================
 
-# Create Gradio interface
-demo = create_gradio_interface()
+@lru_cache(maxsize=1)
+def create_app() -> FastAPI:
+    """
+    ASGI factory: build the Gradio interface and mount it on the FastAPI app
+    
+    Heavy setup runs here instead of at import, so each uvicorn worker pays it
+    in parallel after the fork. Cached, so repeated calls return the same app.
+    
+    Returns:
+        FastAPI app with the Gradio interface mounted at "/"
+    """
+    write_theme_stylesheets()
+    
+    demo = create_gradio_interface()
+    
+    # Warm static handler caches off the request path
+    BACKGROUND_POOL.submit(prewarm_handler_caches)
+    if WARM_NORMAL_RANGES:
+        BACKGROUND_POOL.submit(warm_normal_ranges)
+    
+    # Queue events so several users are served in parallel (CPU-bound handlers)
+    demo.queue(default_concurrency_limit=os.cpu_count() or 4, max_size=64)
+    
+    return gr.mount_gradio_app(api, demo, path="/")
+
+
+def __getattr__(name: str):
+    """
+    Module attribute `app`: the fully mounted app, built on first access
+    
+    Keeps `uvicorn app:app` and `from app import app` serving the UI while
+    plain imports of this module stay cheap.
+    """
+    if name == "app":
+        return create_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Mount to FastAPI
-app = gr.mount_gradio_app(app, demo, path="/")
 
 # Run with uvicorn
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 7860)))
+    # WEB_CONCURRENCY > 1 forks worker processes; the Gradio queue is per process,
+    # so multi-worker deployments need sticky sessions at the load balancer.
+    # Both "app:app" (single worker) and "app:create_app" with --factory serve
+    # the mounted app; "app:api" is the bare FastAPI without the interface.
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    
+    # loop="auto" selects uvloop when it is installed, asyncio otherwise
+    uvicorn.run(
+        "app:create_app" if workers > 1 else create_app(),
+        factory=workers > 1,
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 7860)),
+        workers=workers,
+        loop="auto"
+    )
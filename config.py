@@ -30,9 +30,10 @@ OUTPUTS_DIR = os.path.join(BASE_DIR, "outputs")
 MODULES_DIR = os.path.join(BASE_DIR, "modules")
 DATA_DIR = os.path.join(BASE_DIR, "data")
 PYGROWUP_DIR = os.path.join(BASE_DIR, "pygrowup")
+CACHE_DIR = os.environ.get("ANTHROHPK_CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
 
 # Create directories if not exist
-for directory in [STATIC_DIR, OUTPUTS_DIR]:
+for directory in [STATIC_DIR, OUTPUTS_DIR, CACHE_DIR]:
     os.makedirs(directory, exist_ok=True)
 
 # ==============================================================================
@@ -47,6 +48,10 @@ CALC_CONFIG = {
     'log_level': 'ERROR'
 }
 
+# Precompute Easy Mode normal ranges (0-60 months, both sexes) in the
+# background at startup
+WARM_NORMAL_RANGES = os.environ.get("ANTHROHPK_WARM_NORMAL_RANGES", "1") != "0"
+
 # Anthropometric Measurement Bounds (WHO Standards)
 BOUNDS = {
     'wfa': (1.0, 30.0),      # Weight-for-Age (kg)
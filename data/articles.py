@@ -7,7 +7,9 @@
 #==============================================================================
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, FrozenSet, Tuple
+from collections import defaultdict
+from functools import lru_cache, reduce
 import re
 
 # ==============================================================================
@@ -734,6 +736,97 @@ Imunisasi melindungi anak dari penyakit berbahaya yang dapat dicegah.
 # Tambahkan lebih banyak artikel untuk melengkapi 40 artikel...
 # (Artikel 14-40 akan ditambahkan di bagian selanjutnya)
 
+# ==============================================================================
+# LOOKUP TABLES & SEARCH INDEX
+# ==============================================================================
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# id -> article, so detail pages don't scan the list
+ARTICLE_BY_ID: Dict[int, Dict] = {}
+
+# category -> article positions / articles (both in database order)
+ARTICLE_POSITIONS_BY_CATEGORY: Dict[str, Tuple[int, ...]] = {}
+ARTICLES_BY_CATEGORY: Dict[str, Tuple[Dict, ...]] = {}
+
+
+@lru_cache(maxsize=1)
+def get_search_index() -> Tuple[Tuple[str, ...], Dict[str, FrozenSet[int]]]:
+    """
+    Build the search structures on first use (not at import)
+    
+    Returns:
+        Tuple of (lowercased searchable text per article position,
+        inverted index token -> frozenset of article positions)
+    """
+    search_text = tuple(
+        "\x00".join((
+            article.get("title", "").lower(),
+            article.get("summary", "").lower(),
+            article.get("full_content", "").lower(),
+        ))
+        for article in ARTIKEL_DATABASE
+    )
+    
+    index: Dict[str, Set[int]] = defaultdict(set)
+    for pos, text in enumerate(search_text):
+        for token in _TOKEN_RE.findall(text):
+            index[token].add(pos)
+    
+    return search_text, {token: frozenset(positions) for token, positions in index.items()}
+
+
+@lru_cache(maxsize=512)
+def _postings_for(fragment: str) -> FrozenSet[int]:
+    """Article positions whose tokens contain the given query fragment"""
+    _, index = get_search_index()
+    matches = set()
+    for token, positions in index.items():
+        if fragment in token:
+            matches |= positions
+    return frozenset(matches)
+
+
+def _candidate_positions(query_lower: str) -> Optional[FrozenSet[int]]:
+    """
+    Narrow the articles that can contain query_lower as a substring
+    
+    Returns:
+        Frozenset of article positions, or None when the query has no tokens
+    """
+    tokens = _TOKEN_RE.findall(query_lower)
+    if not tokens:
+        return None
+    return reduce(frozenset.intersection, (_postings_for(t) for t in tokens))
+
+
+def rebuild_article_indexes() -> None:
+    """
+    (Re)build the lookup tables and reset the search index
+    
+    Runs at import; call again after ARTIKEL_DATABASE is modified in place.
+    The tables are refilled in place so modules holding them stay current.
+    """
+    positions_by_category: Dict[str, List[int]] = defaultdict(list)
+    for pos, article in enumerate(ARTIKEL_DATABASE):
+        positions_by_category[article.get("kategori", "Umum")].append(pos)
+    
+    ARTICLE_BY_ID.clear()
+    ARTICLE_BY_ID.update((article["id"], article) for article in ARTIKEL_DATABASE)
+    
+    ARTICLE_POSITIONS_BY_CATEGORY.clear()
+    ARTICLES_BY_CATEGORY.clear()
+    for category, positions in positions_by_category.items():
+        ARTICLE_POSITIONS_BY_CATEGORY[category] = tuple(positions)
+        ARTICLES_BY_CATEGORY[category] = tuple(ARTIKEL_DATABASE[pos] for pos in positions)
+    
+    get_search_index.cache_clear()
+    _postings_for.cache_clear()
+
+
+rebuild_article_indexes()
+
+
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
@@ -745,10 +838,7 @@ def get_categories() -> List[str]:
 
 def get_article_by_id(article_id: int) -> Optional[Dict]:
     """Get article by ID"""
-    for article in ARTIKEL_DATABASE:
-        if article.get("id") == article_id:
-            return article
-    return None
+    return ARTICLE_BY_ID.get(article_id)
 
 
 def search_articles(query: str = "", category: str = "") -> List[Dict]:
@@ -765,29 +855,45 @@ def search_articles(query: str = "", category: str = "") -> List[Dict]:
     results = []
     query_lower = query.lower().strip()
     
-    for article in ARTIKEL_DATABASE:
-        # Category filter
+    # Category and token indexes narrow candidates; the substring check
+    # below keeps results exact
+    if category and category != "Semua Kategori":
+        positions = ARTICLE_POSITIONS_BY_CATEGORY.get(category, ())
+    else:
+        positions = range(len(ARTIKEL_DATABASE))
+    
+    if not query_lower:
         if category and category != "Semua Kategori":
-            if article.get("kategori") != category:
-                continue
-        
-        # Query filter
-        if query_lower:
-            title = article.get("title", "").lower()
-            summary = article.get("summary", "").lower()
-            content = article.get("full_content", "").lower()
-            
-            if not (query_lower in title or query_lower in summary or query_lower in content):
-                continue
-        
-        results.append(article)
+            return list(ARTICLES_BY_CATEGORY.get(category, ()))
+        return list(ARTIKEL_DATABASE)
+    
+    search_text, _ = get_search_index()
+    candidates = _candidate_positions(query_lower)
+    if candidates is not None:
+        positions = [pos for pos in positions if pos in candidates]
+        # A single-word query is exact from the postings alone: every token
+        # containing it is itself a substring of the article text
+        if _TOKEN_RE.fullmatch(query_lower):
+            return [ARTIKEL_DATABASE[pos] for pos in positions]
+    
+    for pos in positions:
+        if query_lower in search_text[pos]:
+            results.append(ARTIKEL_DATABASE[pos])
     
     return results
 
 
 def get_articles_by_category(category: str) -> List[Dict]:
     """Get all articles in a category"""
-    return [a for a in ARTIKEL_DATABASE if a.get("kategori") == category]
+    return list(ARTICLES_BY_CATEGORY.get(category, ()))
+
+
+# Markdown-like patterns used by format_article_content, compiled once
+_RE_H1 = re.compile(r'^# (.+)$', re.MULTILINE)
+_RE_H2 = re.compile(r'^## (.+)$', re.MULTILINE)
+_RE_H3 = re.compile(r'^### (.+)$', re.MULTILINE)
+_RE_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_RE_LIST_ITEM = re.compile(r'^\* (.+)$', re.MULTILINE)
 
 
 def format_article_content(content: str) -> str:
@@ -803,15 +909,15 @@ def format_article_content(content: str) -> str:
     html = content
     
     # Convert headers
-    html = re.sub(r'^# (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^### (.+)$', r'<h4>\1</h4>', html, flags=re.MULTILINE)
+    html = _RE_H1.sub(r'<h2>\1</h2>', html)
+    html = _RE_H2.sub(r'<h3>\1</h3>', html)
+    html = _RE_H3.sub(r'<h4>\1</h4>', html)
     
     # Convert bold
-    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+    html = _RE_BOLD.sub(r'<strong>\1</strong>', html)
     
     # Convert lists
-    html = re.sub(r'^\* (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
+    html = _RE_LIST_ITEM.sub(r'<li>\1</li>', html)
     
     # Convert line breaks
     html = html.replace('\n\n', '</p><p>')
@@ -7,6 +7,7 @@
 #==============================================================================
 """
 
+from io import StringIO
 from typing import List, Optional
 
 # ==============================================================================
@@ -273,7 +274,10 @@ def generate_immunization_html(month: int, include_details: bool = True) -> str:
         </div>
         """
     
-    html = f"""
+    buf = StringIO()
+    w = buf.write
+    
+    w(f"""
     <div style="padding: 15px; background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%); 
                 border-radius: 10px; margin: 10px 0; border-left: 4px solid #2196f3;">
         <h4 style="color: #1565c0; margin: 0 0 10px 0;">
@@ -281,27 +285,27 @@ def generate_immunization_html(month: int, include_details: bool = True) -> str:
             {'<span style="color: #d32f2f; font-size: 0.8em;">(PENTING)</span>' if schedule.get("critical") else ''}
         </h4>
         <ul style="margin: 0; padding-left: 20px;">
-    """
+    """)
     
     for vaccine in vaccines:
         details = get_vaccine_info(vaccine) if include_details else None
         
-        html += f'<li style="margin: 5px 0;"><strong>{vaccine}</strong>'
+        w(f'<li style="margin: 5px 0;"><strong>{vaccine}</strong>')
         
         if details:
-            html += f'<br><small style="color: #666;">{details["description"]}</small>'
+            w(f'<br><small style="color: #666;">{details["description"]}</small>')
         
-        html += '</li>'
+        w('</li>')
     
-    html += f"""
+    w(f"""
         </ul>
         <p style="margin: 10px 0 0 0; font-size: 0.9em; color: #555;">
             📝 {schedule.get("notes", "")}
         </p>
     </div>
-    """
+    """)
     
-    return html
+    return buf.getvalue()
 
 
 print("✅ Immunization data loaded")
@@ -7,7 +7,13 @@
 #==============================================================================
 """
 
-from typing import List, Optional, Dict
+import os
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache, reduce
+from operator import or_
+from typing import List, Optional, Dict, Tuple
 
 # ==============================================================================
 # KPSP QUESTIONS BY AGE
@@ -345,10 +351,95 @@ KPSP_QUESTIONS = {
 }
 
 
+# ==============================================================================
+# FLAT LOOKUP INDEXES (built once at import)
+# ==============================================================================
+
+# Immutable, compact question record (replaces the per-question dicts)
+KPSPQuestion = namedtuple("KPSPQuestion", "id domain question how_to_test normal_response")
+
+KPSP_AGES: Tuple[int, ...] = tuple(sorted(KPSP_QUESTIONS))
+KPSP_BY_ID: Dict[str, KPSPQuestion] = {}
+KPSP_BY_AGE_DOMAIN: Dict[Tuple[int, str], List[KPSPQuestion]] = {}
+KPSP_QUESTION_TEXTS: Dict[int, Tuple[str, ...]] = {}
+
+# One bit per developmental domain; each age's domain_focus folds into one int mask
+KPSP_DOMAINS: Tuple[str, ...] = (
+    "Motorik Kasar", "Motorik Halus", "Bahasa", "Sosialisasi", "Kemandirian", "Kognitif"
+)
+DOMAIN_BIT: Dict[str, int] = {domain: 1 << i for i, domain in enumerate(KPSP_DOMAINS)}
+KPSP_DOMAIN_MASK: Dict[int, int] = {}
+
+
+def _build_indexes() -> None:
+    """Freeze questions into KPSPQuestion tuples, index them by id and (age, domain) and precompute display text"""
+    for age in KPSP_AGES:
+        entry = KPSP_QUESTIONS[age]
+        frozen = tuple(
+            KPSPQuestion(**dict(q, domain=sys.intern(q["domain"])))
+            for q in entry["questions"]
+        )
+        entry["questions"] = frozen
+        
+        for q in frozen:
+            KPSP_BY_ID[q.id] = q
+            KPSP_BY_AGE_DOMAIN.setdefault((age, q.domain), []).append(q)
+        
+        KPSP_QUESTION_TEXTS[age] = tuple(q.question for q in frozen)
+        KPSP_DOMAIN_MASK[age] = reduce(or_, (DOMAIN_BIT[d] for d in entry["domain_focus"]), 0)
+        entry["domain_focus_text"] = ", ".join(entry["domain_focus"])
+
+
+_build_indexes()
+
+
+def get_questions(age: int) -> Tuple[KPSPQuestion, ...]:
+    """
+    Get the questions of an exact KPSP age (3, 6, 9, ...)
+    
+    Args:
+        age: KPSP screening age in months
+        
+    Returns:
+        Tuple of KPSPQuestion records, empty if no KPSP for this age
+    """
+    entry = KPSP_QUESTIONS.get(age)
+    return entry["questions"] if entry else ()
+
+
+def has_domain(age: int, domain: str) -> bool:
+    """
+    Check whether a KPSP age focuses on a developmental domain
+    
+    Args:
+        age: KPSP screening age in months
+        domain: Domain name, e.g. "Bahasa"
+        
+    Returns:
+        True if the domain is in that age's domain_focus
+    """
+    return bool(KPSP_DOMAIN_MASK.get(age, 0) & DOMAIN_BIT.get(domain, 0))
+
+
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
 
+@lru_cache(maxsize=64)
+def nearest_kpsp_age(month: int) -> Optional[int]:
+    """
+    Find the latest KPSP age (3, 6, 9, 12, 15, 18, 21, 24) not after a month
+    
+    Args:
+        month: Age in months
+        
+    Returns:
+        KPSP age, or None below the first screening age
+    """
+    idx = bisect_right(KPSP_AGES, month) - 1
+    return KPSP_AGES[idx] if idx >= 0 else None
+
+
 def get_kpsp_questions_for_month(month: int) -> List[str]:
     """
     Get KPSP questions for specific month
@@ -359,20 +450,12 @@ def get_kpsp_questions_for_month(month: int) -> List[str]:
     Returns:
         List of question strings, empty if no KPSP for this age
     """
-    # Find nearest KPSP age (3, 6, 9, 12, 15, 18, 21, 24)
-    kpsp_ages = sorted(KPSP_QUESTIONS.keys())
+    nearest_age = nearest_kpsp_age(month)
     
-    nearest_age = None
-    for age in kpsp_ages:
-        if month >= age:
-            nearest_age = age
-        else:
-            break
-    
-    if nearest_age is None or nearest_age not in KPSP_QUESTIONS:
+    if nearest_age is None:
         return []
     
-    return [q["question"] for q in KPSP_QUESTIONS[nearest_age]["questions"]]
+    return list(KPSP_QUESTION_TEXTS[nearest_age])
 
 
 def get_kpsp_full_for_month(month: int) -> Optional[Dict]:
@@ -385,19 +468,15 @@ def get_kpsp_full_for_month(month: int) -> Optional[Dict]:
     Returns:
         Dictionary with full KPSP data or None
     """
-    kpsp_ages = sorted(KPSP_QUESTIONS.keys())
-    
-    nearest_age = None
-    for age in kpsp_ages:
-        if month >= age:
-            nearest_age = age
+    nearest_age = nearest_kpsp_age(month)
     
-    if nearest_age is None or nearest_age not in KPSP_QUESTIONS:
+    if nearest_age is None:
         return None
     
     return KPSP_QUESTIONS[nearest_age]
 
 
+@lru_cache(maxsize=None)
 def interpret_kpsp_result(yes_count: int, total: int = 5) -> Dict:
     """
     Interpret KPSP screening result
@@ -407,7 +486,7 @@ def interpret_kpsp_result(yes_count: int, total: int = 5) -> Dict:
         total: Total number of questions (default 5)
         
     Returns:
-        Dictionary with interpretation
+        Dictionary with interpretation (cached and shared, do not mutate)
     """
     no_count = total - yes_count
     
@@ -437,6 +516,21 @@ def interpret_kpsp_result(yes_count: int, total: int = 5) -> Dict:
         }
 
 
+_ANSWER_YES_HTML = '<span style="color: #28a745; font-weight: bold;"> ✓ YA</span>'
+_ANSWER_NO_HTML = '<span style="color: #dc3545; font-weight: bold;"> ✗ TIDAK</span>'
+
+_QUESTION_LI_TMPL = """
+            <li style="margin: 10px 0; padding: 10px; background: white; border-radius: 8px; 
+                       box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
+                <strong style="color: #34495e;">{question}</strong>{indicator}
+                <br>
+                <small style="color: #7f8c8d;">
+                    📋 <em>Cara uji: {how_to_test}</em>
+                </small>
+            </li>
+        """
+
+
 def generate_kpsp_html(month: int, answers: List[bool] = None) -> str:
     """
     Generate HTML for KPSP display
@@ -448,6 +542,19 @@ def generate_kpsp_html(month: int, answers: List[bool] = None) -> str:
     Returns:
         HTML string for display
     """
+    if not answers:
+        return _generate_kpsp_html_static(month)
+    return _render_kpsp_html(month, answers)
+
+
+@lru_cache(maxsize=None)
+def _generate_kpsp_html_static(month: int) -> str:
+    """KPSP HTML without answers; bounded month domain, so memoized"""
+    return _render_kpsp_html(month, None)
+
+
+def _render_kpsp_html(month: int, answers: Optional[List[bool]]) -> str:
+    """Build the KPSP HTML, marking answers when given"""
     kpsp_data = get_kpsp_full_for_month(month)
     
     if not kpsp_data:
@@ -464,7 +571,7 @@ def generate_kpsp_html(month: int, answers: List[bool] = None) -> str:
             🧠 Skrining KPSP - {kpsp_data['age_label']}
         </h3>
         <p style="color: #666; margin-bottom: 15px;">
-            <strong>Domain yang dinilai:</strong> {', '.join(kpsp_data['domain_focus'])}
+            <strong>Domain yang dinilai:</strong> {kpsp_data['domain_focus_text']}
         </p>
         <p style="color: #888; font-size: 0.9em; margin-bottom: 15px;">
             Jawab YA atau TIDAK untuk setiap pertanyaan berikut:
@@ -472,24 +579,17 @@ def generate_kpsp_html(month: int, answers: List[bool] = None) -> str:
         <ol style="padding-left: 20px;">
     """
     
-    for i, q in enumerate(kpsp_data["questions"]):
-        answer_indicator = ""
-        if answers and i < len(answers):
-            if answers[i]:
-                answer_indicator = '<span style="color: #28a745; font-weight: bold;"> ✓ YA</span>'
-            else:
-                answer_indicator = '<span style="color: #dc3545; font-weight: bold;"> ✗ TIDAK</span>'
-        
-        html += f"""
-            <li style="margin: 10px 0; padding: 10px; background: white; border-radius: 8px; 
-                       box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
-                <strong style="color: #34495e;">{q['question']}</strong>{answer_indicator}
-                <br>
-                <small style="color: #7f8c8d;">
-                    📋 <em>Cara uji: {q['how_to_test']}</em>
-                </small>
-            </li>
-        """
+    questions = kpsp_data["questions"]
+    if answers:
+        indicators = [_ANSWER_YES_HTML if a else _ANSWER_NO_HTML for a in answers[:len(questions)]]
+        indicators += [""] * (len(questions) - len(indicators))
+    else:
+        indicators = [""] * len(questions)
+    
+    html += "".join(
+        _QUESTION_LI_TMPL.format(question=q.question, indicator=ind, how_to_test=q.how_to_test)
+        for q, ind in zip(questions, indicators)
+    )
     
     html += """
         </ol>
@@ -504,4 +604,5 @@ def generate_kpsp_html(month: int, answers: List[bool] = None) -> str:
     return html
 
 
-print("✅ KPSP data loaded")
+if os.environ.get("ANTHROHPK_VERBOSE"):
+    print("✅ KPSP data loaded")
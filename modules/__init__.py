@@ -4,9 +4,10 @@
 AnthroHPK v4.0 - Modules Package
 """
 
+import importlib
+
 from .utilities import *
 from .who_calculator import *
-from .growth_charts import *
 
 __all__ = [
     'utilities',
@@ -20,3 +21,22 @@ __all__ = [
     'mother',
     'pdf_export'
 ]
+
+
+def __getattr__(name):
+    """
+    Resolve growth_charts names on first access
+    
+    growth_charts pulls in matplotlib (several hundred ms), so it is only
+    imported when one of its names is actually requested instead of on
+    every `import modules.<anything>`.
+    """
+    if name.startswith('__'):
+        raise AttributeError(name)
+    growth_charts = importlib.import_module('.growth_charts', __name__)
+    if name == 'growth_charts':
+        return growth_charts
+    try:
+        return getattr(growth_charts, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
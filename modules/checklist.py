@@ -8,10 +8,15 @@
 """
 
 from typing import Dict, List, Optional
+from bisect import bisect_right
+from functools import lru_cache
 import sys
 import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Only needed when run as a script; skip when the app already put the root on sys.path
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT_DIR not in sys.path:
+    sys.path.insert(0, _ROOT_DIR)
 
 from data.immunization import get_immunization_for_month, generate_immunization_html
 from data.kpsp import get_kpsp_questions_for_month, generate_kpsp_html
@@ -173,62 +178,254 @@ NUTRITION_RECOMMENDATIONS = {
 # HELPER FUNCTIONS
 # ==============================================================================
 
+_MILESTONE_AGES = tuple(sorted(DEVELOPMENT_MILESTONES))
+
+@lru_cache(maxsize=64)
+def _nearest_milestone_age(month: int) -> int:
+    """Get the DEVELOPMENT_MILESTONES key that applies to a month"""
+    idx = bisect_right(_MILESTONE_AGES, month) - 1
+    return _MILESTONE_AGES[idx] if idx >= 0 else _MILESTONE_AGES[0]
+
+
 def get_milestone_for_month(month: int) -> Dict:
     """Get development milestones for specific month"""
     # Find nearest milestone
-    milestone_ages = sorted(DEVELOPMENT_MILESTONES.keys())
-    
-    nearest = 0
-    for age in milestone_ages:
-        if month >= age:
-            nearest = age
-    
-    return DEVELOPMENT_MILESTONES.get(nearest, DEVELOPMENT_MILESTONES[0])
+    return DEVELOPMENT_MILESTONES.get(_nearest_milestone_age(month), DEVELOPMENT_MILESTONES[0])
 
 
-def get_nutrition_phase(month: int) -> Dict:
-    """Get nutrition recommendations based on age phase"""
+def _nutrition_phase_key(month: int) -> str:
+    """Get the NUTRITION_RECOMMENDATIONS key for a month"""
     if month < 6:
-        return NUTRITION_RECOMMENDATIONS["0-6"]
+        return "0-6"
     elif month < 9:
-        return NUTRITION_RECOMMENDATIONS["6-9"]
+        return "6-9"
     elif month < 12:
-        return NUTRITION_RECOMMENDATIONS["9-12"]
+        return "9-12"
     else:
-        return NUTRITION_RECOMMENDATIONS["12-24"]
+        return "12-24"
+
+
+def get_nutrition_phase(month: int) -> Dict:
+    """Get nutrition recommendations based on age phase"""
+    return NUTRITION_RECOMMENDATIONS[_nutrition_phase_key(month)]
+
+
+_NO_VIDEOS_HTML = "<p style='color: #888;'>Tidak ada video tersedia.</p>"
+
+_VIDEO_GRID_OPEN = "<div class='video-grid'>"
+
+_VIDEO_CARD_TMPL = """
+        <div class='video-card'>
+            <div class='video-title'>{title}</div>
+            <div class='video-desc'>{description}</div>
+            <div class='video-duration'>⏱️ {duration}</div>
+            <a href='{url}' target='_blank'>▶️ Tonton Video</a>
+        </div>
+        """
 
 
 def generate_video_links_html(videos: List[Dict]) -> str:
     """Generate HTML for video links"""
     if not videos:
-        return "<p style='color: #888;'>Tidak ada video tersedia.</p>"
-    
-    html = "<div style='display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 15px;'>"
+        return _NO_VIDEOS_HTML
     
-    for video in videos:
-        html += f"""
-        <div style='background: white; border-radius: 10px; padding: 15px; 
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.1);'>
-            <div style='font-weight: bold; color: #333; margin-bottom: 8px;'>
-                {video['title']}
-            </div>
-            <div style='color: #666; font-size: 0.9em; margin-bottom: 8px;'>
-                {video['description']}
+    return _VIDEO_GRID_OPEN + "".join(_VIDEO_CARD_TMPL.format_map(video) for video in videos) + "</div>"
+
+
+# ==============================================================================
+# CHECKLIST TEMPLATES (static scaffold, filled with format_map)
+# ==============================================================================
+
+# Shared styles for the checklist page, emitted once per page instead of
+# repeating the same inline style on every card
+_CHECKLIST_CSS = """<style>
+.checklist-card { background: white; padding: 20px; border-radius: 15px; margin-bottom: 20px;
+                  box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+.checklist-card h3 { margin: 0 0 15px 0; }
+.checklist-alert { padding: 15px; border-radius: 10px; margin-bottom: 20px; }
+.checklist-alert h4 { margin: 0 0 10px 0; }
+.checklist-alert p { margin: 0; }
+.nutrition-list { margin: 0; padding-left: 20px; }
+.nutrition-list li { margin: 8px 0; font-size: 1.05em; }
+.milestone-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }
+.milestone-card { padding: 15px; border-radius: 10px; }
+.milestone-card h4 { margin: 0 0 10px 0; }
+.milestone-card ul { margin: 0; padding-left: 20px; color: #333; }
+.milestone-card li { margin: 5px 0; }
+.video-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 15px; }
+.video-card { background: white; border-radius: 10px; padding: 15px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
+.video-card .video-title { font-weight: bold; color: #333; margin-bottom: 8px; }
+.video-card .video-desc { color: #666; font-size: 0.9em; margin-bottom: 8px; }
+.video-card .video-duration { color: #888; font-size: 0.85em; margin-bottom: 10px; }
+.video-card a { display: inline-block; background: linear-gradient(135deg, #ff6b9d, #ff9a9e);
+                color: white; padding: 8px 16px; border-radius: 6px;
+                text-decoration: none; font-weight: 600; font-size: 0.9em; }
+</style>"""
+
+_MANDIRI_ALERT = """
+        <div class='checklist-alert' style='background: #e3f2fd; border-left: 4px solid #2196f3;'>
+            <p style='color: #1565c0;'>
+                ℹ️ <strong>Mode Mandiri:</strong> Checklist ini dapat digunakan tanpa 
+                melakukan analisis di Kalkulator Gizi terlebih dahulu.
+            </p>
+        </div>
+        """
+
+_UNDERWEIGHT_ALERT = """
+            <div class='checklist-alert' style='background: #ffebee; border-left: 4px solid #e53935;'>
+                <h4 style='color: #c62828;'>⚠️ PERHATIAN KHUSUS</h4>
+                <p style='color: #b71c1c;'>
+                    Berdasarkan hasil analisis, anak memerlukan perhatian khusus pada aspek gizi.
+                    Prioritaskan rekomendasi nutrisi dan konsultasi ke tenaga kesehatan.
+                </p>
             </div>
-            <div style='color: #888; font-size: 0.85em; margin-bottom: 10px;'>
-                ⏱️ {video['duration']}
+            """
+
+_STUNTING_ALERT = """
+            <div class='checklist-alert' style='background: #fff3e0; border-left: 4px solid #ff9800;'>
+                <h4 style='color: #e65100;'>📊 MONITORING TINGGI BADAN</h4>
+                <p style='color: #bf360c;'>
+                    Perlu pemantauan ketat pada pertumbuhan linear. 
+                    Pastikan asupan protein dan kalsium tercukupi.
+                </p>
             </div>
-            <a href='{video['url']}' target='_blank' 
-               style='display: inline-block; background: linear-gradient(135deg, #ff6b9d, #ff9a9e);
-                      color: white; padding: 8px 16px; border-radius: 6px; 
-                      text-decoration: none; font-weight: 600; font-size: 0.9em;'>
-                ▶️ Tonton Video
-            </a>
+            """
+
+_CATCH_UP_NUTRITION = """
+        </ul>
+        <div style='background: #fff8e1; padding: 15px; border-radius: 10px; margin-top: 15px;'>
+            <h4 style='color: #f57f17; margin: 0 0 10px 0;'>⚡ Rekomendasi Tambahan (Kejar Tumbuh)</h4>
+            <ul style='margin: 0; padding-left: 20px;'>
+                <li>Tingkatkan frekuensi makan (5-6x/hari)</li>
+                <li>Tambah protein hewani di setiap makan</li>
+                <li>Makanan padat energi (alpukat, kacang)</li>
+                <li>Konsultasi dokter untuk suplementasi</li>
+            </ul>
         </div>
         """
-    
-    html += "</div>"
-    return html
+
+_MPASI_VIDEO_HEADING_TMPL = """
+            <h4 style='color: #7b1fa2; margin: 20px 0 10px 0;'>
+                🍽️ Panduan MPASI ({age} bulan)
+            </h4>
+            """
+
+_MILESTONE_CARD_TMPL = (
+    """
+        <div class='milestone-card' style='background: {bg_color};'>
+            <h4 style='color: {text_color};'>{icon} {domain_name}</h4>
+            <ul>
+        """
+    "{items}</ul></div>"
+)
+
+_DOMAIN_LABELS = {
+    "motorik_kasar": "Motorik Kasar",
+    "motorik_halus": "Motorik Halus",
+    "bahasa": "Bahasa",
+    "sosial": "Sosial"
+}
+
+_MILESTONE_COLORS = {
+    "motorik_kasar": ("#e8f5e9", "#2e7d32", "🏃"),
+    "motorik_halus": ("#e3f2fd", "#1565c0", "✋"),
+    "bahasa": ("#fce4ec", "#c2185b", "🗣️"),
+    "sosial": ("#fff3e0", "#ef6c00", "👋")
+}
+
+_NUTRITION_OPEN_TMPL = (
+    """
+    <div class='checklist-card'>
+        <h3 style='color: #bf360c;'>🍽️ {nutrition_title}</h3>
+        <ul class='nutrition-list'>
+    """
+)
+
+_CHECKLIST_TMPL = (
+    # ==== HEADER ====
+    """
+    <div style='background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%); 
+                padding: 20px; border-radius: 15px; margin-bottom: 20px;'>
+        <h2 style='color: #c2185b; margin: 0;'>📋 Checklist Bulan ke-{month}</h2>
+        <p style='color: #880e4f; margin: 5px 0 0 0;'>
+            Panduan lengkap untuk usia {month} bulan
+        </p>
+    </div>
+    """
+    "{zscore_alert}"
+    # ==== VIDEO EDUKASI ====
+    """
+    <div class='checklist-card'>
+        <h3 style='color: #6a1b9a;'>🎥 Video Edukasi</h3>
+        <h4 style='color: #7b1fa2; margin: 15px 0 10px 0;'>📊 Panduan Skrining KPSP</h4>
+    """
+    "{kpsp_videos}{mpasi_videos}</div>"
+    # ==== MILESTONE PERKEMBANGAN ====
+    """
+    <div class='checklist-card'>
+        <h3 style='color: #00695c;'>🎯 Target Perkembangan</h3>
+        <div class='milestone-grid'>
+    """
+    "{milestones}</div></div>"
+    # ==== REKOMENDASI NUTRISI ====
+    "{nutrition}{nutrition_close}</div>"
+    # ==== IMUNISASI & KPSP ====
+    "{immunization}{kpsp}"
+    # ==== FOOTER ====
+    """
+    <div style='background: #f5f5f5; padding: 15px; border-radius: 10px; 
+                margin-top: 20px; text-align: center;'>
+        <p style='margin: 0; color: #666; font-size: 0.9em;'>
+            📆 Checklist untuk usia {month} bulan | 
+            🏥 Konsultasi ke tenaga kesehatan jika ada kekhawatiran
+        </p>
+    </div>
+    """
+)
+
+
+def _milestone_card_html(domain: str, items: List[str]) -> str:
+    """Render one milestone domain card"""
+    bg_color, text_color, icon = _MILESTONE_COLORS.get(domain, ("#f5f5f5", "#333", "📌"))
+    return _MILESTONE_CARD_TMPL.format_map({
+        "bg_color": bg_color,
+        "text_color": text_color,
+        "icon": icon,
+        "domain_name": _DOMAIN_LABELS.get(domain) or domain.replace("_", " ").title(),
+        "items": "".join(f"<li>{item}</li>" for item in items),
+    })
+
+
+def _build_milestone_html(age: int) -> str:
+    """Render all milestone domain cards of one DEVELOPMENT_MILESTONES age"""
+    return "".join(
+        _milestone_card_html(domain, items)
+        for domain, items in DEVELOPMENT_MILESTONES[age].items()
+    )
+
+
+def _build_nutrition_html(phase: Dict) -> str:
+    """Render the nutrition card heading and recommendation items of one phase"""
+    return _NUTRITION_OPEN_TMPL.format(nutrition_title=phase['title']) + "".join(
+        f"<li>{rec}</li>" for rec in phase['recommendations']
+    )
+
+
+def _build_mpasi_video_html(age: int) -> str:
+    """Render the MPASI video heading and cards of one age group"""
+    videos = MPASI_YOUTUBE_VIDEOS.get(age, [])
+    if not videos:
+        return ""
+    return _MPASI_VIDEO_HEADING_TMPL.format(age=age) + generate_video_links_html(videos)
+
+
+# Static per-age / per-phase blocks, rendered once at import
+_KPSP_VIDEOS_HTML = generate_video_links_html(KPSP_YOUTUBE_VIDEOS)
+_MPASI_AGES = tuple(sorted(MPASI_YOUTUBE_VIDEOS))
+_MPASI_VIDEO_HTML_CACHE = {age: _build_mpasi_video_html(age) for age in _MPASI_AGES}
+_MILESTONE_HTML_CACHE = {age: _build_milestone_html(age) for age in DEVELOPMENT_MILESTONES}
+_NUTRITION_HTML_CACHE = {key: _build_nutrition_html(phase)
+                         for key, phase in NUTRITION_RECOMMENDATIONS.items()}
 
 
 # ==============================================================================
@@ -260,189 +457,46 @@ def generate_monthly_checklist(month: int, z_scores: Dict = None) -> str:
         haz = z_scores.get('haz', 0) or 0
         whz = z_scores.get('whz', 0) or 0
     
-    has_zscore_data = z_scores is not None and any([waz, haz, whz])
-    
-    html_parts = []
-    
-    # ==== HEADER ====
-    html_parts.append(f"""
-    <div style='background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%); 
-                padding: 20px; border-radius: 15px; margin-bottom: 20px;'>
-        <h2 style='color: #c2185b; margin: 0;'>📋 Checklist Bulan ke-{month}</h2>
-        <p style='color: #880e4f; margin: 5px 0 0 0;'>
-            Panduan lengkap untuk usia {month} bulan
-        </p>
-    </div>
-    """)
+    has_zscore_data = z_scores is not None and bool(waz or haz or whz)
+    underweight = has_zscore_data and (whz < -2 or waz < -2)
     
-    # ==== ALERT JIKA TIDAK ADA DATA Z-SCORE ====
+    # Alert: mode mandiri tanpa z-score, atau personalisasi dari z-score
     if not has_zscore_data:
-        html_parts.append("""
-        <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; 
-                    margin-bottom: 20px; border-left: 4px solid #2196f3;'>
-            <p style='margin: 0; color: #1565c0;'>
-                ℹ️ <strong>Mode Mandiri:</strong> Checklist ini dapat digunakan tanpa 
-                melakukan analisis di Kalkulator Gizi terlebih dahulu.
-            </p>
-        </div>
-        """)
-    
-    # ==== PERSONALIZED ALERT (jika ada data z-score) ====
-    if has_zscore_data:
-        if whz < -2 or waz < -2:
-            html_parts.append("""
-            <div style='background: #ffebee; padding: 15px; border-radius: 10px; 
-                        margin-bottom: 20px; border-left: 4px solid #e53935;'>
-                <h4 style='color: #c62828; margin: 0 0 10px 0;'>⚠️ PERHATIAN KHUSUS</h4>
-                <p style='margin: 0; color: #b71c1c;'>
-                    Berdasarkan hasil analisis, anak memerlukan perhatian khusus pada aspek gizi.
-                    Prioritaskan rekomendasi nutrisi dan konsultasi ke tenaga kesehatan.
-                </p>
-            </div>
-            """)
-        elif haz < -2:
-            html_parts.append("""
-            <div style='background: #fff3e0; padding: 15px; border-radius: 10px; 
-                        margin-bottom: 20px; border-left: 4px solid #ff9800;'>
-                <h4 style='color: #e65100; margin: 0 0 10px 0;'>📊 MONITORING TINGGI BADAN</h4>
-                <p style='margin: 0; color: #bf360c;'>
-                    Perlu pemantauan ketat pada pertumbuhan linear. 
-                    Pastikan asupan protein dan kalsium tercukupi.
-                </p>
-            </div>
-            """)
-    
-    # ==== VIDEO EDUKASI ====
-    html_parts.append("""
-    <div style='background: white; padding: 20px; border-radius: 15px; 
-                margin-bottom: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-        <h3 style='color: #6a1b9a; margin: 0 0 15px 0;'>🎥 Video Edukasi</h3>
-    """)
-    
-    # KPSP Videos
-    html_parts.append("""
-        <h4 style='color: #7b1fa2; margin: 15px 0 10px 0;'>📊 Panduan Skrining KPSP</h4>
-    """)
-    html_parts.append(generate_video_links_html(KPSP_YOUTUBE_VIDEOS))
+        zscore_alert = _MANDIRI_ALERT
+    elif underweight:
+        zscore_alert = _UNDERWEIGHT_ALERT
+    elif haz < -2:
+        zscore_alert = _STUNTING_ALERT
+    else:
+        zscore_alert = ""
     
     # MPASI Videos (jika relevan)
+    mpasi_videos_html = ""
     if month >= 6:
-        mpasi_ages = sorted(MPASI_YOUTUBE_VIDEOS.keys())
-        nearest_mpasi_age = 6
-        for age in mpasi_ages:
-            if month >= age:
-                nearest_mpasi_age = age
-        
-        mpasi_videos = MPASI_YOUTUBE_VIDEOS.get(nearest_mpasi_age, [])
-        if mpasi_videos:
-            html_parts.append(f"""
-            <h4 style='color: #7b1fa2; margin: 20px 0 10px 0;'>
-                🍽️ Panduan MPASI ({nearest_mpasi_age} bulan)
-            </h4>
-            """)
-            html_parts.append(generate_video_links_html(mpasi_videos))
-    
-    html_parts.append("</div>")
-    
-    # ==== MILESTONE PERKEMBANGAN ====
-    milestones = get_milestone_for_month(month)
-    
-    html_parts.append("""
-    <div style='background: white; padding: 20px; border-radius: 15px; 
-                margin-bottom: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-        <h3 style='color: #00695c; margin: 0 0 15px 0;'>🎯 Target Perkembangan</h3>
-        <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px;'>
-    """)
-    
-    milestone_colors = {
-        "motorik_kasar": ("#e8f5e9", "#2e7d32", "🏃"),
-        "motorik_halus": ("#e3f2fd", "#1565c0", "✋"),
-        "bahasa": ("#fce4ec", "#c2185b", "🗣️"),
-        "sosial": ("#fff3e0", "#ef6c00", "👋")
-    }
-    
-    for domain, items in milestones.items():
-        bg_color, text_color, icon = milestone_colors.get(domain, ("#f5f5f5", "#333", "📌"))
-        domain_name = domain.replace("_", " ").title()
-        
-        html_parts.append(f"""
-        <div style='background: {bg_color}; padding: 15px; border-radius: 10px;'>
-            <h4 style='color: {text_color}; margin: 0 0 10px 0;'>{icon} {domain_name}</h4>
-            <ul style='margin: 0; padding-left: 20px; color: #333;'>
-        """)
-        
-        for item in items:
-            html_parts.append(f"<li style='margin: 5px 0;'>{item}</li>")
-        
-        html_parts.append("</ul></div>")
-    
-    html_parts.append("</div></div>")
-    
-    # ==== REKOMENDASI NUTRISI ====
-    nutrition = get_nutrition_phase(month)
-    
-    html_parts.append(f"""
-    <div style='background: white; padding: 20px; border-radius: 15px; 
-                margin-bottom: 20px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-        <h3 style='color: #bf360c; margin: 0 0 15px 0;'>🍽️ {nutrition['title']}</h3>
-        <ul style='margin: 0; padding-left: 20px;'>
-    """)
-    
-    for rec in nutrition['recommendations']:
-        html_parts.append(f"<li style='margin: 8px 0; font-size: 1.05em;'>{rec}</li>")
-    
-    # Personalized nutrition (if z-score data available)
-    if has_zscore_data and (whz < -2 or waz < -2):
-        html_parts.append("""
-        </ul>
-        <div style='background: #fff8e1; padding: 15px; border-radius: 10px; margin-top: 15px;'>
-            <h4 style='color: #f57f17; margin: 0 0 10px 0;'>⚡ Rekomendasi Tambahan (Kejar Tumbuh)</h4>
-            <ul style='margin: 0; padding-left: 20px;'>
-                <li>Tingkatkan frekuensi makan (5-6x/hari)</li>
-                <li>Tambah protein hewani di setiap makan</li>
-                <li>Makanan padat energi (alpukat, kacang)</li>
-                <li>Konsultasi dokter untuk suplementasi</li>
-            </ul>
-        </div>
-        """)
-    else:
-        html_parts.append("</ul>")
-    
-    html_parts.append("</div>")
-    
-    # ==== IMUNISASI ====
-    imm = get_immunization_for_month(month)
-    html_parts.append(generate_immunization_html(month))
-    
-    # ==== KPSP ====
-    html_parts.append(generate_kpsp_html(month))
-    
-    # ==== FOOTER ====
-    html_parts.append(f"""
-    <div style='background: #f5f5f5; padding: 15px; border-radius: 10px; 
-                margin-top: 20px; text-align: center;'>
-        <p style='margin: 0; color: #666; font-size: 0.9em;'>
-            📆 Checklist untuk usia {month} bulan | 
-            🏥 Konsultasi ke tenaga kesehatan jika ada kekhawatiran
-        </p>
-    </div>
-    """)
-    
-    return "".join(html_parts)
+        idx = bisect_right(_MPASI_AGES, month) - 1
+        nearest_mpasi_age = _MPASI_AGES[idx] if idx >= 0 else 6
+        mpasi_videos_html = _MPASI_VIDEO_HTML_CACHE.get(nearest_mpasi_age, "")
+    
+    # The stylesheet holds literal braces, so it is prepended after formatting
+    return _CHECKLIST_CSS + _CHECKLIST_TMPL.format_map({
+        "month": month,
+        "zscore_alert": zscore_alert,
+        "kpsp_videos": _KPSP_VIDEOS_HTML,
+        "mpasi_videos": mpasi_videos_html,
+        "milestones": _MILESTONE_HTML_CACHE[_nearest_milestone_age(month)],
+        "nutrition": _NUTRITION_HTML_CACHE[_nutrition_phase_key(month)],
+        "nutrition_close": _CATCH_UP_NUTRITION if underweight else "</ul>",
+        "immunization": generate_immunization_html(month),
+        "kpsp": generate_kpsp_html(month),
+    })
 
 
 # ==============================================================================
 # QUICK CHECKLIST (SIMPLIFIED VERSION)
 # ==============================================================================
 
-def generate_quick_checklist(month: int) -> str:
-    """Generate simplified quick checklist"""
-    
-    milestones = get_milestone_for_month(month)
-    nutrition = get_nutrition_phase(month)
-    immunizations = get_immunization_for_month(month)
-    
-    html = f"""
+_QUICK_TMPL = (
+    """
     <div style='padding: 15px; background: linear-gradient(135deg, #e8f5e9, #c8e6c9); border-radius: 12px;'>
         <h3 style='margin: 0 0 15px 0; color: #2e7d32;'>✅ Quick Checklist - {month} Bulan</h3>
         
@@ -450,32 +504,46 @@ def generate_quick_checklist(month: int) -> str:
             <strong>🎯 Yang Seharusnya Bisa Dilakukan:</strong>
             <ul style='margin: 5px 0; padding-left: 25px;'>
     """
-    
-    # Get key milestones
-    for domain in ['motorik_kasar', 'bahasa']:
-        if domain in milestones and milestones[domain]:
-            html += f"<li>{milestones[domain][0]}</li>"
-    
-    html += "</ul></div>"
-    
-    # Nutrition highlight
-    html += f"""
+    "{milestones}</ul></div>"
+    """
         <div style='margin-bottom: 15px;'>
-            <strong>🍽️ Fokus Nutrisi:</strong> {nutrition['title']}
+            <strong>🍽️ Fokus Nutrisi:</strong> {nutrition_title}
         </div>
     """
-    
-    # Immunization
-    if immunizations:
-        html += f"""
+    "{immunization}</div>"
+)
+
+_QUICK_IMMUNIZATION_TMPL = """
         <div style='background: #ffecb3; padding: 10px; border-radius: 8px;'>
-            <strong>💉 Imunisasi Bulan Ini:</strong> {', '.join(immunizations)}
+            <strong>💉 Imunisasi Bulan Ini:</strong> {immunizations}
         </div>
         """
+
+_QUICK_MILESTONE_DOMAINS = ('motorik_kasar', 'bahasa')
+
+
+@lru_cache(maxsize=64)
+def generate_quick_checklist(month: int) -> str:
+    """Generate simplified quick checklist"""
     
-    html += "</div>"
+    milestones = DEVELOPMENT_MILESTONES[_nearest_milestone_age(month)]
+    immunizations = get_immunization_for_month(month)
     
-    return html
+    # Key milestones: first item of each highlighted domain
+    key_milestones = "".join(
+        f"<li>{milestones[domain][0]}</li>"
+        for domain in _QUICK_MILESTONE_DOMAINS
+        if milestones.get(domain)
+    )
+    
+    return _QUICK_TMPL.format_map({
+        "month": month,
+        "milestones": key_milestones,
+        "nutrition_title": get_nutrition_phase(month)['title'],
+        "immunization": (_QUICK_IMMUNIZATION_TMPL.format(immunizations=', '.join(immunizations))
+                         if immunizations else ""),
+    })
 
 
-print("✅ Checklist module loaded (independent mode)")
+if os.environ.get("ANTHROHPK_VERBOSE"):
+    print("✅ Checklist module loaded (independent mode)")
@@ -8,6 +8,7 @@
 """
 
 from typing import Dict, List, Optional
+from functools import lru_cache
 from datetime import date, datetime, timedelta
 import math
 
@@ -460,6 +461,7 @@ def generate_1000_days_dashboard(dob: date) -> str:
     return html
 
 
+@lru_cache(maxsize=1)
 def generate_1000_days_timeline() -> str:
     """Generate visual timeline of 1000 days"""
     
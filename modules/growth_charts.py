@@ -7,17 +7,26 @@
 #==============================================================================
 """
 
+import io
 import os
 import math
+import pickle
+import threading
+import time
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, Tuple, List, Optional, Union
-from functools import lru_cache
-from datetime import datetime
+from functools import wraps
+from pathlib import Path
 
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend for server
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
 
 plt.ioff()  # Disable interactive mode
 plt.rcParams.update({
@@ -30,10 +39,15 @@ plt.rcParams.update({
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEMES, BOUNDS, OUTPUTS_DIR
+from config import UI_THEMES, BOUNDS, OUTPUTS_DIR, CACHE_DIR
+from .utilities import format_zscore
+from .who_calculator import LMS_TABLES, _lms_rows_vec
 
-# Age grid for smooth curve generation (0-60 months, step 0.25)
-AGE_GRID = np.arange(0.0, 60.25, 0.25)
+# Age grid for smooth curve generation (0-60 months, step 0.25); float32 is
+# far finer than chart pixels, and quarter-month steps are exact in it
+AGE_GRID = np.arange(0.0, 60.25, 0.25, dtype=np.float32)
+# Shared by every curve, so read-only instead of copied per caller
+AGE_GRID.setflags(write=False)
 
 
 # ==============================================================================
@@ -76,11 +90,25 @@ def brentq_rootfind(f, a: float, b: float, xtol: float = 1e-6, maxiter: int = 10
     return 0.5 * (a + b)
 
 
-def invert_zscore_function(z_func, target_z: float, lo: float, hi: float, samples: int = 150) -> float:
+def invert_zscore_function(z_func, target_z: float, lo: float, hi: float, samples: int = 150,
+                           z_func_vec=None) -> float:
     """
     Invert z-score function to find measurement value that produces target z-score
+    
+    Args:
+        z_func: Scalar z-score function (returns None when not computable)
+        target_z: Z-score to reach
+        lo, hi: Measurement search range
+        samples: Number of bracketing samples
+        z_func_vec: Optional array version of z_func (NaN when not computable);
+            when given, all samples are evaluated in one call
     """
     xs = np.linspace(lo, hi, samples)
+    
+    if z_func_vec is not None:
+        zs = np.asarray(z_func_vec(xs), dtype=np.float64)
+        return _root_from_samples(z_func, target_z, xs, zs, lo, hi)
+    
     last_x, last_f = None, None
     best_x, best_abs = None, float('inf')
     
@@ -110,130 +138,373 @@ def invert_zscore_function(z_func, target_z: float, lo: float, hi: float, sample
     return float(best_x if best_x is not None else (lo + hi) / 2.0)
 
 
+def _root_from_samples(z_func, target_z: float, xs: np.ndarray, zs: np.ndarray,
+                       lo: float, hi: float) -> float:
+    """Refine the first bracketed crossing of target_z in sampled z-scores (NaN = skip)"""
+    fs = zs - target_z
+    valid = ~np.isnan(fs)
+    if not valid.any():
+        return (lo + hi) / 2.0
+    
+    # Sign changes between consecutive computable samples
+    vx, vf = xs[valid], fs[valid]
+    crossings = np.flatnonzero(vf[:-1] * vf[1:] < 0)
+    if crossings.size:
+        i = crossings[0]
+        return float(brentq_rootfind(
+            lambda t: (z_func(t) or 0.0) - target_z, vx[i], vx[i + 1], xtol=1e-5
+        ))
+    return float(vx[np.argmin(np.abs(vf))])
+
+
+def invert_zscore_targets(z_func, targets, lo: float, hi: float, samples: int = 150,
+                          z_func_vec=None) -> Tuple[float, ...]:
+    """
+    invert_zscore_function for several target z-scores sharing one sampling pass
+    
+    Args:
+        z_func: Scalar z-score function (returns None when not computable)
+        targets: Z-scores to reach, e.g. (-2, 0, 2)
+        lo, hi: Measurement search range
+        samples: Number of bracketing samples
+        z_func_vec: Optional array version of z_func; when given the samples are
+            evaluated once for all targets
+        
+    Returns:
+        One measurement value per target, in order
+    """
+    if z_func_vec is None:
+        return tuple(invert_zscore_function(z_func, t, lo, hi, samples) for t in targets)
+    
+    xs = np.linspace(lo, hi, samples)
+    zs = np.asarray(z_func_vec(xs), dtype=np.float64)
+    return tuple(_root_from_samples(z_func, t, xs, zs, lo, hi) for t in targets)
+
+
+def invert_zscore_newton(L: np.ndarray, M: np.ndarray, S: np.ndarray, target_z: float,
+                         lo: float, hi: float) -> np.ndarray:
+    """
+    Closed-form inverse of the LMS z-score, for all curve points at once
+    
+    z = ((x/M)^L - 1) / (L*S)  =>  x = M * (1 + L*S*z)^(1/L)
+    z = ln(x/M) / S (L == 0)   =>  x = M * exp(S*z)
+    
+    With the analytic derivative dz/dx = (x/M)^(L-1) / (L*S*M) a Newton
+    step from any start lands here exactly, so no iteration is needed.
+    Results are clipped to [lo, hi], the same bounds the measurement search
+    used; where 1 + L*S*z <= 0 no finite measurement reaches target_z (a
+    bracketing search would only run into the bound on that side), so the
+    value saturates there instead of falling back to Brent.
+    
+    Args:
+        L, M, S: LMS parameters per curve point (NaN rows give NaN)
+        target_z: Z-score of the curve, or a column of z-scores (shape (k, 1))
+            to get k curves at once
+        lo, hi: Measurement range
+        
+    Returns:
+        Measurement values reaching target_z, shape broadcast(target_z, M)
+    """
+    log_L = L == 0
+    safe_L = np.where(log_L, 1.0, L)
+    base = 1.0 + safe_L * S * target_z
+    no_root = ~log_L & (base <= 0)
+    
+    with np.errstate(invalid='ignore', over='ignore'):
+        x = np.power(np.where(no_root, 1.0, base), 1.0 / safe_L)
+        x *= M
+        # WHO tables rarely have L == 0, so skip the exp pass when none do
+        if log_L.any():
+            x = np.where(log_L, M * np.exp(S * target_z), x)
+    
+    # No finite root: below every measurement for L > 0, above for L < 0
+    x = np.where(no_root, np.where(L > 0, lo, hi), x)
+    np.clip(x, lo, hi, out=x)
+    return np.where(np.isnan(M), np.nan, x)
+
+
+def _curve_lms(indicator: str, sex: str, age_months: np.ndarray,
+               height: Optional[np.ndarray] = None) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """L, M, S columns of the WHO table rows behind each curve point (None without tables)"""
+    if not LMS_TABLES:
+        return None
+    
+    # Table lookups run in float64 so week/month flooring matches the z-score code
+    if height is not None:
+        height = height.astype(np.float64)
+    lms = _lms_rows_vec(indicator, age_months.astype(np.float64),
+                        np.full(age_months.shape, sex.upper()), height)
+    return lms[:, 0], lms[:, 1], lms[:, 2]
+
+
+def _build_wfl_reference(sex: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Join the recumbent-length (<= 86 cm) and standing-height WHO tables
+    into one length axis with aligned L, M, S columns
+    
+    Returns:
+        Tuple of (lengths, array of shape (n, 3)), or None without tables
+    """
+    wfl = LMS_TABLES.get(('wfl', sex, '0_2'))
+    wfh = LMS_TABLES.get(('wfh', sex, '2_5'))
+    if wfl is None or wfh is None:
+        return None
+    
+    (wfl_start, wfl_step, wfl_lms), (wfh_start, wfh_step, wfh_lms) = wfl, wfh
+    wfl_lengths = wfl_start + wfl_step * np.arange(wfl_lms.shape[0])
+    wfh_lengths = wfh_start + wfh_step * np.arange(wfh_lms.shape[0])
+    
+    # Same switch-over as _lms_rows_vec: length table up to 86 cm
+    recumbent = wfl_lengths <= 86
+    standing = wfh_lengths > 86
+    lengths = np.concatenate((wfl_lengths[recumbent], wfh_lengths[standing]))
+    lms = np.concatenate((wfl_lms[recumbent], wfh_lms[standing]))
+    valid = ~np.isnan(lms).any(axis=1)
+    return lengths[valid], lms[valid]
+
+
+# sex -> (reference lengths, L/M/S rows) for weight-for-length curves
+_WFL_REF = {sex: _build_wfl_reference(sex) for sex in ('M', 'F')}
+
+
+def _wfl_lms(sex: str, lengths: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """L, M, S at each query length in one np.interp pass per column"""
+    ref = _WFL_REF.get(sex.upper())
+    if ref is None:
+        return None
+    
+    ref_lengths, lms = ref
+    lengths = lengths.astype(np.float64)
+    return tuple(np.interp(lengths, ref_lengths, lms[:, i]) for i in range(3))
+
+
 # ==============================================================================
 # CURVE GENERATION
 # ==============================================================================
 
-@lru_cache(maxsize=128)
-def generate_wfa_curve(sex: str, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
-    """Generate Weight-for-Age WHO curve for given z-score"""
-    from .who_calculator import get_calculator, _safe_z_calc
+# SD levels drawn on every chart; curve tables hold one row per level
+SD_LEVELS = (-3, -2, -1, 0, 1, 2, 3)
+_SD_LEVELS_COL = np.array(SD_LEVELS, dtype=np.float64)[:, None]
+
+# Weight-for-length x grid (cm). The tables are selected by length only,
+# so the reference curves do not depend on the child's age
+WFL_LENGTHS = np.arange(BOUNDS['wfl_l'][0], BOUNDS['wfl_l'][1] + 0.5, 0.5, dtype=np.float32)
+WFL_LENGTHS.setflags(write=False)
+
+# Chart indicator -> (LMS table indicator, BOUNDS key of the measurement)
+_CURVE_SPECS = {
+    'wfa': ('wfa', 'wfa'),
+    'hfa': ('lhfa', 'hfa'),
+    'hcfa': ('hcfa', 'hcfa'),
+    'wfl': ('wfl', 'wfl_w'),
+}
+
+# Bump when the curve algorithm changes so stale files are not reused
+CURVE_CACHE_VERSION = 4
+CURVE_CACHE_DIR = os.path.join(CACHE_DIR, f"curves_v{CURVE_CACHE_VERSION}")
+
+
+def disk_cached_table(func):
+    """
+    Persist a curve table's (x, curves) output as .npy under CURVE_CACHE_DIR
     
-    calc = get_calculator()
-    if calc is None:
-        return AGE_GRID.copy(), np.zeros_like(AGE_GRID)
+    Tables are identical across processes, so after the first run they are
+    loaded instead of recomputed. Writes go through a temp file and
+    os.replace so concurrent workers never read a partial file. A None
+    result (WHO tables unavailable) is not stored.
+    """
+    @wraps(func)
+    def wrapper(*args):
+        key = "_".join(str(arg) for arg in args)
+        path = os.path.join(CURVE_CACHE_DIR, f"{func.__name__}_{key}.npy")
+        
+        try:
+            xy = np.load(path)
+            return xy[0], xy[1:]
+        except (OSError, ValueError):
+            pass
+        
+        result = func(*args)
+        if result is None:
+            return None
+        
+        x, curves = result
+        try:
+            os.makedirs(CURVE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.vstack((x, curves)))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"❌ Error in disk_cached_table: {e}")
+        return x, curves
+    
+    return wrapper
+
+
+def _lms_curves(indicator: str, sex: str, z) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Curves of one chart indicator for a z-score (or a (k, 1) column of z-scores)
     
-    lo, hi = BOUNDS['wfa']
+    Returns:
+        Tuple of (x grid, float32 values), or None without WHO tables
+    """
+    lms_indicator, bounds_key = _CURVE_SPECS[indicator]
     
-    def z_func(weight, age):
-        return _safe_z_calc(calc.wfa, weight, age, sex)
+    if indicator == 'wfl':
+        x = WFL_LENGTHS
+        lms = _wfl_lms(sex, x)
+    else:
+        x = AGE_GRID
+        lms = _curve_lms(lms_indicator, sex, x)
     
-    weights = []
-    for age in AGE_GRID:
-        weight = invert_zscore_function(
-            lambda w: z_func(w, age),
-            z_score,
-            lo,
-            hi
-        )
-        weights.append(weight)
+    if lms is None:
+        return None
     
-    return AGE_GRID.copy(), np.array(weights)
+    lo, hi = BOUNDS[bounds_key]
+    return x, invert_zscore_newton(*lms, z, lo, hi).astype(np.float32)
 
 
-@lru_cache(maxsize=128)
-def generate_hfa_curve(sex: str, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
-    """Generate Height-for-Age WHO curve for given z-score"""
-    from .who_calculator import get_calculator, _safe_z_calc
-    
-    calc = get_calculator()
-    if calc is None:
-        return AGE_GRID.copy(), np.zeros_like(AGE_GRID)
-    
-    lo, hi = BOUNDS['hfa']
-    
-    def z_func(height, age):
-        return _safe_z_calc(calc.lhfa, height, age, sex)
+@disk_cached_table
+def _compute_curve_table(indicator: str, sex: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """All SD_LEVELS curves of one chart in a single broadcast pass"""
+    return _lms_curves(indicator, sex, _SD_LEVELS_COL)
+
+
+# Curves are read on every chart but written once per key, so lookups are
+# plain dict gets and only misses take the lock
+# (indicator, sex) -> (x grid, curve table)
+_CURVE_TABLES: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+# (indicator, sex, z rounded to 0.01) -> (x grid, curve)
+_CURVE_CACHE: Dict[Tuple[str, str, float], Tuple[np.ndarray, np.ndarray]] = {}
+_curve_lock = threading.Lock()
+
+
+def generate_curve_table(indicator: str, sex: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the WHO reference curves of a chart for every SD level
     
-    heights = []
-    for age in AGE_GRID:
-        height = invert_zscore_function(
-            lambda h: z_func(h, age),
-            z_score,
-            lo,
-            hi
-        )
-        heights.append(height)
+    Args:
+        indicator: 'wfa', 'hfa', 'hcfa' or 'wfl'
+        sex: 'M' or 'F'
+        
+    Returns:
+        Tuple of (x grid, array of shape (len(SD_LEVELS), len(x))); rows
+        follow SD_LEVELS. Zeros when the WHO tables are unavailable.
+    """
+    key = (indicator, sex)
+    table = _CURVE_TABLES.get(key)
+    if table is not None:
+        return table
+    
+    with _curve_lock:
+        table = _CURVE_TABLES.get(key)
+        if table is None:
+            table = _compute_curve_table(indicator, sex)
+            if table is None:
+                x = WFL_LENGTHS if indicator == 'wfl' else AGE_GRID
+                table = x, np.zeros((len(SD_LEVELS), x.shape[0]), dtype=np.float32)
+            # Callers share the cached arrays
+            for array in table:
+                array.setflags(write=False)
+            _CURVE_TABLES[key] = table
+    return table
+
+
+def _curve_from_table(indicator: str, sex: str, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
+    """One curve: a row of the cached table for SD levels, computed otherwise"""
+    key = (indicator, sex, round(float(z_score), 2))
+    curve = _CURVE_CACHE.get(key)
+    if curve is not None:
+        return curve
+    
+    z = key[2]
+    if z in SD_LEVELS:
+        x, table = generate_curve_table(indicator, sex)
+        curve = x, table[SD_LEVELS.index(z)]
+    else:
+        curve = _lms_curves(indicator, sex, z)
+        if curve is None:
+            x = WFL_LENGTHS if indicator == 'wfl' else AGE_GRID
+            curve = x, np.zeros(x.shape, dtype=np.float32)
     
-    return AGE_GRID.copy(), np.array(heights)
+    with _curve_lock:
+        return _CURVE_CACHE.setdefault(key, curve)
+
+
+def generate_wfa_table(sex: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Weight-for-Age WHO curves for all SD levels"""
+    return generate_curve_table('wfa', sex)
+
+
+def generate_hfa_table(sex: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Height-for-Age WHO curves for all SD levels"""
+    return generate_curve_table('hfa', sex)
+
+
+def generate_hcfa_table(sex: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Head Circumference-for-Age WHO curves for all SD levels"""
+    return generate_curve_table('hcfa', sex)
+
+
+def generate_wfl_table(sex: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Weight-for-Length WHO curves for all SD levels"""
+    return generate_curve_table('wfl', sex)
+
+
+def generate_wfa_curve(sex: str, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate Weight-for-Age WHO curve for given z-score"""
+    return _curve_from_table('wfa', sex, z_score)
+
+
+def generate_hfa_curve(sex: str, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate Height-for-Age WHO curve for given z-score"""
+    return _curve_from_table('hfa', sex, z_score)
 
 
-@lru_cache(maxsize=128)
 def generate_hcfa_curve(sex: str, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
     """Generate Head Circumference-for-Age WHO curve for given z-score"""
-    from .who_calculator import get_calculator, _safe_z_calc
-    
-    calc = get_calculator()
-    if calc is None:
-        return AGE_GRID.copy(), np.zeros_like(AGE_GRID)
-    
-    lo, hi = BOUNDS['hcfa']
-    
-    def z_func(hc, age):
-        return _safe_z_calc(calc.hcfa, hc, age, sex)
-    
-    head_circs = []
-    for age in AGE_GRID:
-        hc = invert_zscore_function(
-            lambda h: z_func(h, age),
-            z_score,
-            lo,
-            hi
-        )
-        head_circs.append(hc)
-    
-    return AGE_GRID.copy(), np.array(head_circs)
+    return _curve_from_table('hcfa', sex, z_score)
 
 
-@lru_cache(maxsize=128)
 def generate_wfl_curve(sex: str, age_months: float, z_score: float) -> Tuple[np.ndarray, np.ndarray]:
     """Generate Weight-for-Length WHO curve for given z-score"""
-    from .who_calculator import get_calculator, _safe_z_calc
-    
-    calc = get_calculator()
-    if calc is None:
-        lengths = np.arange(BOUNDS['wfl_l'][0], BOUNDS['wfl_l'][1] + 0.5, 0.5)
-        return lengths, np.zeros_like(lengths)
-    
-    lengths = np.arange(BOUNDS['wfl_l'][0], BOUNDS['wfl_l'][1] + 0.5, 0.5)
-    lo_w, hi_w = BOUNDS['wfl_w']
-    
-    def z_func(weight, length):
-        return _safe_z_calc(calc.wfl, weight, age_months, sex, length)
-    
-    weights = []
-    for length in lengths:
-        weight = invert_zscore_function(
-            lambda w: z_func(w, length),
-            z_score,
-            lo_w,
-            hi_w
-        )
-        weights.append(weight)
-    
-    return lengths, np.array(weights)
+    return _curve_from_table('wfl', sex, z_score)
+
+
+# Warm the tables for both sexes so the first chart does no curve work
+for _indicator in _CURVE_SPECS:
+    for _sex in ('M', 'F'):
+        generate_curve_table(_indicator, _sex)
 
 
 # ==============================================================================
 # THEME APPLICATION
 # ==============================================================================
 
-def apply_matplotlib_theme(theme_name: str = "pink_pastel") -> Dict[str, str]:
-    """Apply custom theme to matplotlib"""
-    theme = UI_THEMES.get(theme_name, UI_THEMES["pink_pastel"])
-    
-    plt.style.use('default')
-    plt.rcParams.update({
+# rcParams shared by every theme; set once at import and never changed, so
+# worker threads can read them safely
+_BASE_RCPARAMS = {
+    "grid.alpha": 0.35,
+    "grid.linestyle": "--",
+    "grid.linewidth": 0.8,
+    "legend.framealpha": 1.0,
+    "legend.fancybox": True,
+    "legend.shadow": True,
+    "font.size": 10,
+    "axes.titlesize": 13,
+    "axes.titleweight": "bold",
+    "axes.labelsize": 11,
+    "xtick.labelsize": 9,
+    "ytick.labelsize": 9,
+    "legend.fontsize": 9,
+    "axes.linewidth": 1.5,
+}
+
+
+def _theme_rcparams(theme: Dict[str, str]) -> Dict[str, object]:
+    """rcParams overrides for a theme"""
+    return {
         "axes.facecolor": theme["card"],
         "figure.facecolor": theme["bg"],
         "savefig.facecolor": theme["bg"],
@@ -243,58 +514,146 @@ def apply_matplotlib_theme(theme_name: str = "pink_pastel") -> Dict[str, str]:
         "xtick.color": theme["text"],
         "ytick.color": theme["text"],
         "grid.color": theme["border"],
-        "grid.alpha": 0.35,
-        "grid.linestyle": "--",
-        "grid.linewidth": 0.8,
-        "legend.framealpha": 1.0,
-        "legend.fancybox": True,
         "legend.edgecolor": theme["border"],
-        "legend.shadow": True,
-        "font.size": 10,
-        "axes.titlesize": 13,
-        "axes.titleweight": "bold",
-        "axes.labelsize": 11,
-        "xtick.labelsize": 9,
-        "ytick.labelsize": 9,
-        "legend.fontsize": 9,
-        "axes.linewidth": 1.5,
-    })
+        **_BASE_RCPARAMS,
+    }
+
+
+def get_theme(theme_name: str = "pink_pastel") -> Dict[str, str]:
+    """Theme colours, falling back to the default theme"""
+    return UI_THEMES.get(theme_name, UI_THEMES["pink_pastel"])
+
+
+def apply_matplotlib_theme(theme_name: str = "pink_pastel") -> Dict[str, str]:
+    """
+    Make a theme the global matplotlib default for ad-hoc pyplot figures
     
+    The chart functions below do not depend on it: rcParams are process
+    global, so they pass the theme colours to each figure and artist
+    instead (see new_figure / style_axes).
+    """
+    theme = get_theme(theme_name)
+    plt.rcParams.update(_theme_rcparams(theme))
     return theme
 
 
-def _fill_zone_between_curves(ax, x: np.ndarray, lower: np.ndarray, upper: np.ndarray, 
-                              color: str, alpha: float, label: str):
-    """Helper to fill colored zones between SD curves"""
+def style_axes(ax, theme: Dict[str, str]):
+    """Give an axes the theme colours its rcParams would have set"""
+    ax.set_facecolor(theme["card"])
+    for spine in ax.spines.values():
+        spine.set_edgecolor(theme["border"])
+    ax.tick_params(which='both', colors=theme["text"])
+    for text in (ax.xaxis.label, ax.yaxis.label, ax.title):
+        text.set_color(theme["text"])
+
+
+def legend_kwargs(theme: Dict[str, str]) -> Dict[str, str]:
+    """Theme colours for ax.legend()"""
+    return {'facecolor': theme["card"], 'edgecolor': theme["border"], 'labelcolor': theme["text"]}
+
+
+# Base style for ad-hoc figures; the charts style themselves
+plt.style.use('default')
+apply_matplotlib_theme()
+
+
+def new_figure(figsize: Tuple[float, float] = (12, 7.5), theme: Optional[Dict[str, str]] = None):
+    """
+    Create a themed figure with its own Agg canvas, outside pyplot's global state
+    
+    Figures created this way can be drawn and saved from worker threads.
+    
+    Returns:
+        Tuple of (fig, ax)
+    """
+    theme = theme or get_theme()
+    fig = Figure(figsize=figsize, facecolor=theme["bg"])
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    style_axes(ax, theme)
+    return fig, ax
+
+
+def _zone_polygon(x: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """Closed (2N, 2) outline of the band between two curves"""
+    return np.column_stack((np.concatenate((x, x[::-1])),
+                            np.concatenate((lower, upper[::-1]))))
+
+
+def _fill_zone_between_curves(ax, verts: np.ndarray, color: str, alpha: float, label: str):
+    """Helper to fill a colored zone between SD curves from its cached outline"""
     try:
-        ax.fill_between(
-            x, lower, upper,
-            color=color,
+        ax.add_collection(PolyCollection(
+            [verts],
+            facecolors=color,
             alpha=alpha,
             zorder=1,
             label=label,
-            linewidth=0,
-            edgecolor='none'
-        )
+            linewidths=0,
+            edgecolors='none'
+        ))
     except Exception as e:
         print(f"Fill zone warning: {e}")
 
 
 # ==============================================================================
-# PLOTTING FUNCTIONS
+# CHART SKELETONS (PRECOMPUTED REFERENCE BANDS)
 # ==============================================================================
 
-def plot_weight_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
-    """Plot Weight-for-Age growth chart with child's data point"""
-    from .utilities import format_zscore
-    
-    theme = apply_matplotlib_theme(theme_name)
-    
-    sex = payload['sex']
-    age = payload['age_mo']
-    weight = payload.get('w')
-    
-    sd_lines = {
+# Colored zones between SD curves: (lower z, upper z, color, alpha, label)
+ZONE_SPECS = {
+    'wfa': [
+        (-3, -2, '#FFE6E6', 0.4, 'Gizi Buruk'),
+        (-2, -1, '#FFEBCC', 0.35, 'Gizi Kurang'),
+        (-1, 1, '#E8F5E9', 0.45, 'Normal'),
+        (1, 2, '#FFF3CD', 0.35, 'Risiko Lebih'),
+        (2, 3, '#F8D7DA', 0.4, 'Gizi Lebih'),
+    ],
+    'hfa': [
+        (-3, -2, '#FFE6E6', 0.4, 'Sangat Pendek'),
+        (-2, -1, '#FFEBCC', 0.35, 'Pendek'),
+        (-1, 1, '#E8F5E9', 0.45, 'Normal'),
+        (1, 2, '#E3F2FD', 0.35, 'Tinggi'),
+        (2, 3, '#E8EAF6', 0.4, 'Sangat Tinggi'),
+    ],
+    'hcfa': [
+        (-3, -2, '#FFE6E6', 0.4, 'Mikrosefali'),
+        (-2, 2, '#E8F5E9', 0.45, 'Normal'),
+        (2, 3, '#FFE6E6', 0.4, 'Makrosefali'),
+    ],
+    'wfl': [
+        (-3, -2, '#FFE6E6', 0.4, 'Gizi Buruk'),
+        (-2, -1, '#FFEBCC', 0.35, 'Gizi Kurang'),
+        (-1, 1, '#E8F5E9', 0.45, 'Normal'),
+        (1, 2, '#FFF3CD', 0.35, 'Risiko Lebih'),
+        (2, 3, '#F8D7DA', 0.4, 'Gizi Lebih'),
+    ],
+}
+
+# (sex, indicator) -> zone outlines in ZONE_SPECS order
+_ZONE_CACHE: Dict[Tuple[str, str], List[np.ndarray]] = {}
+
+
+def get_zone_polygons(indicator: str, sex: str) -> List[np.ndarray]:
+    """Vertex arrays of the colored zones of a chart, built once per (sex, indicator)"""
+    key = (sex, indicator)
+    polygons = _ZONE_CACHE.get(key)
+    if polygons is None:
+        x, table = generate_curve_table(indicator, sex)
+        curves = dict(zip(SD_LEVELS, table))
+        polygons = [_zone_polygon(x, curves[lower], curves[upper])
+                    for lower, upper, _, _, _ in ZONE_SPECS[indicator]]
+        _ZONE_CACHE[key] = polygons
+    return polygons
+
+
+# Pickled figures with zones + SD lines drawn, keyed by (indicator, sex, theme)
+_CHART_SKELETONS: Dict[Tuple[str, str, str], bytes] = {}
+
+
+def get_sd_line_styles(theme: Dict[str, str]) -> Dict[int, Tuple[str, str, float]]:
+    """SD line (color, linestyle, linewidth) for each z-score"""
+    return {
         -3: ('#DC143C', '-', 2.0),
         -2: ('#FF6347', '-', 2.5),
         -1: (theme['primary'], '--', 1.5),
@@ -303,302 +662,222 @@ def plot_weight_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figur
         2: ('#FF6347', '-', 2.5),
         3: ('#DC143C', '-', 2.0)
     }
-    
-    curves = {z: generate_wfa_curve(sex, z) for z in sd_lines.keys()}
-    
-    fig, ax = plt.subplots(figsize=(12, 7.5))
-    
-    x = curves[0][0]
-    
-    _fill_zone_between_curves(ax, x, curves[-3][1], curves[-2][1], '#FFE6E6', 0.4, 'Gizi Buruk')
-    _fill_zone_between_curves(ax, x, curves[-2][1], curves[-1][1], '#FFEBCC', 0.35, 'Gizi Kurang')
-    _fill_zone_between_curves(ax, x, curves[-1][1], curves[1][1],  '#E8F5E9', 0.45, 'Normal')
-    _fill_zone_between_curves(ax, x, curves[1][1],  curves[2][1],  '#FFF3CD', 0.35, 'Risiko Lebih')
-    _fill_zone_between_curves(ax, x, curves[2][1],  curves[3][1],  '#F8D7DA', 0.4, 'Gizi Lebih')
+
+
+def _build_chart_skeleton(indicator: str, sex: str, theme: Dict[str, str]) -> Figure:
+    """Draw the static part of a growth chart (zones and SD curves)"""
+    fig, ax = new_figure(figsize=(12, 7.5), theme=theme)
+    _draw_chart_reference(ax, indicator, sex, theme)
+    return fig
+
+
+def _draw_chart_reference(ax, indicator: str, sex: str, theme: Dict[str, str]):
+    """Draw the WHO zones and SD curves of a chart onto ax"""
+    sd_lines = get_sd_line_styles(theme)
+    x, table = generate_curve_table(indicator, sex)
+    curves = dict(zip(SD_LEVELS, table))
+    
+    # One collection per zone keeps a legend entry for each band
+    for verts, (_, _, color, alpha, label) in zip(get_zone_polygons(indicator, sex), ZONE_SPECS[indicator]):
+        _fill_zone_between_curves(ax, verts, color, alpha, label)
+    
+    # All SD curves as one artist; empty proxy lines carry the legend entries
+    colors, linestyles, linewidths = zip(*sd_lines.values())
+    ax.add_collection(LineCollection(
+        [np.column_stack((x, curves[z])) for z in sd_lines],
+        colors=colors,
+        linestyles=linestyles,
+        linewidths=linewidths,
+        capstyle='butt',
+        joinstyle='round',
+        zorder=5,
+        alpha=0.9
+    ))
     
     for z, (color, linestyle, linewidth) in sd_lines.items():
         label = "Median (WHO)" if z == 0 else f"{z:+d} SD"
-        ax.plot(
-            curves[z][0], curves[z][1],
-            color=color,
-            linestyle=linestyle,
-            linewidth=linewidth,
-            label=label,
-            zorder=5,
-            alpha=0.9
-        )
-    
-    if weight is not None:
-        z_waz = payload['z'].get('waz')
-        
-        if z_waz is not None:
-            if abs(z_waz) > 3:
-                point_color = '#8B0000'
-                point_size = 500
-            elif abs(z_waz) > 2:
-                point_color = '#DC143C'
-                point_size = 450
-            elif abs(z_waz) > 1:
-                point_color = theme['primary']
-                point_size = 400
-            else:
-                point_color = theme['secondary']
-                point_size = 400
-        else:
-            point_color = theme['secondary']
-            point_size = 400
-        
-        ax.scatter(
-            [age], [weight],
-            s=point_size,
-            c=point_color,
-            edgecolors='white',
-            linewidths=3,
-            label=f"Data Anak ({weight:.1f} kg)",
-            zorder=10,
-            marker='o',
-            alpha=1.0
-        )
-        
-        ax.annotate(
-            f"{weight:.1f} kg\nZ: {format_zscore(z_waz)}",
-            (age, weight),
-            xytext=(10, 10),
-            textcoords='offset points',
-            fontsize=10,
-            fontweight='bold',
-            bbox=dict(
-                boxstyle='round,pad=0.6',
-                facecolor=point_color,
-                edgecolor='white',
-                linewidth=2,
-                alpha=0.9
-            ),
-            color='white',
-            zorder=11
-        )
+        ax.add_line(Line2D([], [], color=color, linestyle=linestyle, linewidth=linewidth,
+                           label=label, zorder=5, alpha=0.9))
     
-    ax.set_xlabel("Usia (bulan)", fontsize=12, fontweight='bold')
-    ax.set_ylabel("Berat Badan (kg)", fontsize=12, fontweight='bold')
-    ax.set_title(
-        f"Grafik Berat Badan menurut Umur (BB/U) - WHO Standards\n"
-        f"{'Laki-laki' if sex == 'M' else 'Perempuan'} | Usia: {age:.1f} bulan",
-        fontsize=14,
-        fontweight='bold',
-        pad=15
-    )
-    
-    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7)
-    ax.legend(loc='upper left', framealpha=0.95, fancybox=True, shadow=True, fontsize=9)
-    ax.set_xlim(-1, 62)
-    ax.set_ylim(0, None)
-    
-    plt.tight_layout()
-    
-    return fig
+    # add_collection() grows dataLim but leaves the view at (0, 1); fit it
+    # now so the skeleton (and the SVG backdrop built from it) has real limits
+    ax.autoscale_view()
 
 
-def plot_height_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
-    """Plot Height-for-Age growth chart with child's data point"""
-    from .utilities import format_zscore
-    
-    theme = apply_matplotlib_theme(theme_name)
+def get_chart_skeleton(indicator: str, sex: str, theme_name: str = "pink_pastel"):
+    """
+    Get a fresh copy of the precomputed chart skeleton
     
-    sex = payload['sex']
-    age = payload['age_mo']
-    height = payload.get('h')
+    The skeleton is built once per (indicator, sex, theme) and stored
+    pickled; each call unpickles an independent figure so only the
+    child's data point needs to be drawn per request.
     
-    sd_lines = {
-        -3: ('#DC143C', '-', 2.0),
-        -2: ('#FF6347', '-', 2.5),
-        -1: (theme['primary'], '--', 1.5),
-        0: (theme['secondary'], '-', 2.5),
-        1: (theme['primary'], '--', 1.5),
-        2: ('#FF6347', '-', 2.5),
-        3: ('#DC143C', '-', 2.0)
-    }
-    
-    curves = {z: generate_hfa_curve(sex, z) for z in sd_lines.keys()}
+    Returns:
+        Tuple of (fig, ax)
+    """
+    key = (indicator, sex, theme_name)
     
-    fig, ax = plt.subplots(figsize=(12, 7.5))
+    if key not in _CHART_SKELETONS:
+        theme = get_theme(theme_name)
+        skeleton = _build_chart_skeleton(indicator, sex, theme)
+        _CHART_SKELETONS[key] = pickle.dumps(skeleton)
     
-    x = curves[0][0]
+    fig = pickle.loads(_CHART_SKELETONS[key])
+    FigureCanvasAgg(fig)
+    return fig, fig.axes[0]
+
+
+# ==============================================================================
+# FIGURE POOL (REUSED CHART SKELETONS)
+# ==============================================================================
+
+FIGURE_POOL_SIZE = 2  # idle figures kept per (indicator, sex, theme)
+
+
+class FigurePool:
+    """
+    Idle chart skeletons handed back out instead of unpickling new ones
     
-    _fill_zone_between_curves(ax, x, curves[-3][1], curves[-2][1], '#FFE6E6', 0.4, 'Sangat Pendek')
-    _fill_zone_between_curves(ax, x, curves[-2][1], curves[-1][1], '#FFEBCC', 0.35, 'Pendek')
-    _fill_zone_between_curves(ax, x, curves[-1][1], curves[1][1],  '#E8F5E9', 0.45, 'Normal')
-    _fill_zone_between_curves(ax, x, curves[1][1],  curves[2][1],  '#E3F2FD', 0.35, 'Tinggi')
-    _fill_zone_between_curves(ax, x, curves[2][1],  curves[3][1],  '#E8EAF6', 0.4, 'Sangat Tinggi')
+    A figure from acquire() holds only the skeleton; the plot_* functions
+    add the child's point, labels and legend, and release() strips those
+    again (restoring data limits, layout and dpi) so the next request gets
+    a clean skeleton without allocating a figure.
+    """
     
-    for z, (color, linestyle, linewidth) in sd_lines.items():
-        label = "Median (WHO)" if z == 0 else f"{z:+d} SD"
-        ax.plot(
-            curves[z][0], curves[z][1],
-            color=color,
-            linestyle=linestyle,
-            linewidth=linewidth,
-            label=label,
-            zorder=5,
-            alpha=0.9
-        )
+    def __init__(self, size: int = FIGURE_POOL_SIZE):
+        self.size = size
+        self._idle: Dict[Tuple[str, str, str], List[Figure]] = {}
+        self._lock = threading.Lock()
     
-    if height is not None:
-        z_haz = payload['z'].get('haz')
+    def acquire(self, indicator: str, sex: str, theme_name: str):
+        """
+        Get a skeleton figure for (indicator, sex, theme)
         
-        if z_haz is not None:
-            if abs(z_haz) > 3:
-                point_color = '#8B0000'
-                point_size = 500
-            elif abs(z_haz) > 2:
-                point_color = '#DC143C'
-                point_size = 450
-            elif abs(z_haz) > 1:
-                point_color = theme['primary']
-                point_size = 400
-            else:
-                point_color = theme['secondary']
-                point_size = 400
-        else:
-            point_color = theme['secondary']
-            point_size = 400
+        Returns:
+            Tuple of (fig, ax)
+        """
+        key = (indicator, sex, theme_name)
+        with self._lock:
+            idle = self._idle.get(key)
+            fig = idle.pop() if idle else None
         
-        ax.scatter(
-            [age], [height],
-            s=point_size,
-            c=point_color,
-            edgecolors='white',
-            linewidths=3,
-            label=f"Data Anak ({height:.1f} cm)",
-            zorder=10,
-            marker='o',
-            alpha=1.0
-        )
+        if fig is None:
+            fig, ax = get_chart_skeleton(indicator, sex, theme_name)
+            subplotpars = fig.subplotpars
+            fig._pool_state = (
+                key,
+                len(ax.collections),
+                len(ax.texts),
+                ax.dataLim.get_points().copy(),
+                fig.dpi,
+                {name: getattr(subplotpars, name)
+                 for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')},
+            )
         
-        ax.annotate(
-            f"{height:.1f} cm\nZ: {format_zscore(z_haz)}",
-            (age, height),
-            xytext=(10, 10),
-            textcoords='offset points',
-            fontsize=10,
-            fontweight='bold',
-            bbox=dict(
-                boxstyle='round,pad=0.6',
-                facecolor=point_color,
-                edgecolor='white',
-                linewidth=2,
-                alpha=0.9
-            ),
-            color='white',
-            zorder=11
-        )
-    
-    measurement_type = "Panjang Badan" if age < 24 else "Tinggi Badan"
-    ax.set_xlabel("Usia (bulan)", fontsize=12, fontweight='bold')
-    ax.set_ylabel(f"{measurement_type} (cm)", fontsize=12, fontweight='bold')
-    ax.set_title(
-        f"Grafik {measurement_type} menurut Umur (TB/U) - WHO Standards\n"
-        f"{'Laki-laki' if sex == 'M' else 'Perempuan'} | Usia: {age:.1f} bulan",
-        fontsize=14,
-        fontweight='bold',
-        pad=15
-    )
-    
-    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7)
-    ax.legend(loc='upper left', framealpha=0.95, fancybox=True, shadow=True, fontsize=9)
-    ax.set_xlim(-1, 62)
-    ax.set_ylim(40, None)
-    
-    plt.tight_layout()
-    
-    return fig
+        return fig, fig.axes[0]
+    
+    def release(self, fig: Figure):
+        """Reset a pooled figure and keep it for reuse; close any other figure"""
+        state = getattr(fig, '_pool_state', None)
+        if state is None:
+            # Figures built with new_figure() are not in pyplot's registry;
+            # dropping the reference frees them
+            if fig.canvas.manager is not None:
+                plt.close(fig)
+            return
+        
+        key, n_collections, n_texts, data_lim, dpi, subplotpars = state
+        ax = fig.axes[0]
+        fig._dynamic_artists = None
+        
+        for artist in ax.collections[n_collections:] + ax.texts[n_texts:]:
+            artist.remove()
+        if ax.legend_ is not None:
+            ax.legend_.remove()
+        
+        ax.dataLim.set_points(data_lim.copy())
+        ax.set_autoscale_on(True)
+        fig.set_dpi(dpi)
+        fig.subplots_adjust(**subplotpars)
+        
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.size:
+                idle.append(fig)
+                return
+        plt.close(fig)
+    
+    @staticmethod
+    def mark_dynamic(fig: Figure):
+        """Record the per-request artists of a pooled figure (everything else is static)"""
+        _, n_collections, n_texts, _, _, _ = fig._pool_state
+        ax = fig.axes[0]
+        fig._dynamic_artists = [ax.title, ax.legend_, *ax.collections[n_collections:], *ax.texts[n_texts:]]
 
 
-def plot_head_circumference_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
-    """Plot Head Circumference-for-Age growth chart"""
-    from .utilities import format_zscore
-    
-    theme = apply_matplotlib_theme(theme_name)
-    
-    sex = payload['sex']
-    age = payload['age_mo']
-    head_circ = payload.get('hc')
-    
-    if head_circ is None:
-        fig, ax = plt.subplots(figsize=(12, 7.5))
-        ax.text(
-            0.5, 0.5,
-            "Data lingkar kepala tidak tersedia",
-            ha='center', va='center',
-            transform=ax.transAxes,
-            fontsize=14,
-            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-        )
-        ax.set_title("Grafik Lingkar Kepala menurut Umur (LK/U)")
-        return fig
-    
-    sd_lines = {
-        -3: ('#DC143C', '-', 2.0),
-        -2: ('#FF6347', '-', 2.5),
-        -1: (theme['primary'], '--', 1.5),
-        0: (theme['secondary'], '-', 2.5),
-        1: (theme['primary'], '--', 1.5),
-        2: ('#FF6347', '-', 2.5),
-        3: ('#DC143C', '-', 2.0)
-    }
-    
-    curves = {z: generate_hcfa_curve(sex, z) for z in sd_lines.keys()}
-    
-    fig, ax = plt.subplots(figsize=(12, 7.5))
-    
-    x = curves[0][0]
-    
-    _fill_zone_between_curves(ax, x, curves[-3][1], curves[-2][1], '#FFE6E6', 0.4, 'Mikrosefali')
-    _fill_zone_between_curves(ax, x, curves[-2][1], curves[2][1],  '#E8F5E9', 0.45, 'Normal')
-    _fill_zone_between_curves(ax, x, curves[2][1],  curves[3][1],  '#FFE6E6', 0.4, 'Makrosefali')
-    
-    for z, (color, linestyle, linewidth) in sd_lines.items():
-        label = "Median (WHO)" if z == 0 else f"{z:+d} SD"
-        ax.plot(
-            curves[z][0], curves[z][1],
-            color=color,
-            linestyle=linestyle,
-            linewidth=linewidth,
-            label=label,
-            zorder=5,
-            alpha=0.9
-        )
-    
-    z_hcz = payload['z'].get('hcz')
+FIGURE_POOL = FigurePool()
+
+
+# ==============================================================================
+# PLOTTING FUNCTIONS
+# ==============================================================================
+
+# |z| bin edges: index i means |z| > _Z_BINS[i - 1] (strict, like the old ladders)
+_Z_BINS = np.array([1, 2, 3])
+_HC_Z_BINS = _Z_BINS[:2]  # head circumference: anything beyond 2 SD is abnormal
+# Per-bin point styles; theme colours fill the 'primary'/'secondary' slots
+_Z_COLORS = ('secondary', 'primary', '#DC143C', '#8B0000')
+_Z_SIZES = (400, 400, 450, 500)
+_HC_Z_COLORS = ('secondary', 'primary', '#DC143C')
+_HC_Z_SIZES = (400, 450, 500)
+_Z_BAR_COLORS = ('#28a745', '#FFA500', '#DC143C', '#8B0000')
+
+
+def _zscore_style(z: Optional[float], theme: Dict[str, str], head_circ: bool = False) -> Tuple[str, int]:
+    """
+    Marker colour and size for a child's data point
     
-    if z_hcz is not None:
-        if abs(z_hcz) > 2:
-            point_color = '#DC143C'
-            point_size = 500
-        elif abs(z_hcz) > 1:
-            point_color = theme['primary']
-            point_size = 450
-        else:
-            point_color = theme['secondary']
-            point_size = 400
+    Args:
+        z: Z-score of the point (None/NaN gets the normal style)
+        theme: Theme colours
+        head_circ: Use the head circumference bins
+        
+    Returns:
+        Tuple of (color, marker size)
+    """
+    if head_circ:
+        bins, colors, sizes = _HC_Z_BINS, _HC_Z_COLORS, _HC_Z_SIZES
     else:
-        point_color = theme['secondary']
-        point_size = 400
+        bins, colors, sizes = _Z_BINS, _Z_COLORS, _Z_SIZES
+    
+    idx = 0 if z is None or math.isnan(z) else int(np.searchsorted(bins, abs(z)))
+    color = colors[idx]
+    return theme.get(color, color), sizes[idx]
+
+def _sex_label(sex: str) -> str:
+    return 'Laki-laki' if sex == 'M' else 'Perempuan'
+
+
+def _draw_child_point(ax, x: float, y: float, legend_label: str, note: str,
+                      z: Optional[float], theme: Dict[str, str], head_circ: bool = False):
+    """Child's marker plus its value/z-score callout"""
+    point_color, point_size = _zscore_style(z, theme, head_circ)
     
     ax.scatter(
-        [age], [head_circ],
+        [x], [y],
         s=point_size,
         c=point_color,
         edgecolors='white',
         linewidths=3,
-        label=f"Data Anak ({head_circ:.1f} cm)",
+        label=legend_label,
         zorder=10,
         marker='o',
         alpha=1.0
     )
     
     ax.annotate(
-        f"{head_circ:.1f} cm\nZ: {format_zscore(z_hcz)}",
-        (age, head_circ),
+        f"{note}\nZ: {format_zscore(z)}",
+        (x, y),
         xytext=(10, 10),
         textcoords='offset points',
         fontsize=10,
@@ -613,166 +892,140 @@ def plot_head_circumference_for_age(payload: Dict, theme_name: str = "pink_paste
         color='white',
         zorder=11
     )
-    
-    ax.set_xlabel("Usia (bulan)", fontsize=12, fontweight='bold')
-    ax.set_ylabel("Lingkar Kepala (cm)", fontsize=12, fontweight='bold')
-    ax.set_title(
-        f"Grafik Lingkar Kepala menurut Umur (LK/U) - WHO Standards\n"
-        f"{'Laki-laki' if sex == 'M' else 'Perempuan'} | Usia: {age:.1f} bulan",
+
+
+def _finish_growth_ax(ax, title: str, xlabel: str, ylabel: str, xlim: Tuple[float, float], ybottom: float,
+                      theme: Dict[str, str]):
+    """Labels, grid, legend and limits shared by the growth charts"""
+    ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
+    
+    ax.grid(True, color=theme['border'], alpha=0.3, linestyle='--', linewidth=0.7)
+    ax.legend(loc='upper left', framealpha=0.95, fancybox=True, shadow=True, fontsize=9,
+              **legend_kwargs(theme))
+    ax.set_xlim(*xlim)
+    ax.set_ylim(ybottom, None)
+
+
+def _draw_missing_data(ax, message: str, theme: Dict[str, str], title: Optional[str] = None):
+    """Placeholder text for a chart without the measurements it needs"""
+    ax.text(
+        0.5, 0.5,
+        message,
+        ha='center', va='center',
+        transform=ax.transAxes,
         fontsize=14,
-        fontweight='bold',
-        pad=15
+        color=theme['text'],
+        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
     )
-    
-    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7)
-    ax.legend(loc='upper left', framealpha=0.95, fancybox=True, shadow=True, fontsize=9)
-    ax.set_xlim(-1, 62)
-    ax.set_ylim(28, None)
-    
-    plt.tight_layout()
-    
-    return fig
+    if title:
+        ax.set_title(title)
 
 
-def plot_weight_for_length(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
-    """Plot Weight-for-Length growth chart"""
-    from .utilities import format_zscore
-    
-    theme = apply_matplotlib_theme(theme_name)
-    
+# indicator -> payload keys the chart needs before its reference is drawn
+_CHART_REQUIRED_KEYS = {
+    'wfa': (),
+    'hfa': (),
+    'hcfa': ('hc',),
+    'wfl': ('w', 'h'),
+}
+
+
+def _has_chart_data(indicator: str, payload: Dict) -> bool:
+    return all(payload.get(key) is not None for key in _CHART_REQUIRED_KEYS[indicator])
+
+
+def _plot_wfa_on_ax(ax, payload: Dict, theme: Dict[str, str]):
+    """Weight-for-Age data point and labels (reference drawn by the caller)"""
     sex = payload['sex']
     age = payload['age_mo']
     weight = payload.get('w')
-    height = payload.get('h')
     
-    if weight is None or height is None:
-        fig, ax = plt.subplots(figsize=(12, 7.5))
-        ax.text(
-            0.5, 0.5,
-            "Data berat dan tinggi badan diperlukan untuk grafik BB/TB",
-            ha='center', va='center',
-            transform=ax.transAxes,
-            fontsize=14,
-            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5)
-        )
-        ax.set_title("Grafik Berat Badan menurut Tinggi Badan (BB/TB)")
-        return fig
-    
-    sd_lines = {
-        -3: ('#DC143C', '-', 2.0),
-        -2: ('#FF6347', '-', 2.5),
-        -1: (theme['primary'], '--', 1.5),
-        0: (theme['secondary'], '-', 2.5),
-        1: (theme['primary'], '--', 1.5),
-        2: ('#FF6347', '-', 2.5),
-        3: ('#DC143C', '-', 2.0)
-    }
-    
-    curves = {z: generate_wfl_curve(sex, age, z) for z in sd_lines.keys()}
+    if weight is not None:
+        _draw_child_point(ax, age, weight, f"Data Anak ({weight:.1f} kg)", f"{weight:.1f} kg",
+                          payload['z'].get('waz'), theme)
     
-    fig, ax = plt.subplots(figsize=(12, 7.5))
+    _finish_growth_ax(
+        ax,
+        f"Grafik Berat Badan menurut Umur (BB/U) - WHO Standards\n"
+        f"{_sex_label(sex)} | Usia: {age:.1f} bulan",
+        "Usia (bulan)", "Berat Badan (kg)", (-1, 62), 0, theme
+    )
+
+
+def _plot_hfa_on_ax(ax, payload: Dict, theme: Dict[str, str]):
+    """Height-for-Age data point and labels (reference drawn by the caller)"""
+    sex = payload['sex']
+    age = payload['age_mo']
+    height = payload.get('h')
     
-    lengths = curves[0][0]
+    if height is not None:
+        _draw_child_point(ax, age, height, f"Data Anak ({height:.1f} cm)", f"{height:.1f} cm",
+                          payload['z'].get('haz'), theme)
     
-    _fill_zone_between_curves(ax, lengths, curves[-3][1], curves[-2][1], '#FFE6E6', 0.4, 'Gizi Buruk')
-    _fill_zone_between_curves(ax, lengths, curves[-2][1], curves[-1][1], '#FFEBCC', 0.35, 'Gizi Kurang')
-    _fill_zone_between_curves(ax, lengths, curves[-1][1], curves[1][1],  '#E8F5E9', 0.45, 'Normal')
-    _fill_zone_between_curves(ax, lengths, curves[1][1],  curves[2][1],  '#FFF3CD', 0.35, 'Risiko Lebih')
-    _fill_zone_between_curves(ax, lengths, curves[2][1],  curves[3][1],  '#F8D7DA', 0.4, 'Gizi Lebih')
+    measurement_type = "Panjang Badan" if age < 24 else "Tinggi Badan"
+    _finish_growth_ax(
+        ax,
+        f"Grafik {measurement_type} menurut Umur (TB/U) - WHO Standards\n"
+        f"{_sex_label(sex)} | Usia: {age:.1f} bulan",
+        "Usia (bulan)", f"{measurement_type} (cm)", (-1, 62), 40, theme
+    )
+
+
+def _plot_hcfa_on_ax(ax, payload: Dict, theme: Dict[str, str]):
+    """Head Circumference-for-Age data point and labels (reference drawn by the caller)"""
+    if not _has_chart_data('hcfa', payload):
+        _draw_missing_data(ax, "Data lingkar kepala tidak tersedia", theme,
+                           "Grafik Lingkar Kepala menurut Umur (LK/U)")
+        return
     
-    for z, (color, linestyle, linewidth) in sd_lines.items():
-        label = "Median (WHO)" if z == 0 else f"{z:+d} SD"
-        ax.plot(
-            curves[z][0], curves[z][1],
-            color=color,
-            linestyle=linestyle,
-            linewidth=linewidth,
-            label=label,
-            zorder=5,
-            alpha=0.9
-        )
+    sex = payload['sex']
+    age = payload['age_mo']
+    head_circ = payload['hc']
     
-    z_whz = payload['z'].get('whz')
-    
-    if z_whz is not None:
-        if abs(z_whz) > 3:
-            point_color = '#8B0000'
-            point_size = 500
-        elif abs(z_whz) > 2:
-            point_color = '#DC143C'
-            point_size = 450
-        elif abs(z_whz) > 1:
-            point_color = theme['primary']
-            point_size = 400
-        else:
-            point_color = theme['secondary']
-            point_size = 400
-    else:
-        point_color = theme['secondary']
-        point_size = 400
+    _draw_child_point(ax, age, head_circ, f"Data Anak ({head_circ:.1f} cm)", f"{head_circ:.1f} cm",
+                      payload['z'].get('hcz'), theme, head_circ=True)
     
-    ax.scatter(
-        [height], [weight],
-        s=point_size,
-        c=point_color,
-        edgecolors='white',
-        linewidths=3,
-        label=f"Data Anak ({weight:.1f} kg)",
-        zorder=10,
-        marker='o',
-        alpha=1.0
+    _finish_growth_ax(
+        ax,
+        f"Grafik Lingkar Kepala menurut Umur (LK/U) - WHO Standards\n"
+        f"{_sex_label(sex)} | Usia: {age:.1f} bulan",
+        "Usia (bulan)", "Lingkar Kepala (cm)", (-1, 62), 28, theme
     )
+
+
+def _plot_wfl_on_ax(ax, payload: Dict, theme: Dict[str, str]):
+    """Weight-for-Length data point and labels (reference drawn by the caller)"""
+    if not _has_chart_data('wfl', payload):
+        _draw_missing_data(ax, "Data berat dan tinggi badan diperlukan untuk grafik BB/TB", theme,
+                           "Grafik Berat Badan menurut Tinggi Badan (BB/TB)")
+        return
     
-    ax.annotate(
-        f"{weight:.1f} kg / {height:.1f} cm\nZ: {format_zscore(z_whz)}",
-        (height, weight),
-        xytext=(10, 10),
-        textcoords='offset points',
-        fontsize=10,
-        fontweight='bold',
-        bbox=dict(
-            boxstyle='round,pad=0.6',
-            facecolor=point_color,
-            edgecolor='white',
-            linewidth=2,
-            alpha=0.9
-        ),
-        color='white',
-        zorder=11
-    )
+    sex = payload['sex']
+    age = payload['age_mo']
+    weight = payload['w']
+    height = payload['h']
+    
+    _draw_child_point(ax, height, weight, f"Data Anak ({weight:.1f} kg)",
+                      f"{weight:.1f} kg / {height:.1f} cm", payload['z'].get('whz'), theme)
     
     measurement_type = "Panjang Badan" if age < 24 else "Tinggi Badan"
-    ax.set_xlabel(f"{measurement_type} (cm)", fontsize=12, fontweight='bold')
-    ax.set_ylabel("Berat Badan (kg)", fontsize=12, fontweight='bold')
-    ax.set_title(
+    _finish_growth_ax(
+        ax,
         f"Grafik Berat Badan menurut {measurement_type} (BB/TB) - WHO Standards\n"
-        f"{'Laki-laki' if sex == 'M' else 'Perempuan'} | Usia: {age:.1f} bulan",
-        fontsize=14,
-        fontweight='bold',
-        pad=15
+        f"{_sex_label(sex)} | Usia: {age:.1f} bulan",
+        f"{measurement_type} (cm)", "Berat Badan (kg)",
+        (BOUNDS['wfl_l'][0] - 2, BOUNDS['wfl_l'][1] + 2), 0, theme
     )
-    
-    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.7)
-    ax.legend(loc='upper left', framealpha=0.95, fancybox=True, shadow=True, fontsize=9)
-    ax.set_xlim(BOUNDS['wfl_l'][0] - 2, BOUNDS['wfl_l'][1] + 2)
-    ax.set_ylim(0, None)
-    
-    plt.tight_layout()
-    
-    return fig
 
 
-def plot_zscore_summary_bars(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
-    """Plot bar chart summarizing all z-scores"""
-    from .utilities import format_zscore
-    
-    theme = apply_matplotlib_theme(theme_name)
-    
+def _summary_bars_data(payload: Dict) -> Tuple[List[str], List[float], List[str]]:
+    """Index labels, z-scores and formatted z-scores of the available indices"""
     z_scores = payload.get('z', {})
     
     indices = []
     values = []
-    colors = []
     labels_text = []
     
     for key, label in [('waz', 'BB/U'), ('haz', 'TB/U'), ('whz', 'BB/TB'), 
@@ -782,29 +1035,26 @@ def plot_zscore_summary_bars(payload: Dict, theme_name: str = "pink_pastel") ->
             indices.append(label)
             values.append(z)
             labels_text.append(format_zscore(z))
-            
-            if abs(z) > 3:
-                colors.append('#8B0000')
-            elif abs(z) > 2:
-                colors.append('#DC143C')
-            elif abs(z) > 1:
-                colors.append('#FFA500')
-            else:
-                colors.append('#28a745')
+    
+    return indices, values, labels_text
+
+
+def _plot_summary_on_ax(ax, payload: Dict, theme: Dict[str, str]):
+    """Z-score summary bars with SD reference lines"""
+    indices, values, labels_text = _summary_bars_data(payload)
     
     if not indices:
-        fig, ax = plt.subplots(figsize=(12, 6))
         ax.text(
             0.5, 0.5,
             "Tidak ada data z-score tersedia",
             ha='center', va='center',
             transform=ax.transAxes,
-            fontsize=14
+            fontsize=14,
+            color=theme['text']
         )
-        return fig
-    
-    fig, ax = plt.subplots(figsize=(12, 7))
+        return
     
+    colors = [_Z_BAR_COLORS[i] for i in np.searchsorted(_Z_BINS, np.abs(values))]
     bars = ax.bar(indices, values, color=colors, edgecolor='white', linewidth=2, alpha=0.85)
     
     for bar, val, txt in zip(bars, values, labels_text):
@@ -836,49 +1086,402 @@ def plot_zscore_summary_bars(payload: Dict, theme_name: str = "pink_pastel") ->
     ax.set_title(
         "Ringkasan Z-Score Semua Indeks WHO\n"
         f"Anak: {payload.get('name_child', 'N/A')} | "
-        f"{'Laki-laki' if payload['sex'] == 'M' else 'Perempuan'} | "
+        f"{_sex_label(payload['sex'])} | "
         f"Usia: {payload['age_mo']:.1f} bulan",
         fontsize=14,
         fontweight='bold',
         pad=15
     )
     
-    ax.grid(True, alpha=0.3, axis='y', linestyle='--', linewidth=0.7)
-    ax.legend(loc='upper right', framealpha=0.95, fancybox=True, shadow=True, fontsize=9)
+    ax.grid(True, color=theme['border'], alpha=0.3, axis='y', linestyle='--', linewidth=0.7)
+    ax.legend(loc='upper right', framealpha=0.95, fancybox=True, shadow=True, fontsize=9,
+              **legend_kwargs(theme))
     ax.set_ylim(-4, 4)
+
+
+# indicator -> per-axes drawing function
+_CHART_DRAWERS = {
+    'wfa': _plot_wfa_on_ax,
+    'hfa': _plot_hfa_on_ax,
+    'hcfa': _plot_hcfa_on_ax,
+    'wfl': _plot_wfl_on_ax,
+}
+
+
+def _plot_growth_chart(indicator: str, payload: Dict, theme_name: str) -> Figure:
+    """Single growth chart on a pooled skeleton (placeholder figure without data)"""
+    theme = get_theme(theme_name)
+    
+    if not _has_chart_data(indicator, payload):
+        fig, ax = new_figure(figsize=(12, 7.5), theme=theme)
+        _CHART_DRAWERS[indicator](ax, payload, theme)
+        return fig
+    
+    fig, ax = FIGURE_POOL.acquire(indicator, payload['sex'], theme_name)
+    _CHART_DRAWERS[indicator](ax, payload, theme)
+    fig.tight_layout()
+    FIGURE_POOL.mark_dynamic(fig)
+    
+    return fig
+
+
+def plot_weight_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
+    """Plot Weight-for-Age growth chart with child's data point"""
+    return _plot_growth_chart('wfa', payload, theme_name)
+
+
+def plot_height_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
+    """Plot Height-for-Age growth chart with child's data point"""
+    return _plot_growth_chart('hfa', payload, theme_name)
+
+
+def plot_head_circumference_for_age(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
+    """Plot Head Circumference-for-Age growth chart"""
+    return _plot_growth_chart('hcfa', payload, theme_name)
+
+
+def plot_weight_for_length(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
+    """Plot Weight-for-Length growth chart"""
+    return _plot_growth_chart('wfl', payload, theme_name)
+
+
+def plot_zscore_summary_bars(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
+    """Plot bar chart summarizing all z-scores"""
+    theme = get_theme(theme_name)
+    
+    if not _summary_bars_data(payload)[0]:
+        fig, ax = new_figure(figsize=(12, 6), theme=theme)
+        _plot_summary_on_ax(ax, payload, theme)
+        return fig
+    
+    fig, ax = new_figure(figsize=(12, 7), theme=theme)
+    _plot_summary_on_ax(ax, payload, theme)
+    fig.tight_layout()
+    
+    return fig
+
+
+def plot_full_report(payload: Dict, theme_name: str = "pink_pastel") -> Figure:
+    """
+    Plot all five charts of a child on one 3x2 figure
+    
+    For reports this replaces five figures, theme switches, layouts and
+    savefig calls with one. The age-based charts share their x axis; the
+    summary bars span the bottom row.
+    
+    Args:
+        payload: Same payload as the single plot_* functions
+        theme_name: UI theme key
+        
+    Returns:
+        Figure with the WFA, HFA, HCFA, WFL charts and the z-score summary
+    """
+    theme = get_theme(theme_name)
+    sex = payload['sex']
+    
+    fig = Figure(figsize=(24, 22), facecolor=theme["bg"])
+    FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(3, 2)
+    ax_wfa = fig.add_subplot(grid[0, 0])
+    axes = {
+        'wfa': ax_wfa,
+        'hfa': fig.add_subplot(grid[0, 1], sharex=ax_wfa),
+        'hcfa': fig.add_subplot(grid[1, 0], sharex=ax_wfa),
+        'wfl': fig.add_subplot(grid[1, 1]),
+    }
+    
+    for indicator, ax in axes.items():
+        style_axes(ax, theme)
+        if _has_chart_data(indicator, payload):
+            _draw_chart_reference(ax, indicator, sex, theme)
+        _CHART_DRAWERS[indicator](ax, payload, theme)
     
-    plt.tight_layout()
+    ax_summary = fig.add_subplot(grid[2, :])
+    style_axes(ax_summary, theme)
+    _plot_summary_on_ax(ax_summary, payload, theme)
+    fig.tight_layout()
     
     return fig
 
 
+# ==============================================================================
+# SVG CHARTS (CACHED BACKDROP + RUNTIME DATA POINT)
+# ==============================================================================
+
+# indicator -> (title line 1 format, x label, y label, z key, unit, xlim, ylim bottom)
+SVG_CHART_SPECS = {
+    'wfa': ("Grafik Berat Badan menurut Umur (BB/U) - WHO Standards",
+            "Usia (bulan)", "Berat Badan (kg)", 'waz', 'kg', (-1, 62), 0),
+    'hfa': ("Grafik {mtype} menurut Umur (TB/U) - WHO Standards",
+            "Usia (bulan)", "{mtype} (cm)", 'haz', 'cm', (-1, 62), 40),
+    'hcfa': ("Grafik Lingkar Kepala menurut Umur (LK/U) - WHO Standards",
+             "Usia (bulan)", "Lingkar Kepala (cm)", 'hcz', 'cm', (-1, 62), 28),
+    'wfl': ("Grafik Berat Badan menurut {mtype} (BB/TB) - WHO Standards",
+            "{mtype} (cm)", "Berat Badan (kg)", 'whz', 'kg',
+            (BOUNDS['wfl_l'][0] - 2, BOUNDS['wfl_l'][1] + 2), 0),
+}
+
+# (indicator, sex, theme, measurement type) -> (svg body, data->svg affine, title anchor)
+_SVG_BACKDROPS: Dict[Tuple[str, str, str, str], Tuple[str, Tuple[float, ...], Tuple[float, float]]] = {}
+_svg_lock = threading.Lock()
+
+_SVG_TEXT_STYLE = "font-family: 'DejaVu Sans', Arial, sans-serif; font-weight: 700"
+
+
+def _build_svg_backdrop(indicator: str, sex: str, theme_name: str, mtype: str):
+    """Render the reference chart once to SVG and record its data->SVG mapping"""
+    title_fmt, xlabel, ylabel, _, _, xlim, ybottom = SVG_CHART_SPECS[indicator]
+    theme = get_theme(theme_name)
+    
+    fig, ax = get_chart_skeleton(indicator, sex, theme_name)
+    fig.set_dpi(72)  # SVG user units are points
+    
+    # Two-line placeholder title reserves the space; the real title is
+    # written per request, so hide it before saving
+    ax.set_title("M\nM", fontsize=14, fontweight='bold', pad=15)
+    ax.set_xlabel(xlabel.format(mtype=mtype), fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel.format(mtype=mtype), fontsize=12, fontweight='bold')
+    ax.grid(True, color=theme['border'], alpha=0.3, linestyle='--', linewidth=0.7)
+    ax.legend(loc='upper left', framealpha=0.95, fancybox=True, shadow=True, fontsize=9,
+              **legend_kwargs(theme))
+    ax.set_xlim(*xlim)
+    ax.set_ylim(ybottom, None)
+    fig.tight_layout()
+    
+    renderer = fig.canvas.get_renderer()
+    fig_height = fig.get_figheight() * 72
+    title_box = ax.title.get_window_extent(renderer)
+    title_anchor = ((title_box.x0 + title_box.x1) / 2, fig_height - title_box.y1)
+    ax.title.set_visible(False)
+    
+    # Linear data -> SVG coordinates (SVG y axis points down)
+    (x0, y0), (x1, y1) = ax.transData.transform([(0.0, 0.0), (1.0, 1.0)])
+    x_min, x_max = ax.get_xlim()
+    y_min, y_max = ax.get_ylim()
+    affine = (x1 - x0, x0, y0 - y1, fig_height - y0, x_min, x_max, y_min, y_max)
+    
+    buf = io.StringIO()
+    with plt.rc_context({'svg.fonttype': 'none', 'svg.hashsalt': 'anthrohpk'}):
+        fig.savefig(buf, format='svg', dpi=72, facecolor=theme['bg'])
+    cleanup_matplotlib_figures(fig)
+    
+    svg = buf.getvalue()
+    return svg[:svg.rindex("</svg>")], affine, title_anchor
+
+
+def render_growth_chart_svg(indicator: str, payload: Dict, theme_name: str = "pink_pastel") -> str:
+    """
+    Render a growth chart as SVG from a cached reference backdrop
+    
+    Only the title, the child's marker and its label are generated per call.
+    
+    Args:
+        indicator: 'wfa', 'hfa', 'hcfa' or 'wfl'
+        payload: Same payload as the plot_* functions
+        theme_name: UI theme key
+        
+    Returns:
+        Complete SVG document string
+    """
+    sex = payload['sex']
+    age = payload['age_mo']
+    mtype = "Panjang Badan" if age < 24 else "Tinggi Badan"
+    title_fmt, _, _, z_key, unit, _, _ = SVG_CHART_SPECS[indicator]
+    theme = get_theme(theme_name)
+    
+    key = (indicator, sex, theme_name, mtype)
+    with _svg_lock:
+        if key not in _SVG_BACKDROPS:
+            _SVG_BACKDROPS[key] = _build_svg_backdrop(indicator, sex, theme_name, mtype)
+    body, (sx, bx, sy, by, x_min, x_max, y_min, y_max), (title_x, title_y) = _SVG_BACKDROPS[key]
+    
+    parts = [body]
+    sex_text = 'Laki-laki' if sex == 'M' else 'Perempuan'
+    for i, line in enumerate((title_fmt.format(mtype=mtype), f"{sex_text} | Usia: {age:.1f} bulan")):
+        parts.append(
+            f'<text x="{title_x:.2f}" y="{title_y + 14 + i * 16:.2f}" text-anchor="middle" '
+            f'style="{_SVG_TEXT_STYLE}; font-size: 14px; fill: {theme["text"]}">{_svg_escape(line)}</text>'
+        )
+    
+    if indicator == 'wfl':
+        x_value, y_value = payload.get('h'), payload.get('w')
+    else:
+        y_value = payload.get({'wfa': 'w', 'hfa': 'h', 'hcfa': 'hc'}[indicator])
+        x_value = age
+    
+    if x_value is not None and y_value is not None:
+        z = payload.get('z', {}).get(z_key)
+        color = _zscore_style(z, theme, head_circ=(indicator == 'hcfa'))[0]
+        
+        # Keep out-of-range points on the chart edge instead of off canvas
+        cx = sx * min(max(x_value, x_min), x_max) + bx
+        cy = sy * min(max(y_value, y_min), y_max) + by
+        
+        if indicator == 'wfl':
+            label = f"{y_value:.1f} kg / {x_value:.1f} cm"
+        else:
+            label = f"{y_value:.1f} {unit}"
+        
+        parts.append(
+            f'<circle cx="{cx:.2f}" cy="{cy:.2f}" r="10" fill="{color}" '
+            f'stroke="white" stroke-width="3"/>'
+            f'<g transform="translate({cx + 10:.2f} {cy - 48:.2f})">'
+            f'<rect width="{max(len(label), 8) * 6.5 + 16:.0f}" height="38" rx="6" '
+            f'fill="{color}" fill-opacity="0.9" stroke="white" stroke-width="2"/>'
+            f'<text x="8" y="16" style="{_SVG_TEXT_STYLE}; font-size: 10px; fill: white">'
+            f'{_svg_escape(label)}</text>'
+            f'<text x="8" y="30" style="{_SVG_TEXT_STYLE}; font-size: 10px; fill: white">'
+            f'Z: {_svg_escape(format_zscore(z))}</text>'
+            f'</g>'
+        )
+    
+    parts.append("</svg>\n")
+    return "".join(parts)
+
+
+def _svg_escape(text: str) -> str:
+    """Escape text for embedding in SVG markup"""
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
 # ==============================================================================
 # CLEANUP UTILITY
 # ==============================================================================
 
 def cleanup_matplotlib_figures(figures: Union[Figure, List[Figure]]):
-    """Properly cleanup matplotlib figures to prevent memory leaks"""
+    """Release figures: pooled chart skeletons go back to FIGURE_POOL, others are closed"""
     if figures is None:
         return
     
     if isinstance(figures, Figure):
         figures = [figures]
     
+    figures = [fig for fig in figures if fig is not None]
+    
+    # Many pyplot figures that are all of pyplot's open figures: one sweep
+    # of the registry instead of a lookup per figure
+    managed = {fig.number for fig in figures
+               if fig.canvas.manager is not None and not hasattr(fig, '_pool_state')}
+    if len(managed) >= 4 and managed == set(plt.get_fignums()):
+        plt.close('all')
+        figures = [fig for fig in figures if hasattr(fig, '_pool_state')]
+    
     for fig in figures:
-        if fig is not None:
-            plt.close(fig)
+        FIGURE_POOL.release(fig)
 
 
-def save_figure_to_file(fig: Figure, filename: str = None) -> str:
-    """Save figure to file and return path"""
+# OUTPUTS_DIR is created by config at import; keep a Path for cheap joins
+_OUTPUTS_PATH = Path(OUTPUTS_DIR)
+
+
+def save_figure_to_file(fig: Figure, filename: str = None, dpi: int = 100) -> str:
+    """
+    Save figure to a PNG file and return path
+    
+    The plots already ran tight_layout(), so the Agg buffer is encoded as
+    is (through figure_to_pil, reusing cached chart backgrounds) instead of
+    re-rendering for a bbox_inches='tight' crop.
+    
+    Args:
+        fig: Figure to save
+        filename: File name inside OUTPUTS_DIR (timestamped if omitted)
+        dpi: 100 for screen; pass 150 for print
+        
+    Returns:
+        Path of the written file
+    """
     if filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"chart_{timestamp}.png"
+        # Millisecond epoch stamp: no strftime, and no clashes within a second
+        filename = f"chart_{time.time_ns() // 1_000_000:013d}.png"
     
-    filepath = os.path.join(OUTPUTS_DIR, filename)
-    fig.savefig(filepath, format='png', bbox_inches='tight', dpi=150)
+    filepath = str(_OUTPUTS_PATH / filename)
+    # Charts are flat colour, so zlib level 1 costs little size for a much faster encode
+    figure_to_pil(fig, dpi=dpi).save(filepath, 'PNG', optimize=False, compress_level=1)
     
     return filepath
 
 
+# ==============================================================================
+# RASTER OUTPUT (CACHED STATIC BACKGROUNDS)
+# ==============================================================================
+
+# Rendered zones, SD curves, axes and labels of pooled charts, keyed by
+# skeleton + layout; each entry is a full-figure pixel region (~8 MB at 150 dpi)
+BACKGROUND_CACHE_SIZE = 8
+_BACKGROUNDS: "OrderedDict[tuple, object]" = OrderedDict()
+_background_lock = threading.Lock()
+
+
+def _background_key(fig: Figure) -> tuple:
+    """Everything the static part of a pooled chart's pixels depends on"""
+    ax = fig.axes[0]
+    return (
+        fig._pool_state[0],
+        fig.dpi,
+        tuple(fig.get_size_inches()),
+        ax.get_position().bounds,
+        ax.get_xlim(),
+        ax.get_ylim(),
+        ax.xaxis.label.get_text(),
+        ax.yaxis.label.get_text(),
+    )
+
+
+def _draw_with_cached_background(fig: Figure, canvas: FigureCanvasAgg, dynamic: List):
+    """
+    Draw a pooled chart, reusing the rendered static background
+    
+    The first render of a layout draws everything except the dynamic
+    artists (title, legend, child's point and callout), keeps those
+    pixels, then draws the dynamic artists on top. Later renders with the
+    same layout restore the pixels and only draw the dynamic artists.
+    """
+    key = _background_key(fig)
+    with _background_lock:
+        background = _BACKGROUNDS.get(key)
+        if background is not None:
+            _BACKGROUNDS.move_to_end(key)
+    
+    if background is None:
+        for artist in dynamic:
+            artist.set_animated(True)
+        try:
+            canvas.draw()
+        finally:
+            for artist in dynamic:
+                artist.set_animated(False)
+        renderer = canvas.get_renderer()
+        background = canvas.copy_from_bbox(fig.bbox)
+        with _background_lock:
+            _BACKGROUNDS[key] = background
+            while len(_BACKGROUNDS) > BACKGROUND_CACHE_SIZE:
+                _BACKGROUNDS.popitem(last=False)
+    else:
+        renderer = canvas.get_renderer()
+        canvas.restore_region(background)
+    
+    # Same order a full draw uses: legend (zorder 5) under the point and callout
+    for artist in sorted(dynamic[1:], key=lambda a: a.get_zorder()):
+        artist.draw(renderer)
+    dynamic[0].draw(renderer)
+
+
+def figure_to_pil(fig: Figure, dpi: int = 150) -> Image.Image:
+    """Render figure on its Agg canvas and return it as a PIL image"""
+    # Plots are already laid out with tight_layout(), so render straight on
+    # the Agg canvas: savefig() would draw the figure twice (layout-engine /
+    # bbox_inches='tight' pre-pass). The pixels are copied out directly; any
+    # PNG encoding happens downstream.
+    fig.set_dpi(dpi)
+    canvas = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    
+    dynamic = getattr(fig, '_dynamic_artists', None)
+    if dynamic and all(artist is not None for artist in dynamic):
+        _draw_with_cached_background(fig, canvas, dynamic)
+    else:
+        canvas.draw()
+    
+    return Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).copy()
+
+
 print("✅ Growth Charts module loaded")
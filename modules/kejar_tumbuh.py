@@ -8,72 +8,77 @@
 """
 
 import os
+import re
+import atexit
+import multiprocessing
+import string
 import math
-from typing import Dict, List, Optional, Tuple
-from datetime import date, datetime
-import traceback
-
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple, Union
+from html import escape as _svg_escape
+from functools import lru_cache
+import threading
+from operator import itemgetter
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+from PIL import Image
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import UI_THEMES, OUTPUTS_DIR
+from config import UI_THEMES
+from modules.utilities import log_exception
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 # ==============================================================================
 # REFERENCE DATA - GROWTH VELOCITY STANDARDS
 # ==============================================================================
 
-# WHO Growth Velocity Standards (median, approximate values)
-# Format: {age_range: {"weight": (min_normal, max_normal), "height": (min_normal, max_normal)}}
-GROWTH_VELOCITY_REFERENCE = {
-    "0_3": {
-        "weight_male": (0.8, 1.3),      # kg/bulan
-        "weight_female": (0.7, 1.2),
-        "height_male": (3.0, 4.0),      # cm/bulan
-        "height_female": (2.8, 3.8)
-    },
-    "3_6": {
-        "weight_male": (0.5, 0.9),
-        "weight_female": (0.4, 0.8),
-        "height_male": (2.0, 2.8),
-        "height_female": (1.8, 2.6)
-    },
-    "6_9": {
-        "weight_male": (0.3, 0.6),
-        "weight_female": (0.3, 0.5),
-        "height_male": (1.3, 1.8),
-        "height_female": (1.2, 1.7)
-    },
-    "9_12": {
-        "weight_male": (0.2, 0.5),
-        "weight_female": (0.2, 0.4),
-        "height_male": (1.0, 1.5),
-        "height_female": (0.9, 1.4)
-    },
-    "12_24": {
-        "weight_male": (0.15, 0.35),
-        "weight_female": (0.15, 0.30),
-        "height_male": (0.8, 1.2),
-        "height_female": (0.7, 1.1)
-    },
-    "24_60": {
-        "weight_male": (0.1, 0.25),
-        "weight_female": (0.1, 0.20),
-        "height_male": (0.5, 0.8),
-        "height_female": (0.5, 0.7)
-    }
-}
+# WHO Growth Velocity Standards (median, approximate values) in one contiguous
+# array over the age buckets [LO, HI) months
+# Axes: (bucket, sex [0=M, 1=F], measure [0=weight, 1=height], bound [0=min, 1=max])
+_AGE_BUCKET_LO = np.array([0, 3, 6, 9, 12, 24])
+_AGE_BUCKET_HI = np.array([3, 6, 9, 12, 24, 60])
+_AGE_BUCKET_KEYS = ("0_3", "3_6", "6_9", "9_12", "12_24", "24_60")
+
+_REF = np.empty((len(_AGE_BUCKET_KEYS), 2, 2, 2), dtype=np.float64)
+
+# Weight velocity, kg/bulan
+_REF[:, 0, 0] = [[0.8, 1.3], [0.5, 0.9], [0.3, 0.6], [0.2, 0.5], [0.15, 0.35], [0.1, 0.25]]
+_REF[:, 1, 0] = [[0.7, 1.2], [0.4, 0.8], [0.3, 0.5], [0.2, 0.4], [0.15, 0.30], [0.1, 0.20]]
+
+# Height velocity, cm/bulan
+_REF[:, 0, 1] = [[3.0, 4.0], [2.0, 2.8], [1.3, 1.8], [1.0, 1.5], [0.8, 1.2], [0.5, 0.8]]
+_REF[:, 1, 1] = [[2.8, 3.8], [1.8, 2.6], [1.2, 1.7], [0.9, 1.4], [0.7, 1.1], [0.5, 0.7]]
+
+_REF.setflags(write=False)
 
 
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
 
+# Sort key of measurement dicts
+_BY_AGE = itemgetter('usia_bulan')
+
+
+# First letters of male sex labels ('M', 'Male', 'Laki-laki', ...)
+_MALE_INITIALS = frozenset("MmLl")
+
+
+def _is_male(sex: str) -> bool:
+    """Sex normalization without upper-casing a copy of the label"""
+    return isinstance(sex, str) and sex[:1] in _MALE_INITIALS
+
+
+def _sex_index(sex: str) -> int:
+    """Sex axis index into _REF"""
+    return 0 if _is_male(sex) else 1
+
+
 def get_velocity_reference(age_months: float, sex: str) -> Dict:
     """
     Get velocity reference values for specific age and sex
@@ -85,32 +90,99 @@ def get_velocity_reference(age_months: float, sex: str) -> Dict:
     Returns:
         Dictionary with weight and height velocity ranges
     """
-    # Normalize sex
-    sex_key = "male" if str(sex).upper().startswith(("M", "L")) else "female"
-    
-    # Determine age range
-    if age_months < 3:
-        range_key = "0_3"
-    elif age_months < 6:
-        range_key = "3_6"
-    elif age_months < 9:
-        range_key = "6_9"
-    elif age_months < 12:
-        range_key = "9_12"
-    elif age_months < 24:
-        range_key = "12_24"
-    else:
-        range_key = "24_60"
-    
-    ref = GROWTH_VELOCITY_REFERENCE.get(range_key, GROWTH_VELOCITY_REFERENCE["24_60"])
+    idx = velocity_bucket_index(age_months)
+    weight_range, height_range = _REF[idx, _sex_index(sex)].tolist()
     
     return {
-        "weight_range": ref.get(f"weight_{sex_key}", (0.1, 0.5)),
-        "height_range": ref.get(f"height_{sex_key}", (0.5, 1.0)),
-        "age_range": range_key
+        "weight_range": tuple(weight_range),
+        "height_range": tuple(height_range),
+        "age_range": _AGE_BUCKET_KEYS[idx]
     }
 
 
+def get_velocity_reference_vec(ages: np.ndarray, sex: str) -> List[Dict]:
+    """
+    Velocity references for a whole array of ages in one bucket lookup
+    
+    Args:
+        ages: Ages in months (e.g. the mid-age of every interval)
+        sex: 'M' or 'Laki-laki' or 'F' or 'Perempuan'
+        
+    Returns:
+        List of get_velocity_reference() dictionaries, one per age
+    """
+    idx = np.atleast_1d(velocity_bucket_index(np.asarray(ages, dtype=np.float64)))
+    return [
+        {
+            "weight_range": tuple(w),
+            "height_range": tuple(h),
+            "age_range": _AGE_BUCKET_KEYS[i]
+        }
+        for i, (w, h) in zip(idx.tolist(), _REF[idx, _sex_index(sex)].tolist())
+    ]
+
+
+def velocity_bucket_index(age_months):
+    """
+    Age bucket of the velocity reference arrays
+    
+    Args:
+        age_months: Age in months (scalar or array)
+        
+    Returns:
+        Bucket index (or array of indices); ages of 60+ months fall in the last bucket
+    """
+    idx = np.minimum(np.searchsorted(_AGE_BUCKET_HI, age_months, side='right'), len(_AGE_BUCKET_HI) - 1)
+    return int(idx) if np.ndim(idx) == 0 else idx
+
+
+# Velocity status per threshold bucket, ordered from slowest to fastest;
+# {m} in the message is replaced by the measure type
+_STATUS_TABLE = (
+    {
+        "status": "Penurunan",
+        "color": "#d32f2f",
+        "emoji": "🚨",
+        "message": "Terjadi PENURUNAN {m}! Segera konsultasi ke dokter.",
+        "severity": "critical"
+    },
+    {
+        "status": "Sangat Lambat",
+        "color": "#e65100",
+        "emoji": "⚠️",
+        "message": "Pertumbuhan {m} sangat lambat. Perlu evaluasi segera.",
+        "severity": "warning"
+    },
+    {
+        "status": "Lambat",
+        "color": "#f57c00",
+        "emoji": "📊",
+        "message": "Pertumbuhan {m} di bawah rata-rata. Perlu perhatian.",
+        "severity": "attention"
+    },
+    {
+        "status": "Normal",
+        "color": "#388e3c",
+        "emoji": "✅",
+        "message": "Pertumbuhan {m} dalam rentang normal.",
+        "severity": "normal"
+    },
+    {
+        "status": "Cepat",
+        "color": "#1976d2",
+        "emoji": "📈",
+        "message": "Pertumbuhan {m} di atas rata-rata.",
+        "severity": "good"
+    },
+)
+
+
+def _status_for_bucket(bucket: int, measure_type: str) -> Dict:
+    """Fresh evaluation dict for a _STATUS_TABLE bucket"""
+    template = _STATUS_TABLE[bucket]
+    return {**template, "message": template["message"].format(m=measure_type)}
+
+
 def evaluate_velocity(velocity: float, reference_range: Tuple[float, float], measure_type: str) -> Dict:
     """
     Evaluate velocity against reference range
@@ -125,49 +197,72 @@ def evaluate_velocity(velocity: float, reference_range: Tuple[float, float], mea
     """
     min_normal, max_normal = reference_range
     
-    if velocity < 0:
-        return {
-            "status": "Penurunan",
-            "color": "#d32f2f",
-            "emoji": "🚨",
-            "message": f"Terjadi PENURUNAN {measure_type}! Segera konsultasi ke dokter.",
-            "severity": "critical"
-        }
-    elif velocity < min_normal * 0.5:
-        return {
-            "status": "Sangat Lambat",
-            "color": "#e65100",
-            "emoji": "⚠️",
-            "message": f"Pertumbuhan {measure_type} sangat lambat. Perlu evaluasi segera.",
-            "severity": "warning"
-        }
-    elif velocity < min_normal:
-        return {
-            "status": "Lambat",
-            "color": "#f57c00",
-            "emoji": "📊",
-            "message": f"Pertumbuhan {measure_type} di bawah rata-rata. Perlu perhatian.",
-            "severity": "attention"
-        }
-    elif velocity <= max_normal:
-        return {
-            "status": "Normal",
-            "color": "#388e3c",
-            "emoji": "✅",
-            "message": f"Pertumbuhan {measure_type} dalam rentang normal.",
-            "severity": "normal"
-        }
-    else:
-        return {
-            "status": "Cepat",
-            "color": "#1976d2",
-            "emoji": "📈",
-            "message": f"Pertumbuhan {measure_type} di atas rata-rata.",
-            "severity": "good"
-        }
+    # Thresholds are ascending (0 <= min/2 <= min <= max), so the number of
+    # thresholds passed is the bucket index
+    bucket = (velocity >= 0) + (velocity >= min_normal * 0.5) + (velocity >= min_normal) + (velocity > max_normal)
+    return _status_for_bucket(bucket, measure_type)
+
+
+def velocity_status_buckets(velocities: np.ndarray, min_normal: np.ndarray, max_normal: np.ndarray) -> np.ndarray:
+    """
+    Vectorized evaluate_velocity() bucket index into _STATUS_TABLE
+    
+    Args:
+        velocities: Velocities per month
+        min_normal: Lower normal bound per velocity
+        max_normal: Upper normal bound per velocity
+        
+    Returns:
+        Integer array of bucket indices
+    """
+    v = np.asarray(velocities, dtype=np.float64)
+    return ((v >= 0).astype(np.intp) + (v >= min_normal * 0.5) + (v >= min_normal) + (v > max_normal))
+
+
+def evaluate_velocities(velocities: np.ndarray, min_normal: np.ndarray, max_normal: np.ndarray,
+                        measure_type: str) -> List[Dict]:
+    """
+    Evaluate a whole array of velocities in one NumPy pass
+    
+    Args:
+        velocities: Velocities per month
+        min_normal: Lower normal bound per velocity
+        max_normal: Upper normal bound per velocity
+        measure_type: "weight" or "height"
+        
+    Returns:
+        List of evaluate_velocity() result dictionaries
+    """
+    buckets = velocity_status_buckets(velocities, min_normal, max_normal)
+    return [_status_for_bucket(b, measure_type) for b in buckets.tolist()]
 
 
-def calculate_velocity(data1: Dict, data2: Dict) -> Dict:
+class Velocity(NamedTuple):
+    """Growth velocity over one measurement interval"""
+    periode: str
+    delta_months: float
+    delta_bb: float
+    delta_tb: float
+    velocity_bb: float
+    velocity_tb: float
+    mid_age: float
+
+
+def _velocity_record(age1: float, age2: float, delta_months: float, delta_bb: float,
+                     delta_tb: float, velocity_bb: float, velocity_tb: float, mid_age: float) -> Velocity:
+    """Per-period Velocity shared by the scalar and array paths"""
+    return Velocity(
+        f"{age1:.1f} → {age2:.1f} bulan",
+        round(delta_months, 1),
+        round(delta_bb, 2),
+        round(delta_tb, 1),
+        round(velocity_bb, 3),
+        round(velocity_tb, 2),
+        mid_age
+    )
+
+
+def calculate_velocity(data1: Dict, data2: Dict) -> Optional[Velocity]:
     """
     Calculate growth velocity between two measurements
     
@@ -176,7 +271,7 @@ def calculate_velocity(data1: Dict, data2: Dict) -> Dict:
         data2: Second measurement {"usia_bulan": float, "bb": float, "tb": float}
         
     Returns:
-        Velocity calculation results
+        Velocity of the interval, or None if data2 is not later than data1
     """
     delta_months = data2['usia_bulan'] - data1['usia_bulan']
     
@@ -186,31 +281,92 @@ def calculate_velocity(data1: Dict, data2: Dict) -> Dict:
     delta_bb = data2['bb'] - data1['bb']
     delta_tb = data2['tb'] - data1['tb']
     
-    velocity_bb = delta_bb / delta_months
-    velocity_tb = delta_tb / delta_months
+    return _velocity_record(
+        data1['usia_bulan'], data2['usia_bulan'], delta_months, delta_bb, delta_tb,
+        delta_bb / delta_months, delta_tb / delta_months,
+        (data1['usia_bulan'] + data2['usia_bulan']) / 2
+    )
+
+
+def calculate_velocities(sorted_data: List[Dict]) -> List[Velocity]:
+    """
+    Velocities of every consecutive interval in one NumPy pass
     
-    return {
-        'periode': f"{data1['usia_bulan']:.1f} → {data2['usia_bulan']:.1f} bulan",
-        'delta_months': round(delta_months, 1),
-        'delta_bb': round(delta_bb, 2),
-        'delta_tb': round(delta_tb, 1),
-        'velocity_bb': round(velocity_bb, 3),
-        'velocity_tb': round(velocity_tb, 2),
-        'mid_age': (data1['usia_bulan'] + data2['usia_bulan']) / 2
-    }
+    Args:
+        sorted_data: Measurements sorted by age
+        
+    Returns:
+        calculate_velocity() results for the intervals with a positive duration
+    """
+    n = len(sorted_data)
+    ages = np.fromiter((d['usia_bulan'] for d in sorted_data), dtype=np.float64, count=n)
+    bb = np.fromiter((d['bb'] for d in sorted_data), dtype=np.float64, count=n)
+    tb = np.fromiter((d['tb'] for d in sorted_data), dtype=np.float64, count=n)
+    
+    dm = np.diff(ages)
+    dbb = np.diff(bb)
+    dtb = np.diff(tb)
+    valid = dm > 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vbb = dbb / dm
+        vtb = dtb / dm
+    mid = (ages[:-1] + ages[1:]) * 0.5
+    
+    columns = (ages[:-1], ages[1:], dm, dbb, dtb, vbb, vtb, mid)
+    return [_velocity_record(*row) for row in zip(*(col[valid].tolist() for col in columns))]
+
+
+# ==============================================================================
+# RESULT CACHES
+# ==============================================================================
+
+# Handlers re-run the same analysis whenever unrelated UI state changes, so
+# results are memoized by measurement content. Plot images are ~3 MB each,
+# hence the smaller bound.
+ANALYSIS_CACHE_SIZE = 128
+PLOT_CACHE_SIZE = 16
+
+_ANALYSIS_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_PLOT_CACHE: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _measurements_key(sorted_data: List[Dict]) -> tuple:
+    """Canonical (age, bb, tb) tuple of age-sorted measurements"""
+    return tuple((float(d['usia_bulan']), float(d['bb']), float(d['tb'])) for d in sorted_data)
+
+
+def _cache_get(cache: OrderedDict, key: tuple):
+    """LRU lookup; returns None on a miss"""
+    with _result_cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key: tuple, value, maxsize: int) -> None:
+    """LRU insert, evicting the least recently used entries past maxsize"""
+    with _result_cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
 
 
 # ==============================================================================
 # MAIN ANALYSIS FUNCTION
 # ==============================================================================
 
-def analyze_growth_velocity(data_list: List[Dict], gender: str) -> Dict:
+def analyze_growth_velocity(data_list: List[Dict], gender: str, presorted: bool = False) -> Dict:
     """
     Perform comprehensive growth velocity analysis
     
     Args:
         data_list: List of measurements [{"usia_bulan": float, "bb": float, "tb": float}, ...]
         gender: "Laki-laki" or "Perempuan"
+        presorted: data_list is already sorted by age
         
     Returns:
         Complete analysis results
@@ -222,14 +378,20 @@ def analyze_growth_velocity(data_list: List[Dict], gender: str) -> Dict:
         }
     
     # Sort by age
-    sorted_data = sorted(data_list, key=lambda x: x['usia_bulan'])
+    sorted_data = data_list if presorted else sorted(data_list, key=_BY_AGE)
     
+    key = (gender, _measurements_key(sorted_data))
+    analysis = _cache_get(_ANALYSIS_CACHE, key)
+    if analysis is None:
+        analysis = _analyze_sorted(sorted_data, gender)
+        _cache_put(_ANALYSIS_CACHE, key, analysis, ANALYSIS_CACHE_SIZE)
+    return analysis
+
+
+def _analyze_sorted(sorted_data: List[Dict], gender: str) -> Dict:
+    """analyze_growth_velocity() body for age-sorted measurements"""
     # Calculate velocities for each interval
-    velocities = []
-    for i in range(len(sorted_data) - 1):
-        vel = calculate_velocity(sorted_data[i], sorted_data[i + 1])
-        if vel:
-            velocities.append(vel)
+    velocities = calculate_velocities(sorted_data)
     
     if not velocities:
         return {
@@ -238,31 +400,40 @@ def analyze_growth_velocity(data_list: List[Dict], gender: str) -> Dict:
         }
     
     # Evaluate each velocity
-    evaluations = []
-    for vel in velocities:
-        ref = get_velocity_reference(vel['mid_age'], gender)
-        
-        bb_eval = evaluate_velocity(vel['velocity_bb'], ref['weight_range'], "berat badan")
-        tb_eval = evaluate_velocity(vel['velocity_tb'], ref['height_range'], "tinggi badan")
-        
-        evaluations.append({
+    mid_ages = np.fromiter((vel.mid_age for vel in velocities), dtype=np.float64, count=len(velocities))
+    references = get_velocity_reference_vec(mid_ages, gender)
+    
+    idx = np.atleast_1d(velocity_bucket_index(mid_ages))
+    bounds = _REF[idx, _sex_index(gender)]
+    bounds_w, bounds_h = bounds[:, 0], bounds[:, 1]
+    buckets_bb = velocity_status_buckets([vel.velocity_bb for vel in velocities],
+                                         bounds_w[:, 0], bounds_w[:, 1])
+    buckets_tb = velocity_status_buckets([vel.velocity_tb for vel in velocities],
+                                         bounds_h[:, 0], bounds_h[:, 1])
+    
+    # Velocity tuples become dicts only here, at the result boundary
+    velocity_dicts = [vel._asdict() for vel in velocities]
+    evaluations = [
+        {
             **vel,
             'reference': ref,
-            'bb_evaluation': bb_eval,
-            'tb_evaluation': tb_eval
-        })
+            'bb_evaluation': _status_for_bucket(bb, "berat badan"),
+            'tb_evaluation': _status_for_bucket(tb, "tinggi badan")
+        }
+        for vel, ref, bb, tb in zip(velocity_dicts, references, buckets_bb.tolist(), buckets_tb.tolist())
+    ]
     
     # Calculate overall averages
-    avg_velocity_bb = sum(v['velocity_bb'] for v in velocities) / len(velocities)
-    avg_velocity_tb = sum(v['velocity_tb'] for v in velocities) / len(velocities)
+    avg_velocity_bb = sum(v.velocity_bb for v in velocities) / len(velocities)
+    avg_velocity_tb = sum(v.velocity_tb for v in velocities) / len(velocities)
     
     total_delta_bb = sorted_data[-1]['bb'] - sorted_data[0]['bb']
     total_delta_tb = sorted_data[-1]['tb'] - sorted_data[0]['tb']
     total_months = sorted_data[-1]['usia_bulan'] - sorted_data[0]['usia_bulan']
     
-    # Overall assessment
-    critical_count = sum(1 for e in evaluations if e['bb_evaluation']['severity'] == 'critical' or e['tb_evaluation']['severity'] == 'critical')
-    warning_count = sum(1 for e in evaluations if e['bb_evaluation']['severity'] == 'warning' or e['tb_evaluation']['severity'] == 'warning')
+    # Overall assessment; buckets 0/1 of _STATUS_TABLE are critical/warning
+    critical_count = int(((buckets_bb == 0) | (buckets_tb == 0)).sum())
+    warning_count = int(((buckets_bb == 1) | (buckets_tb == 1)).sum())
     
     if critical_count > 0:
         overall_status = "critical"
@@ -277,7 +448,7 @@ def analyze_growth_velocity(data_list: List[Dict], gender: str) -> Dict:
     return {
         "success": True,
         "data": sorted_data,
-        "velocities": velocities,
+        "velocities": velocity_dicts,
         "evaluations": evaluations,
         "summary": {
             "total_measurements": len(sorted_data),
@@ -295,147 +466,396 @@ def analyze_growth_velocity(data_list: List[Dict], gender: str) -> Dict:
 
 
 # ==============================================================================
-# PLOTTING FUNCTIONS
+# BATCH ANALYSIS
 # ==============================================================================
 
-def plot_kejar_tumbuh_trajectory(data_list: List[Dict], gender: str, 
-                                  theme_name: str = "pink_pastel") -> str:
+# Below this many series the process pool start-up costs more than it saves
+BATCH_MIN_PARALLEL = 64
+BATCH_CHUNKSIZE = 32
+
+_POOL = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
     """
-    Plot growth trajectory with velocity indicators
+    Lazily create the shared analysis process pool
+    
+    Workers are spawned, not forked: the server process already runs the
+    log listener and chart/background threads, and a fork taken while one
+    of them holds a lock (cache, logging) can deadlock the child. Spawned
+    workers import the modules afresh, including their own log listener.
+    """
+    global _POOL
+    
+    with _pool_lock:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                        mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_shutdown_pool)
+        return _POOL
+
+
+def _shutdown_pool() -> None:
+    """Stop the analysis pool's worker processes (run at interpreter exit)"""
+    global _POOL
+    
+    with _pool_lock:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True, cancel_futures=True)
+            _POOL = None
+
+
+def _analyze_worker(args: Tuple[List[Dict], str]) -> Dict:
+    """Picklable analyze_growth_velocity() wrapper for the process pool"""
+    data_list, gender = args
+    return analyze_growth_velocity(data_list, gender)
+
+
+def analyze_growth_velocity_batch(series_list: List[List[Dict]], genders: List[str],
+                                  workers: Optional[int] = None) -> List[Dict]:
+    """
+    Analyze many children's measurement series in parallel processes
     
     Args:
-        data_list: List of measurements
-        gender: "Laki-laki" or "Perempuan"
-        theme_name: UI theme name
+        series_list: One measurement list per child
+        genders: Gender per child, aligned with series_list
+        workers: Process count (default: CPU count; only used when the pool is created)
         
     Returns:
-        Path to saved plot file
+        analyze_growth_velocity() results in input order
     """
-    if len(data_list) < 2:
-        return None
+    jobs = list(zip(series_list, genders))
     
-    theme = UI_THEMES.get(theme_name, UI_THEMES["pink_pastel"])
-    
-    # Sort data
-    sorted_data = sorted(data_list, key=lambda x: x['usia_bulan'])
+    if len(jobs) < BATCH_MIN_PARALLEL or workers == 1:
+        return [_analyze_worker(job) for job in jobs]
     
-    ages = [d['usia_bulan'] for d in sorted_data]
-    weights = [d['bb'] for d in sorted_data]
-    heights = [d['tb'] for d in sorted_data]
+    return list(_get_pool(workers).map(_analyze_worker, jobs, chunksize=BATCH_CHUNKSIZE))
+
+
+# ==============================================================================
+# PLOTTING FUNCTIONS
+# ==============================================================================
+
+@lru_cache(maxsize=1)
+def _plotting():
+    """
+    Import matplotlib (and growth_charts) on the first PNG plot
     
-    # Create figure with 2 subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    Analysis, HTML and SVG output never need it, so importing this module
+    stays free of matplotlib's start-up cost.
     
-    fig.patch.set_facecolor(theme['bg'])
+    Returns:
+        (Figure, offset_copy, figure_to_pil)
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from matplotlib.transforms import offset_copy
+    from modules.growth_charts import figure_to_pil
+    return Figure, offset_copy, figure_to_pil
+
+
+# Default output resolution of the trajectory plot; pass a higher dpi for print
+TRAJECTORY_DPI = 100
+
+# The 1x2 trajectory figure is built once and cleared between calls
+_TRAJECTORY_FIG = None
+_TRAJECTORY_LAYOUT = {}
+_trajectory_lock = threading.Lock()
+
+
+def _get_trajectory_figure() -> Tuple["Figure", object, object]:
+    """Lazily create the shared (fig, ax1, ax2) trajectory figure"""
+    global _TRAJECTORY_FIG
     
-    # Style settings
+    if _TRAJECTORY_FIG is None:
+        Figure, _, _ = _plotting()
+        fig = Figure(figsize=(14, 6))
+        ax1, ax2 = fig.subplots(1, 2)
+        _TRAJECTORY_LAYOUT['dpi'] = fig.dpi
+        _TRAJECTORY_LAYOUT['subplotpars'] = {
+            name: getattr(fig.subplotpars, name)
+            for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+        }
+        _TRAJECTORY_FIG = (fig, ax1, ax2)
+    return _TRAJECTORY_FIG
+
+
+def _annotate_points(fig: "Figure", ax, xs: List[float], ys: List[float],
+                     labels: List[str], color: str) -> None:
+    """Value labels 10 pt above each point, sharing one offset transform"""
+    _, offset_copy, _ = _plotting()
+    transform = offset_copy(ax.transData, fig=fig, y=10, units='points')
+    for x, y, label in zip(xs, ys, labels):
+        ax.text(x, y, label, transform=transform, ha='center', va='baseline',
+                fontsize=9, fontweight='bold', color=color)
+
+
+def _draw_trajectory(fig: "Figure", ax1, ax2, ages: List[float], weights: List[float],
+                     heights: List[float], gender: str, theme: Dict) -> None:
+    """Draw the weight/height trajectories on the cleared shared axes"""
+    # Style settings, read from the theme once
+    text_color, bg, card, border = theme['text'], theme['bg'], theme['card'], theme['border']
     line_color = theme['primary']
     point_color = theme['secondary']
+    sex_label = "Laki-laki" if _is_male(gender) else "Perempuan"
+    
+    fig.patch.set_facecolor(bg)
     
     # Plot Weight trajectory
-    ax1.set_facecolor(theme['card'])
+    ax1.set_facecolor(card)
     ax1.plot(ages, weights, 'o-', color=line_color, linewidth=2.5, 
              markersize=10, markerfacecolor=point_color, 
              markeredgecolor='white', markeredgewidth=2)
     
     # Add annotations
-    for i, (age, weight) in enumerate(zip(ages, weights)):
-        ax1.annotate(f'{weight:.1f} kg',
-                    (age, weight),
-                    textcoords="offset points",
-                    xytext=(0, 10),
-                    ha='center',
-                    fontsize=9,
-                    fontweight='bold',
-                    color=theme['text'])
-    
-    ax1.set_xlabel('Usia (bulan)', fontsize=11, fontweight='bold', color=theme['text'])
-    ax1.set_ylabel('Berat Badan (kg)', fontsize=11, fontweight='bold', color=theme['text'])
-    ax1.set_title(f'📈 Trajectory Berat Badan\n{"Laki-laki" if gender.upper().startswith(("L", "M")) else "Perempuan"}',
-                  fontsize=12, fontweight='bold', color=theme['text'], pad=10)
-    ax1.grid(True, alpha=0.3, linestyle='--', color=theme['border'])
-    ax1.tick_params(colors=theme['text'])
+    _annotate_points(fig, ax1, ages, weights, [f'{weight:.1f} kg' for weight in weights], text_color)
+    
+    ax1.set_xlabel('Usia (bulan)', fontsize=11, fontweight='bold', color=text_color)
+    ax1.set_ylabel('Berat Badan (kg)', fontsize=11, fontweight='bold', color=text_color)
+    ax1.set_title(f'📈 Trajectory Berat Badan\n{sex_label}',
+                  fontsize=12, fontweight='bold', color=text_color, pad=10)
+    ax1.grid(True, alpha=0.3, linestyle='--', color=border)
+    ax1.tick_params(colors=text_color)
     
     # Plot Height trajectory
-    ax2.set_facecolor(theme['card'])
+    ax2.set_facecolor(card)
     ax2.plot(ages, heights, 's-', color='#4CAF50', linewidth=2.5,
              markersize=10, markerfacecolor='#81C784',
              markeredgecolor='white', markeredgewidth=2)
     
-    for i, (age, height) in enumerate(zip(ages, heights)):
-        ax2.annotate(f'{height:.1f} cm',
-                    (age, height),
-                    textcoords="offset points",
-                    xytext=(0, 10),
-                    ha='center',
-                    fontsize=9,
-                    fontweight='bold',
-                    color=theme['text'])
+    _annotate_points(fig, ax2, ages, heights, [f'{height:.1f} cm' for height in heights], text_color)
     
-    ax2.set_xlabel('Usia (bulan)', fontsize=11, fontweight='bold', color=theme['text'])
-    ax2.set_ylabel('Tinggi Badan (cm)', fontsize=11, fontweight='bold', color=theme['text'])
-    ax2.set_title(f'📏 Trajectory Tinggi Badan\n{"Laki-laki" if gender.upper().startswith(("L", "M")) else "Perempuan"}',
-                  fontsize=12, fontweight='bold', color=theme['text'], pad=10)
-    ax2.grid(True, alpha=0.3, linestyle='--', color=theme['border'])
-    ax2.tick_params(colors=theme['text'])
+    ax2.set_xlabel('Usia (bulan)', fontsize=11, fontweight='bold', color=text_color)
+    ax2.set_ylabel('Tinggi Badan (cm)', fontsize=11, fontweight='bold', color=text_color)
+    ax2.set_title(f'📏 Trajectory Tinggi Badan\n{sex_label}',
+                  fontsize=12, fontweight='bold', color=text_color, pad=10)
+    ax2.grid(True, alpha=0.3, linestyle='--', color=border)
+    ax2.tick_params(colors=text_color)
     
-    plt.tight_layout()
+    fig.tight_layout()
+
+
+def plot_kejar_tumbuh_trajectory(data_list: List[Dict], gender: str, 
+                                  theme_name: str = "pink_pastel",
+                                  dpi: int = TRAJECTORY_DPI,
+                                  presorted: bool = False) -> Optional[Image.Image]:
+    """
+    Plot growth trajectory with velocity indicators
+    
+    Args:
+        data_list: List of measurements
+        gender: "Laki-laki" or "Perempuan"
+        theme_name: UI theme name
+        dpi: Output resolution
+        presorted: data_list is already sorted by age
+        
+    Returns:
+        In-memory PIL image of the plot
+    """
+    if len(data_list) < 2:
+        return None
     
-    # Save plot
-    os.makedirs(OUTPUTS_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"kejar_tumbuh_{timestamp}.png"
-    filepath = os.path.join(OUTPUTS_DIR, filename)
+    theme = UI_THEMES.get(theme_name) or UI_THEMES["pink_pastel"]
     
-    fig.savefig(filepath, dpi=150, bbox_inches='tight', facecolor=theme['bg'])
-    plt.close(fig)
+    # Sort data
+    sorted_data = data_list if presorted else sorted(data_list, key=_BY_AGE)
     
-    return filepath
+    key = (gender, theme_name, dpi, _measurements_key(sorted_data))
+    cached = _cache_get(_PLOT_CACHE, key)
+    if cached is not None:
+        return cached.copy()
+    
+    ages = [d['usia_bulan'] for d in sorted_data]
+    weights = [d['bb'] for d in sorted_data]
+    heights = [d['tb'] for d in sorted_data]
+    
+    with _trajectory_lock:
+        fig, ax1, ax2 = _get_trajectory_figure()
+        ax1.clear()
+        ax2.clear()
+        # Lay out from the creation dpi and default margins, not the
+        # previous call's render state
+        fig.set_dpi(_TRAJECTORY_LAYOUT['dpi'])
+        fig.subplots_adjust(**_TRAJECTORY_LAYOUT['subplotpars'])
+        _draw_trajectory(fig, ax1, ax2, ages, weights, heights, gender, theme)
+        
+        # Render in memory; Gradio takes the PIL image without a temp file
+        _, _, figure_to_pil = _plotting()
+        image = figure_to_pil(fig, dpi=dpi)
+    
+    _cache_put(_PLOT_CACHE, key, image, PLOT_CACHE_SIZE)
+    return image.copy()
 
 
 # ==============================================================================
-# HTML GENERATION
+# SVG TRAJECTORY (no matplotlib)
 # ==============================================================================
 
-def generate_kejar_tumbuh_html(analysis: Dict) -> str:
+# Same text style as the growth chart SVGs
+_SVG_TEXT_STYLE = "font-family: 'DejaVu Sans', Arial, sans-serif; font-weight: 700"
+
+# Each panel is a 700x300 user-unit viewport; margins are (left, right, top, bottom)
+SVG_PANEL_SIZE = (700, 300)
+_SVG_MARGINS = (62, 16, 52, 42)
+
+
+def _nice_ticks(lo: float, hi: float, count: int = 5) -> np.ndarray:
+    """Round-number tick positions covering [lo, hi]"""
+    raw_step = (hi - lo) / max(count, 1)
+    magnitude = 10.0 ** math.floor(math.log10(raw_step))
+    step = magnitude * next(m for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    return np.arange(math.ceil(lo / step) * step, hi + step * 1e-9, step)
+
+
+def _padded_range(values: np.ndarray, bottom: float = 0.05, top: float = 0.05) -> Tuple[float, float]:
+    """Data range with relative padding, widened when all values are equal"""
+    lo, hi = float(values.min()), float(values.max())
+    span = hi - lo or (abs(hi) * 0.1 or 1.0)
+    return lo - span * bottom, hi + span * top
+
+
+def _svg_trajectory_panel(x_offset: float, xs: np.ndarray, ys: np.ndarray, labels: List[str],
+                          title: str, ylabel: str, line_color: str, marker_color: str,
+                          square_markers: bool, theme: Dict) -> List[str]:
+    """SVG fragments of one trajectory panel"""
+    width, height = SVG_PANEL_SIZE
+    left, right, top, bottom = _SVG_MARGINS
+    plot_w, plot_h = width - left - right, height - top - bottom
+    text_color, card, border = theme['text'], theme['card'], theme['border']
+    
+    x_lo, x_hi = _padded_range(xs)
+    # Extra headroom for the value labels above the points
+    y_lo, y_hi = _padded_range(ys, top=0.15)
+    
+    def to_px(x):
+        return x_offset + left + (x - x_lo) / (x_hi - x_lo) * plot_w
+    
+    def to_py(y):
+        return top + (y_hi - y) / (y_hi - y_lo) * plot_h
+    
+    px, py = to_px(xs), to_py(ys)
+    parts = [
+        f'<rect x="{x_offset + left}" y="{top}" width="{plot_w}" height="{plot_h}" '
+        f'fill="{card}" stroke="{border}"/>'
+    ]
+    
+    # Grid and tick labels
+    for tick in _nice_ticks(x_lo, x_hi).tolist():
+        tx = to_px(tick)
+        parts.append(
+            f'<line x1="{tx:.1f}" y1="{top}" x2="{tx:.1f}" y2="{top + plot_h}" '
+            f'stroke="{border}" stroke-opacity="0.3" stroke-dasharray="4 3"/>'
+            f'<text x="{tx:.1f}" y="{top + plot_h + 15}" text-anchor="middle" '
+            f'style="font-size: 10px; fill: {text_color}">{tick:g}</text>'
+        )
+    for tick in _nice_ticks(y_lo, y_hi).tolist():
+        ty = to_py(tick)
+        parts.append(
+            f'<line x1="{x_offset + left}" y1="{ty:.1f}" x2="{x_offset + left + plot_w}" y2="{ty:.1f}" '
+            f'stroke="{border}" stroke-opacity="0.3" stroke-dasharray="4 3"/>'
+            f'<text x="{x_offset + left - 6}" y="{ty + 3.5:.1f}" text-anchor="end" '
+            f'style="font-size: 10px; fill: {text_color}">{tick:g}</text>'
+        )
+    
+    # Trajectory line, markers and value labels
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(px.tolist(), py.tolist()))
+    parts.append(
+        f'<polyline points="{points}" fill="none" stroke="{line_color}" '
+        f'stroke-width="2.5" stroke-linejoin="round"/>'
+    )
+    for x, y, label in zip(px.tolist(), py.tolist(), labels):
+        if square_markers:
+            marker = f'<rect x="{x - 5:.1f}" y="{y - 5:.1f}" width="10" height="10"'
+        else:
+            marker = f'<circle cx="{x:.1f}" cy="{y:.1f}" r="5.5"'
+        parts.append(
+            f'{marker} fill="{marker_color}" stroke="white" stroke-width="2"/>'
+            f'<text x="{x:.1f}" y="{y - 10:.1f}" text-anchor="middle" '
+            f'style="{_SVG_TEXT_STYLE}; font-size: 9px; fill: {text_color}">{_svg_escape(label)}</text>'
+        )
+    
+    # Title and axis labels
+    center_x = x_offset + left + plot_w / 2
+    title_lines = title.split("\n")
+    for i, line in enumerate(title_lines):
+        parts.append(
+            f'<text x="{center_x:.1f}" y="{18 + i * 16}" text-anchor="middle" '
+            f'style="{_SVG_TEXT_STYLE}; font-size: 12px; fill: {text_color}">{_svg_escape(line)}</text>'
+        )
+    parts.append(
+        f'<text x="{center_x:.1f}" y="{height - 8}" text-anchor="middle" '
+        f'style="{_SVG_TEXT_STYLE}; font-size: 11px; fill: {text_color}">Usia (bulan)</text>'
+        f'<text transform="translate({x_offset + 16} {top + plot_h / 2:.1f}) rotate(-90)" '
+        f'text-anchor="middle" style="{_SVG_TEXT_STYLE}; font-size: 11px; fill: {text_color}">'
+        f'{_svg_escape(ylabel)}</text>'
+    )
+    return parts
+
+
+def plot_kejar_tumbuh_trajectory_svg(data_list: List[Dict], gender: str,
+                                      theme_name: str = "pink_pastel",
+                                      presorted: bool = False) -> Optional[str]:
     """
-    Generate comprehensive HTML report from analysis
+    Growth trajectory as an inline SVG document, without matplotlib
+    
+    Same two panels (weight, height) as plot_kejar_tumbuh_trajectory().
     
     Args:
-        analysis: Result from analyze_growth_velocity()
+        data_list: List of measurements
+        gender: "Laki-laki" or "Perempuan"
+        theme_name: UI theme name
+        presorted: data_list is already sorted by age
         
     Returns:
-        HTML string
+        SVG string, or None with fewer than 2 measurements
     """
-    if not analysis.get('success'):
-        return f"""
-        <div style='padding: 20px; background: #ffebee; border-radius: 10px; text-align: center;'>
-            <h3 style='color: #c62828;'>⚠️ Tidak Dapat Menganalisis</h3>
-            <p style='color: #b71c1c;'>{analysis.get('error', 'Error tidak diketahui')}</p>
-        </div>
-        """
+    if len(data_list) < 2:
+        return None
     
-    summary = analysis['summary']
-    evaluations = analysis['evaluations']
+    theme = UI_THEMES.get(theme_name) or UI_THEMES["pink_pastel"]
+    sorted_data = data_list if presorted else sorted(data_list, key=_BY_AGE)
     
-    # Status colors
-    status_colors = {
-        'critical': '#d32f2f',
-        'warning': '#f57c00',
-        'normal': '#388e3c'
-    }
+    n = len(sorted_data)
+    ages = np.fromiter((d['usia_bulan'] for d in sorted_data), dtype=np.float64, count=n)
+    weights = np.fromiter((d['bb'] for d in sorted_data), dtype=np.float64, count=n)
+    heights = np.fromiter((d['tb'] for d in sorted_data), dtype=np.float64, count=n)
+    sex_label = "Laki-laki" if _is_male(gender) else "Perempuan"
     
-    status_color = status_colors.get(summary['overall_status'], '#666')
+    width, height = SVG_PANEL_SIZE
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {2 * width} {height}" '
+        f'width="100%" style="font-family: \'DejaVu Sans\', Arial, sans-serif">',
+        f'<rect width="{2 * width}" height="{height}" fill="{theme["bg"]}"/>',
+    ]
+    parts += _svg_trajectory_panel(
+        0, ages, weights, [f'{w:.1f} kg' for w in weights.tolist()],
+        f'📈 Trajectory Berat Badan\n{sex_label}', 'Berat Badan (kg)',
+        theme['primary'], theme['secondary'], False, theme)
+    parts += _svg_trajectory_panel(
+        width, ages, heights, [f'{h:.1f} cm' for h in heights.tolist()],
+        f'📏 Trajectory Tinggi Badan\n{sex_label}', 'Tinggi Badan (cm)',
+        '#4CAF50', '#81C784', True, theme)
+    parts.append("</svg>\n")
     
-    html = f"""
+    return "".join(parts)
+
+
+# ==============================================================================
+# HTML GENERATION
+# ==============================================================================
+
+# Summary header plus table head; $status_color is baked in per status below
+_SUMMARY_TPL = string.Template("""
     <!-- Overall Summary -->
     <div style='background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%);
                 padding: 20px; border-radius: 15px; margin-bottom: 20px;'>
         <h2 style='color: #1565c0; margin: 0 0 15px 0;'>📈 Hasil Analisis Growth Velocity</h2>
         <div style='background: white; padding: 15px; border-radius: 10px; 
-                    border-left: 4px solid {status_color};'>
-            <p style='margin: 0; font-size: 1.1em; color: {status_color}; font-weight: bold;'>
-                {summary['overall_message']}
+                    border-left: 4px solid $status_color;'>
+            <p style='margin: 0; font-size: 1.1em; color: $status_color; font-weight: bold;'>
+                $overall_message
             </p>
         </div>
     </div>
@@ -444,19 +864,19 @@ def generate_kejar_tumbuh_html(analysis: Dict) -> str:
     <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); 
                 gap: 15px; margin-bottom: 20px;'>
         <div style='background: #e8f5e9; padding: 15px; border-radius: 10px; text-align: center;'>
-            <div style='font-size: 1.5em; font-weight: bold; color: #2e7d32;'>{summary['total_measurements']}</div>
+            <div style='font-size: 1.5em; font-weight: bold; color: #2e7d32;'>$total_measurements</div>
             <div style='color: #666; font-size: 0.9em;'>Pengukuran</div>
         </div>
         <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; text-align: center;'>
-            <div style='font-size: 1.5em; font-weight: bold; color: #1565c0;'>{summary['total_months']}</div>
+            <div style='font-size: 1.5em; font-weight: bold; color: #1565c0;'>$total_months</div>
             <div style='color: #666; font-size: 0.9em;'>Bulan Dipantau</div>
         </div>
         <div style='background: #fff3e0; padding: 15px; border-radius: 10px; text-align: center;'>
-            <div style='font-size: 1.5em; font-weight: bold; color: #e65100;'>+{summary['total_delta_bb']} kg</div>
+            <div style='font-size: 1.5em; font-weight: bold; color: #e65100;'>+$total_delta_bb kg</div>
             <div style='color: #666; font-size: 0.9em;'>Kenaikan BB</div>
         </div>
         <div style='background: #fce4ec; padding: 15px; border-radius: 10px; text-align: center;'>
-            <div style='font-size: 1.5em; font-weight: bold; color: #c2185b;'>+{summary['total_delta_tb']} cm</div>
+            <div style='font-size: 1.5em; font-weight: bold; color: #c2185b;'>+$total_delta_tb cm</div>
             <div style='color: #666; font-size: 0.9em;'>Kenaikan TB</div>
         </div>
     </div>
@@ -479,41 +899,51 @@ def generate_kejar_tumbuh_html(analysis: Dict) -> str:
                 </tr>
             </thead>
             <tbody>
-    """
-    
-    for i, eval_data in enumerate(evaluations):
-        row_bg = '#fafafa' if i % 2 == 0 else '#ffffff'
-        bb_eval = eval_data['bb_evaluation']
-        tb_eval = eval_data['tb_evaluation']
-        
-        html += f"""
-            <tr style='background: {row_bg};'>
-                <td style='padding: 10px; border-bottom: 1px solid #eee;'>{eval_data['periode']}</td>
-                <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>{eval_data['delta_months']} bln</td>
-                <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>{eval_data['delta_bb']:+.2f} kg</td>
+    """)
+
+_STATUS_COLORS = {
+    'critical': '#d32f2f',
+    'warning': '#f57c00',
+    'normal': '#388e3c'
+}
+
+# One pre-colored shell per overall status, leaving only the summary values
+_OVERALL_SHELLS = {
+    status: string.Template(_SUMMARY_TPL.safe_substitute(status_color=color))
+    for status, color in _STATUS_COLORS.items()
+}
+_DEFAULT_OVERALL_SHELL = string.Template(_SUMMARY_TPL.safe_substitute(status_color='#666'))
+
+# Per-period table row; values are pre-formatted before substitution
+_ROW_TPL = string.Template("""
+            <tr style='background: $row_bg;'>
+                <td style='padding: 10px; border-bottom: 1px solid #eee;'>$periode</td>
+                <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>$delta_months bln</td>
+                <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>$delta_bb kg</td>
                 <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center; font-weight: bold;'>
-                    {eval_data['velocity_bb']:.3f} kg/bln
+                    $velocity_bb kg/bln
                 </td>
                 <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>
-                    <span style='background: {bb_eval["color"]}22; color: {bb_eval["color"]}; 
+                    <span style='background: ${bb_color}22; color: $bb_color; 
                                  padding: 4px 8px; border-radius: 4px; font-weight: bold;'>
-                        {bb_eval["emoji"]} {bb_eval["status"]}
+                        $bb_emoji $bb_status
                     </span>
                 </td>
-                <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>{eval_data['delta_tb']:+.1f} cm</td>
+                <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>$delta_tb cm</td>
                 <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center; font-weight: bold;'>
-                    {eval_data['velocity_tb']:.2f} cm/bln
+                    $velocity_tb cm/bln
                 </td>
                 <td style='padding: 10px; border-bottom: 1px solid #eee; text-align: center;'>
-                    <span style='background: {tb_eval["color"]}22; color: {tb_eval["color"]}; 
+                    <span style='background: ${tb_color}22; color: $tb_color; 
                                  padding: 4px 8px; border-radius: 4px; font-weight: bold;'>
-                        {tb_eval["emoji"]} {tb_eval["status"]}
+                        $tb_emoji $tb_status
                     </span>
                 </td>
             </tr>
-        """
-    
-    html += """
+        """)
+
+# Closing markup of the period table plus the static recommendations
+_TABLE_END_HTML = """
             </tbody>
         </table>
     </div>
@@ -529,26 +959,154 @@ def generate_kejar_tumbuh_html(analysis: Dict) -> str:
         </ul>
     </div>
     """
+
+
+def generate_kejar_tumbuh_html(analysis: Dict) -> str:
+    """
+    Generate comprehensive HTML report from analysis
+    
+    Args:
+        analysis: Result from analyze_growth_velocity()
+        
+    Returns:
+        HTML string
+    """
+    if not analysis.get('success'):
+        return f"""
+        <div style='padding: 20px; background: #ffebee; border-radius: 10px; text-align: center;'>
+            <h3 style='color: #c62828;'>⚠️ Tidak Dapat Menganalisis</h3>
+            <p style='color: #b71c1c;'>{analysis.get('error', 'Error tidak diketahui')}</p>
+        </div>
+        """
+    
+    summary = analysis['summary']
+    evaluations = analysis['evaluations']
+    
+    shell = _OVERALL_SHELLS.get(summary['overall_status'], _DEFAULT_OVERALL_SHELL)
+    parts = [shell.substitute(
+        overall_message=summary['overall_message'],
+        total_measurements=summary['total_measurements'],
+        total_months=summary['total_months'],
+        total_delta_bb=summary['total_delta_bb'],
+        total_delta_tb=summary['total_delta_tb'],
+    )]
+    for i, eval_data in enumerate(evaluations):
+        bb_eval = eval_data['bb_evaluation']
+        tb_eval = eval_data['tb_evaluation']
+        
+        parts.append(_ROW_TPL.substitute(
+            row_bg='#fafafa' if i % 2 == 0 else '#ffffff',
+            periode=eval_data['periode'],
+            delta_months=eval_data['delta_months'],
+            delta_bb=f"{eval_data['delta_bb']:+.2f}",
+            velocity_bb=f"{eval_data['velocity_bb']:.3f}",
+            bb_color=bb_eval["color"],
+            bb_emoji=bb_eval["emoji"],
+            bb_status=bb_eval["status"],
+            delta_tb=f"{eval_data['delta_tb']:+.1f}",
+            velocity_tb=f"{eval_data['velocity_tb']:.2f}",
+            tb_color=tb_eval["color"],
+            tb_emoji=tb_eval["emoji"],
+            tb_status=tb_eval["status"],
+        ))
+    parts.append(_TABLE_END_HTML)
+    
+    # join() sizes the result once instead of re-copying it per row
+    return "".join(parts)
+
+
+# ==============================================================================
+# INPUT PARSING
+# ==============================================================================
+
+# One decimal number as float() reads it (optional sign and exponent)
+_NUMBER_PATTERN = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+# Three numeric fields filling the line up to its end or the next comma
+_MEASUREMENT_RE = re.compile(
+    rf"^[ \t]*({_NUMBER_PATTERN})[ \t]*,[ \t]*({_NUMBER_PATTERN})[ \t]*,"
+    rf"[ \t]*({_NUMBER_PATTERN})[ \t]*(?:,[^\n]*)?\r?$",
+    re.MULTILINE,
+)
+# Lines with at least three comma-separated fields (the ones that must parse)
+_MEASUREMENT_LINE_RE = re.compile(r"^[^,\n]*,[^,\n]*,", re.MULTILINE)
+
+
+def _parse_measurement_lines(data_str: str) -> List[List[float]]:
+    """Line-by-line parse with float() rules; raises on the first bad line"""
+    rows = []
+    for line_no, line in enumerate(data_str.split('\n'), start=1):
+        parts = line.split(',')
+        if len(parts) < 3:
+            continue
+        try:
+            rows.append([float(part) for part in parts[:3]])
+        except ValueError:
+            raise ValueError(
+                f"Baris {line_no} tidak valid: '{line.strip()}' "
+                f"(format: usia_bulan, bb, tb dalam angka)"
+            ) from None
+    return rows
+
+
+def parse_measurement_text(data_str: str) -> np.ndarray:
+    """
+    Parse "usia, bb, tb" lines into a measurement array
+    
+    Lines with fewer than three fields are skipped; a line with three or
+    more fields whose first three are not numbers raises ValueError.
+    
+    Args:
+        data_str: One measurement per line, comma separated (extra columns ignored)
+        
+    Returns:
+        float64 array of shape (n, 3) with columns usia_bulan, bb, tb
+    """
+    if not data_str:
+        return np.empty((0, 3), dtype=np.float64)
     
-    return html
+    # One C-level scan over the whole text; when it misses a line that has
+    # three fields (text, empty values, trailing junk), reparse line by line
+    rows = _MEASUREMENT_RE.findall(data_str)
+    if len(rows) == len(_MEASUREMENT_LINE_RE.findall(data_str)):
+        try:
+            return np.array(rows, dtype=np.float64).reshape(-1, 3)
+        except ValueError:
+            pass
+    
+    return np.array(_parse_measurement_lines(data_str), dtype=np.float64).reshape(-1, 3)
+
+
+def measurements_from_array(arr: np.ndarray) -> List[Dict]:
+    """Convert an (n, 3) measurement array to the list-of-dicts form"""
+    return [
+        {'usia_bulan': float(age), 'bb': float(weight), 'tb': float(height)}
+        for age, weight, height in arr
+    ]
 
 
 # ==============================================================================
 # HANDLER FUNCTION (untuk Gradio)
 # ==============================================================================
 
-def kalkulator_kejar_tumbuh_handler(data_list: List[Dict], gender: str) -> Tuple[str, Optional[str]]:
+def kalkulator_kejar_tumbuh_handler(data_list: Union[List[Dict], np.ndarray],
+                                    gender: str,
+                                    png_required: bool = True) -> Tuple[str, Optional[Union[Image.Image, str]]]:
     """
     Handler for Kejar Tumbuh calculator
     
     Args:
-        data_list: List of measurements
+        data_list: List of measurements, or an (n, 3) array from parse_measurement_text()
         gender: Gender string
+        png_required: Render the plot with matplotlib (PIL image); otherwise
+            return the lightweight SVG string
         
     Returns:
-        Tuple of (html_report, plot_path)
+        Tuple of (html_report, plot_image or SVG string)
     """
     try:
+        if isinstance(data_list, np.ndarray):
+            data_list = measurements_from_array(data_list)
+        
         if not data_list or len(data_list) < 2:
             return (
                 "<p style='color: #e74c3c; padding: 20px;'>"
@@ -556,22 +1114,27 @@ def kalkulator_kejar_tumbuh_handler(data_list: List[Dict], gender: str) -> Tuple
                 None
             )
         
+        # Sort once; analysis and plot both take the presorted list
+        sorted_data = sorted(data_list, key=_BY_AGE)
+        
         # Run analysis
-        analysis = analyze_growth_velocity(data_list, gender)
+        analysis = analyze_growth_velocity(sorted_data, gender, presorted=True)
         
         # Generate HTML report
         html_report = generate_kejar_tumbuh_html(analysis)
         
         # Generate plot
-        plot_path = None
+        plot_image = None
         if analysis.get('success'):
-            plot_path = plot_kejar_tumbuh_trajectory(data_list, gender)
+            if png_required:
+                plot_image = plot_kejar_tumbuh_trajectory(analysis['data'], gender, presorted=True)
+            else:
+                plot_image = plot_kejar_tumbuh_trajectory_svg(analysis['data'], gender, presorted=True)
         
-        return html_report, plot_path
+        return html_report, plot_image
         
     except Exception as e:
-        print(f"❌ Error in kejar_tumbuh_handler: {e}")
-        traceback.print_exc()
+        log_exception("kejar_tumbuh_handler", e)
         return f"<p style='color: #e74c3c; padding: 20px;'>Error: {str(e)}</p>", None
 
 
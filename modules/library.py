@@ -7,7 +7,12 @@
 #==============================================================================
 """
 
-from typing import Dict, List, Optional
+import io
+import string
+from html import escape
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
 import sys
 import os
 
@@ -17,20 +22,74 @@ from data.articles import (
     ARTIKEL_DATABASE,
     ARTICLE_CATEGORIES,
     get_article_by_id,
+    rebuild_article_indexes,
     search_articles,
-    get_articles_by_category,
     get_categories,
     format_article_content
 )
 
+# Article text fields rendered into HTML, with their defaults
+_ESCAPED_FIELD_DEFAULTS = {
+    "image_url": "",
+    "title": "",
+    "kategori": "Umum",
+    "summary": "",
+    "source": "AnthroHPK",
+}
+
+
+def _escape_fields(article: Dict) -> Dict[str, str]:
+    """html.escape() every rendered text field of an article"""
+    return {
+        field: escape(str(article.get(field, default)), quote=True)
+        for field, default in _ESCAPED_FIELD_DEFAULTS.items()
+    }
+
+
+# Escaped once per article at import; every card/page render reuses them
+_ESCAPED_FIELDS: Dict[int, Dict[str, str]] = {
+    article["id"]: _escape_fields(article) for article in ARTIKEL_DATABASE
+}
+
+
+def _escaped(article: Dict) -> Dict[str, str]:
+    """Pre-escaped fields of an article (computed on the fly if not in the database)"""
+    fields = _ESCAPED_FIELDS.get(article.get("id"))
+    return fields if fields is not None else _escape_fields(article)
+
+
+# Articles per category, counted in one pass over the static database
+_CATEGORY_COUNT_CACHE = Counter(article.get("kategori", "Umum") for article in ARTIKEL_DATABASE)
+
 # ==============================================================================
 # HTML GENERATORS FOR LIBRARY
 # ==============================================================================
 
-def generate_library_home_html() -> str:
-    """Generate library homepage HTML with categories"""
-    
-    html = """
+# Category card icon and background colour per category
+CATEGORY_ICONS = {
+    "Gizi & Stunting": "🥗",
+    "Nutrisi & MPASI": "🍽️",
+    "Tumbuh Kembang": "📈",
+    "Kesehatan Ibu": "🤰",
+    "Imunisasi": "💉",
+    "ASI & Menyusui": "🤱",
+    "Perkembangan Anak": "🧒",
+    "Tips Parenting": "👨‍👩‍👧"
+}
+
+CATEGORY_COLORS = {
+    "Gizi & Stunting": "#e8f5e9",
+    "Nutrisi & MPASI": "#fff3e0",
+    "Tumbuh Kembang": "#e3f2fd",
+    "Kesehatan Ibu": "#fce4ec",
+    "Imunisasi": "#f3e5f5",
+    "ASI & Menyusui": "#e0f7fa",
+    "Perkembangan Anak": "#fff8e1",
+    "Tips Parenting": "#f1f8e9"
+}
+
+# Static parts of the home page
+_HOME_HEADER_HTML = """
     <div style='background: linear-gradient(135deg, #e8f5e9 0%, #c8e6c9 100%);
                 padding: 25px; border-radius: 20px; margin-bottom: 20px;'>
         <h2 style='color: #2e7d32; margin: 0 0 10px 0;'>📚 Perpustakaan Ibu Balita</h2>
@@ -42,115 +101,122 @@ def generate_library_home_html() -> str:
     <!-- Category Cards -->
     <div style='display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-bottom: 20px;'>
     """
-    
-    category_icons = {
-        "Gizi & Stunting": "🥗",
-        "Nutrisi & MPASI": "🍽️",
-        "Tumbuh Kembang": "📈",
-        "Kesehatan Ibu": "🤰",
-        "Imunisasi": "💉",
-        "ASI & Menyusui": "🤱",
-        "Perkembangan Anak": "🧒",
-        "Tips Parenting": "👨‍👩‍👧"
-    }
-    
-    category_colors = {
-        "Gizi & Stunting": "#e8f5e9",
-        "Nutrisi & MPASI": "#fff3e0",
-        "Tumbuh Kembang": "#e3f2fd",
-        "Kesehatan Ibu": "#fce4ec",
-        "Imunisasi": "#f3e5f5",
-        "ASI & Menyusui": "#e0f7fa",
-        "Perkembangan Anak": "#fff8e1",
-        "Tips Parenting": "#f1f8e9"
-    }
-    
+
+_LATEST_ARTICLES_HEADER = """
+    <div style='background: white; padding: 20px; border-radius: 15px;
+                box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
+        <h3 style='color: #1565c0; margin: 0 0 15px 0;'>📰 Artikel Terbaru</h3>
+        <div style='display: grid; gap: 15px;'>
+    """
+
+
+def _build_categories_grid_html() -> str:
+    """Render the home page category cards from the current counts"""
+    parts = []
     for category in ARTICLE_CATEGORIES:
-        icon = category_icons.get(category, "📖")
-        bg_color = category_colors.get(category, "#f5f5f5")
-        article_count = len(get_articles_by_category(category))
+        icon = CATEGORY_ICONS.get(category, "📖")
+        bg_color = CATEGORY_COLORS.get(category, "#f5f5f5")
+        article_count = _CATEGORY_COUNT_CACHE.get(category, 0)
         
-        html += f"""
+        parts.append(f"""
         <div style='background: {bg_color}; padding: 20px; border-radius: 15px;
                     text-align: center; cursor: pointer; transition: transform 0.2s;'
              onmouseover="this.style.transform='scale(1.02)'"
              onmouseout="this.style.transform='scale(1)'">
             <div style='font-size: 2.5em; margin-bottom: 10px;'>{icon}</div>
-            <h4 style='color: #333; margin: 0 0 5px 0;'>{category}</h4>
+            <h4 style='color: #333; margin: 0 0 5px 0;'>{escape(category)}</h4>
             <p style='color: #666; margin: 0; font-size: 0.9em;'>{article_count} artikel</p>
         </div>
-        """
+        """)
     
-    html += "</div>"
+    return "".join(parts)
+
+
+# Category cards depend only on the category counts; see invalidate_library_cache
+_CATEGORIES_GRID_HTML = _build_categories_grid_html()
+
+
+# Article data is static after import, so pages without a search query are
+# rendered once and reused
+
+@lru_cache(maxsize=1)
+def generate_library_home_html() -> str:
+    """Generate library homepage HTML with categories"""
+    
+    buf = io.StringIO()
+    buf.write(_LIBRARY_CSS)
+    buf.write(_HOME_HEADER_HTML)
+    
+    buf.write(_CATEGORIES_GRID_HTML)
+    buf.write("</div>")
     
     # Latest Articles
-    html += """
-    <div style='background: white; padding: 20px; border-radius: 15px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);'>
-        <h3 style='color: #1565c0; margin: 0 0 15px 0;'>📰 Artikel Terbaru</h3>
-        <div style='display: grid; gap: 15px;'>
-    """
+    buf.write(_LATEST_ARTICLES_HEADER)
     
     # Show first 5 articles
     for article in ARTIKEL_DATABASE[:5]:
-        html += generate_article_card_html(article)
+        buf.write(generate_article_card_html(article))
     
-    html += "</div></div>"
+    buf.write("</div></div>")
     
-    return html
+    return buf.getvalue()
+
+
+# Article card styling, shared by every card on a page instead of repeated
+# inline; pages that render cards emit it once ahead of the first card
+_LIBRARY_CSS = """<style>
+.art-card{display:flex;gap:15px;padding:15px;background:#fafafa;border-radius:12px;align-items:center;}
+.art-card img{width:100px;height:80px;object-fit:cover;border-radius:8px;}
+.art-card .art-body{flex:1;}
+.art-card .art-meta{display:flex;align-items:center;gap:10px;margin-bottom:5px;}
+.art-card .art-tag{background:#e3f2fd;color:#1565c0;padding:2px 8px;border-radius:4px;font-size:0.75em;}
+.art-card h4{margin:0 0 5px 0;color:#333;}
+.art-card .art-summary{margin:0;color:#666;font-size:0.9em;display:-webkit-box;-webkit-line-clamp:2;-webkit-box-orient:vertical;overflow:hidden;}
+.art-card .art-source{margin:5px 0 0 0;color:#888;font-size:0.8em;}
+</style>"""
+
+# Article card markup, parsed once; see generate_article_card_html
+_CARD_TPL = string.Template(
+    "<div class='art-card'>"
+    "<img src='$image_url' alt='$title' "
+    "onerror=\"this.src='https://images.pexels.com/photos/3845126/pexels-photo-3845126.jpeg?auto=compress&cs=tinysrgb&w=100'\">"
+    "<div class='art-body'>"
+    "<div class='art-meta'><span class='art-tag'>$kategori</span></div>"
+    "<h4>$title</h4>"
+    "<p class='art-summary'>$summary</p>"
+    "<p class='art-source'>📎 $source</p>"
+    "</div></div>"
+)
 
 
 def generate_article_card_html(article: Dict) -> str:
-    """Generate HTML card for single article"""
+    """Generate HTML card for single article (styled by _LIBRARY_CSS)"""
     
-    return f"""
-    <div style='display: flex; gap: 15px; padding: 15px; background: #fafafa;
-                border-radius: 12px; align-items: center;'>
-        <img src='{article.get("image_url", "")}' 
-             style='width: 100px; height: 80px; object-fit: cover; border-radius: 8px;'
-             alt='{article["title"]}'
-             onerror="this.src='https://images.pexels.com/photos/3845126/pexels-photo-3845126.jpeg?auto=compress&cs=tinysrgb&w=100'">
-        <div style='flex: 1;'>
-            <div style='display: flex; align-items: center; gap: 10px; margin-bottom: 5px;'>
-                <span style='background: #e3f2fd; color: #1565c0; padding: 2px 8px;
-                             border-radius: 4px; font-size: 0.75em;'>
-                    {article.get("kategori", "Umum")}
-                </span>
-            </div>
-            <h4 style='margin: 0 0 5px 0; color: #333;'>{article["title"]}</h4>
-            <p style='margin: 0; color: #666; font-size: 0.9em; 
-                      display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical;
-                      overflow: hidden;'>
-                {article.get("summary", "")}
-            </p>
-            <p style='margin: 5px 0 0 0; color: #888; font-size: 0.8em;'>
-                📎 {article.get("source", "AnthroHPK")}
-            </p>
-        </div>
-    </div>
-    """
+    return _CARD_TPL.substitute(_escaped(article))
 
 
-def generate_article_list_html(category: str = "", query: str = "") -> str:
-    """Generate article list HTML with optional filtering"""
+def iter_article_list_html(category: str = "", query: str = "") -> Iterator[str]:
+    """Yield article list HTML in chunks: header, then one card per article"""
     
     # Get filtered articles
     articles = search_articles(query=query, category=category)
     
     if not articles:
-        return """
+        yield """
         <div style='padding: 40px; text-align: center; background: #f5f5f5; border-radius: 15px;'>
             <div style='font-size: 3em; margin-bottom: 15px;'>🔍</div>
             <h3 style='color: #666; margin: 0 0 10px 0;'>Tidak ada artikel ditemukan</h3>
             <p style='color: #888; margin: 0;'>Coba kata kunci lain atau pilih kategori berbeda</p>
         </div>
         """
+        return
     
-    title = f"Kategori: {category}" if category and category != "Semua Kategori" else "Semua Artikel"
+    title = f"Kategori: {escape(category)}" if category and category != "Semua Kategori" else "Semua Artikel"
     if query:
-        title = f"Hasil pencarian: '{query}'"
+        title = f"Hasil pencarian: '{escape(query)}'"
     
-    html = f"""
+    yield _LIBRARY_CSS
+    yield f"""
     <div style='background: #e8f5e9; padding: 15px; border-radius: 10px; margin-bottom: 15px;'>
         <h3 style='color: #2e7d32; margin: 0;'>📚 {title}</h3>
         <p style='color: #388e3c; margin: 5px 0 0 0;'>{len(articles)} artikel ditemukan</p>
@@ -159,49 +225,69 @@ def generate_article_list_html(category: str = "", query: str = "") -> str:
     """
     
     for article in articles:
-        html += generate_article_card_html(article)
-    
-    html += "</div>"
+        yield generate_article_card_html(article)
     
-    return html
+    yield "</div>"
 
 
-def generate_article_full_html(article_id: int) -> str:
-    """Generate full article HTML"""
-    
-    article = get_article_by_id(article_id)
-    
-    if not article:
-        return """
-        <div style='padding: 40px; text-align: center; background: #ffebee; border-radius: 15px;'>
-            <div style='font-size: 3em; margin-bottom: 15px;'>❌</div>
-            <h3 style='color: #c62828; margin: 0;'>Artikel tidak ditemukan</h3>
-        </div>
-        """
-    
-    content_html = format_article_content(article.get("full_content", ""))
-    
-    html = f"""
+@lru_cache(maxsize=None)
+def _category_list_html(category: str) -> str:
+    """Cached article list of one known category (or all articles for '')"""
+    return "".join(iter_article_list_html(category, ""))
+
+
+def _is_cacheable_category(category: str) -> bool:
+    """Only the fixed category names are cached, keeping the cache bounded"""
+    return not category or category == "Semua Kategori" or category in ARTICLE_CATEGORIES
+
+
+def generate_article_list_html(category: str = "", query: str = "") -> str:
+    """Generate article list HTML with optional filtering"""
+    if not query and _is_cacheable_category(category):
+        return _category_list_html(category)
+    return "".join(iter_article_list_html(category, query))
+
+
+# Full-article hero header, filled from the pre-escaped fields like _CARD_TPL
+_ARTICLE_HEADER_TPL = string.Template("""
     <!-- Article Header -->
     <div style='position: relative; margin-bottom: 20px;'>
-        <img src='{article.get("image_url", "")}' 
+        <img src='$image_url' 
              style='width: 100%; height: 200px; object-fit: cover; border-radius: 15px;'
-             alt='{article["title"]}'
+             alt='$title'
              onerror="this.src='https://images.pexels.com/photos/3845126/pexels-photo-3845126.jpeg?auto=compress&cs=tinysrgb&w=800'">
         <div style='position: absolute; bottom: 0; left: 0; right: 0; 
                     background: linear-gradient(transparent, rgba(0,0,0,0.8));
                     padding: 20px; border-radius: 0 0 15px 15px;'>
             <span style='background: #4CAF50; color: white; padding: 4px 12px;
                          border-radius: 20px; font-size: 0.8em;'>
-                {article.get("kategori", "Umum")}
+                $kategori
             </span>
-            <h2 style='color: white; margin: 10px 0 5px 0;'>{article["title"]}</h2>
+            <h2 style='color: white; margin: 10px 0 5px 0;'>$title</h2>
             <p style='color: #ddd; margin: 0; font-size: 0.9em;'>
-                📎 Sumber: {article.get("source", "AnthroHPK")}
+                📎 Sumber: $source
             </p>
         </div>
     </div>
+    """)
+
+
+def generate_article_full_html(article_id: int) -> str:
+    """Generate full article HTML"""
+    
+    article = get_article_by_id(article_id)
+    
+    if not article:
+        return """
+        <div style='padding: 40px; text-align: center; background: #ffebee; border-radius: 15px;'>
+            <div style='font-size: 3em; margin-bottom: 15px;'>❌</div>
+            <h3 style='color: #c62828; margin: 0;'>Artikel tidak ditemukan</h3>
+        </div>
+        """
+    
+    content_html = format_article_content(article.get("full_content", ""))
     
+    html = _ARTICLE_HEADER_TPL.substitute(_escaped(article)) + f"""
     <!-- Article Content -->
     <div style='background: white; padding: 25px; border-radius: 15px;
                 box-shadow: 0 2px 10px rgba(0,0,0,0.1);
@@ -225,28 +311,29 @@ def generate_article_full_html(article_id: int) -> str:
     return html
 
 
-def generate_library_search_html(query: str, category: str = "") -> str:
-    """Generate search results HTML"""
+def iter_library_search_html(query: str, category: str = "") -> Iterator[str]:
+    """Yield search results HTML in chunks: header, then one card per article"""
     
     articles = search_articles(query=query, category=category)
     
-    html = f"""
+    yield f"""
     <div style='background: #e3f2fd; padding: 15px; border-radius: 10px; margin-bottom: 15px;'>
         <h3 style='color: #1565c0; margin: 0;'>🔍 Hasil Pencarian</h3>
         <p style='color: #1976d2; margin: 5px 0 0 0;'>
-            Ditemukan {len(articles)} artikel untuk "{query}"
-            {f' dalam kategori "{category}"' if category and category != "Semua Kategori" else ''}
+            Ditemukan {len(articles)} artikel untuk "{escape(query)}"
+            {f' dalam kategori "{escape(category)}"' if category and category != "Semua Kategori" else ''}
         </p>
     </div>
     """
     
     if articles:
-        html += "<div style='display: grid; gap: 15px;'>"
+        yield _LIBRARY_CSS
+        yield "<div style='display: grid; gap: 15px;'>"
         for article in articles:
-            html += generate_article_card_html(article)
-        html += "</div>"
+            yield generate_article_card_html(article)
+        yield "</div>"
     else:
-        html += """
+        yield """
         <div style='padding: 30px; text-align: center; background: #f5f5f5; border-radius: 15px;'>
             <p style='color: #666; margin: 0;'>Tidak ada artikel yang cocok dengan pencarian Anda.</p>
             <p style='color: #888; margin: 10px 0 0 0; font-size: 0.9em;'>
@@ -254,8 +341,43 @@ def generate_library_search_html(query: str, category: str = "") -> str:
             </p>
         </div>
         """
+
+
+# Recent search pages; bounded because queries are free text
+SEARCH_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _search_html(query: str, category: str) -> str:
+    """Cached search results for a query within a known category (or '')"""
+    return "".join(iter_library_search_html(query, category))
+
+
+def generate_library_search_html(query: str, category: str = "") -> str:
+    """Generate search results HTML"""
+    if _is_cacheable_category(category):
+        return _search_html(query, category)
+    return "".join(iter_library_search_html(query, category))
+
+
+def invalidate_library_cache() -> None:
+    """
+    Rebuild the article indexes and derived data, and drop every cached page
     
-    return html
+    Call after ARTIKEL_DATABASE is modified in place (e.g. by an admin
+    write path) so the next render reflects the change.
+    """
+    global _ESCAPED_FIELDS, _CATEGORY_COUNT_CACHE, _CATEGORIES_GRID_HTML
+    
+    rebuild_article_indexes()
+    _ESCAPED_FIELDS = {article["id"]: _escape_fields(article) for article in ARTIKEL_DATABASE}
+    _CATEGORY_COUNT_CACHE = Counter(article.get("kategori", "Umum") for article in ARTIKEL_DATABASE)
+    _CATEGORIES_GRID_HTML = _build_categories_grid_html()
+    
+    generate_library_home_html.cache_clear()
+    _category_list_html.cache_clear()
+    _search_html.cache_clear()
+    get_article_html.cache_clear()
 
 
 # ==============================================================================
@@ -278,16 +400,40 @@ def get_total_articles() -> int:
 
 def get_category_counts() -> Dict[str, int]:
     """Get article count per category"""
-    counts = {}
-    for category in ARTICLE_CATEGORIES:
-        counts[category] = len(get_articles_by_category(category))
-    return counts
+    return {category: _CATEGORY_COUNT_CACHE.get(category, 0) for category in ARTICLE_CATEGORIES}
 
 
 # ==============================================================================
 # MAIN HANDLER FUNCTIONS (untuk app.py)
 # ==============================================================================
 
+def iter_library_html(kategori: str = "", search_query: str = "") -> Iterator[str]:
+    """
+    Main handler for library display, yielding HTML chunks
+    
+    Args:
+        kategori: Category filter (or "Semua Kategori")
+        search_query: Search term
+        
+    Yields:
+        HTML fragments; joined they form the full library page
+    """
+    # "Semua Kategori" renders exactly like no filter, so both share cache entries
+    category = kategori if kategori and kategori != "Semua Kategori" else ""
+    
+    if search_query:
+        if _is_cacheable_category(category):
+            yield _search_html(search_query, category)
+        else:
+            yield from iter_library_search_html(search_query, category)
+    elif not category:
+        yield generate_library_home_html()
+    elif _is_cacheable_category(category):
+        yield _category_list_html(category)
+    else:
+        yield from iter_article_list_html(category=category, query="")
+
+
 def generate_library_html(kategori: str = "", search_query: str = "") -> str:
     """
     Main handler for library display
@@ -299,19 +445,10 @@ def generate_library_html(kategori: str = "", search_query: str = "") -> str:
     Returns:
         HTML string
     """
-    # If both empty, show home
-    if not kategori or kategori == "Semua Kategori":
-        if not search_query:
-            return generate_library_home_html()
-    
-    # If search query provided
-    if search_query:
-        return generate_library_search_html(search_query, kategori)
-    
-    # If category provided
-    return generate_article_list_html(category=kategori, query="")
+    return "".join(iter_library_html(kategori, search_query))
 
 
+@lru_cache(maxsize=256)
 def get_article_html(article_id: int) -> str:
     """
     Get full article HTML
@@ -8,6 +8,7 @@
 """
 
 from typing import Dict, List, Optional
+from functools import lru_cache
 from datetime import date, datetime
 import math
 
@@ -388,6 +389,7 @@ def generate_mother_nutrition_html(phase: str = "menyusui") -> str:
     return html
 
 
+@lru_cache(maxsize=1)
 def generate_laktasi_guide_html() -> str:
     """Generate comprehensive lactation guide HTML"""
     
@@ -489,6 +491,7 @@ def generate_laktasi_guide_html() -> str:
     return html
 
 
+@lru_cache(maxsize=1)
 def generate_mental_health_html() -> str:
     """Generate mental health awareness HTML"""
     
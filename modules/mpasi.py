@@ -8,6 +8,7 @@
 """
 
 from typing import Dict, List, Optional
+from functools import lru_cache
 import sys
 import os
 
@@ -28,6 +29,7 @@ from config import MPASI_YOUTUBE_VIDEOS
 # MPASI TAB CONTENT GENERATORS
 # ==============================================================================
 
+@lru_cache(maxsize=1)
 def generate_mpasi_overview_html() -> str:
     """Generate MPASI overview/introduction HTML"""
     
@@ -129,6 +131,7 @@ def generate_mpasi_by_month_html(month: int) -> str:
     return generate_mpasi_html(month)
 
 
+@lru_cache(maxsize=1)
 def generate_allergy_guide_html() -> str:
     """Generate food allergy guide HTML"""
     
@@ -10,9 +10,14 @@
 import os
 import io
 import csv
+from bisect import bisect_left, bisect_right
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image as PILImage
 
 # ReportLab imports for PDF generation
 try:
@@ -22,8 +27,9 @@ try:
     from reportlab.lib.units import cm, mm
     from reportlab.platypus import (
         SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-        Image, PageBreak, HRFlowable
+        PageBreak, HRFlowable, Flowable
     )
+    from reportlab.lib.utils import ImageReader
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
     REPORTLAB_AVAILABLE = True
 except ImportError:
@@ -34,16 +40,30 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import APP_VERSION, APP_TITLE, CONTACT_WA, OUTPUTS_DIR
+from modules.utilities import log_exception
 
 # ==============================================================================
 # PDF STYLES
 # ==============================================================================
 
+# Stylesheet shared by every PDF; built on first use
+_PDF_STYLES_CACHE = None
+
+
 def get_pdf_styles():
-    """Get custom PDF styles"""
+    """Get custom PDF styles (built once, then shared)"""
+    global _PDF_STYLES_CACHE
+    
     if not REPORTLAB_AVAILABLE:
         return None
     
+    if _PDF_STYLES_CACHE is None:
+        _PDF_STYLES_CACHE = _build_pdf_styles()
+    return _PDF_STYLES_CACHE
+
+
+def _build_pdf_styles():
+    """Sample stylesheet plus the report's custom paragraph styles"""
     styles = getSampleStyleSheet()
     
     # Custom styles
@@ -83,13 +103,11 @@ def get_pdf_styles():
         spaceAfter=5
     ))
     
-    styles.add(ParagraphStyle(
-        name='BodyText',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=8
-    ))
+    # 'BodyText' already exists in the sample stylesheet, so adjust it in place
+    body_text = styles['BodyText']
+    body_text.fontSize = 10
+    body_text.textColor = colors.HexColor('#333333')
+    body_text.spaceAfter = 8
     
     styles.add(ParagraphStyle(
         name='SmallText',
@@ -120,10 +138,144 @@ def get_pdf_styles():
     return styles
 
 
+# ==============================================================================
+# REPORT PAGE TEMPLATE (static parts, built once at import)
+# ==============================================================================
+
+REPORT_FOOTER_TEXT = f"Laporan ini dibuat oleh {APP_TITLE} | Kontak: {CONTACT_WA}"
+REPORT_DISCLAIMER_TEXT = (
+    "Laporan ini bukan pengganti konsultasi medis. "
+    "Selalu konsultasikan dengan tenaga kesehatan untuk evaluasi lebih lanjut."
+)
+
+if REPORTLAB_AVAILABLE:
+    CHILD_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e0e0e0'))
+    ])
+    
+    ZSCORE_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1565c0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e0e0e0')),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
+    ])
+    
+    # Z-score text colours: < -3, < -2, <= 2, <= 3, > 3
+    _Z_MISSING_COLOR = colors.HexColor('#888888')
+    _Z_COLORS = tuple(
+        colors.HexColor(c) for c in ('#b71c1c', '#e65100', '#2e7d32', '#1565c0', '#6a1b9a')
+    )
+    
+    
+    class CanvasImage(Flowable):
+        """Flowable that stamps an image file path or in-memory PIL image onto the canvas"""
+        
+        def __init__(self, source, width: float, height: float):
+            super().__init__()
+            self.reader = source if isinstance(source, ImageReader) else ImageReader(source)
+            self.width = width
+            self.height = height
+            self.hAlign = 'CENTER'
+        
+        def wrap(self, avail_width, avail_height):
+            return self.width, self.height
+        
+        def draw(self):
+            self.canv.drawImage(self.reader, 0, 0, self.width, self.height, mask='auto')
+
+
+# Band edges for _Z_COLORS; the lower edges belong to the band above them
+# (-3 is "< -2"), the upper edges to the band below (2 is "<= 2")
+_Z_LOWER_EDGES = (-3, -2)
+_Z_UPPER_EDGES = (2, 3)
+
+
+def format_zscore_cell(z: Optional[float]) -> Tuple[str, "colors.Color"]:
+    """Format a Z-score for the report table and pick its band colour"""
+    if z is None:
+        return "-", _Z_MISSING_COLOR
+    band = bisect_right(_Z_LOWER_EDGES, z) + bisect_left(_Z_UPPER_EDGES, z)
+    return f"{z:.2f}", _Z_COLORS[band]
+
+
+def _draw_report_page(canvas, doc) -> None:
+    """Draw the fixed footer (line, credits, disclaimer, page number) on each page"""
+    page_width, _ = A4
+    canvas.saveState()
+    canvas.setStrokeColor(colors.HexColor('#e0e0e0'))
+    canvas.setLineWidth(1)
+    canvas.line(doc.leftMargin, 1.6*cm, page_width - doc.rightMargin, 1.6*cm)
+    canvas.setFont('Helvetica', 7)
+    canvas.setFillColor(colors.HexColor('#888888'))
+    canvas.drawString(doc.leftMargin, 1.2*cm, REPORT_FOOTER_TEXT)
+    canvas.drawString(doc.leftMargin, 0.8*cm, REPORT_DISCLAIMER_TEXT)
+    canvas.drawRightString(page_width - doc.rightMargin, 1.2*cm, f"Hal. {doc.page}")
+    canvas.restoreState()
+
+
 # ==============================================================================
 # PDF GENERATION FUNCTIONS
 # ==============================================================================
 
+CHART_LOAD_WORKERS = 4
+CHART_READER_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=CHART_READER_CACHE_SIZE)
+def _cached_chart_reader(path: str, mtime: float) -> "ImageReader":
+    """
+    Decode a chart file once per (path, mtime) for reuse across PDF builds
+    
+    The image is fully loaded so no file handle stays open; a regenerated
+    chart gets a new mtime and therefore a fresh entry.
+    """
+    with PILImage.open(path) as img:
+        img.load()
+        return ImageReader(img.copy())
+
+
+def _load_chart_image(chart) -> Optional["CanvasImage"]:
+    """
+    Open one report chart
+    
+    Args:
+        chart: Image file path or in-memory PIL image
+        
+    Returns:
+        16x10 cm CanvasImage, or None if the file is missing or unreadable
+    """
+    try:
+        if isinstance(chart, str):
+            try:
+                mtime = os.path.getmtime(chart)
+            except OSError:
+                return None
+            chart = _cached_chart_reader(chart, mtime)
+        return CanvasImage(chart, width=16*cm, height=10*cm)
+    except Exception as e:
+        print(f"⚠️ Could not add chart {chart}: {e}")
+        return None
+
+
+def _write_pdf(filepath: str, buf: io.BytesIO) -> None:
+    """Write an in-memory PDF to disk with a single write"""
+    with open(filepath, 'wb') as f:
+        f.write(buf.getbuffer())
+
+
 def generate_growth_report_pdf(
     child_data: Dict,
     z_scores: Dict,
@@ -140,7 +292,7 @@ def generate_growth_report_pdf(
         z_scores: {"waz": float, "haz": float, "whz": float, "baz": float, "hcz": float}
         classifications: {"status_gizi": str, "status_tinggi": str, etc.}
         recommendations: List of recommendation strings
-        chart_paths: List of chart image file paths
+        chart_paths: List of chart image file paths or PIL images
         
     Returns:
         Path to generated PDF file or None if failed
@@ -161,9 +313,10 @@ def generate_growth_report_pdf(
         filename = f"Laporan_Pertumbuhan_{child_name}_{timestamp}.pdf"
         filepath = os.path.join(OUTPUTS_DIR, filename)
         
-        # Create document
+        # Create document; built in memory and written to disk in one go
+        buf = io.BytesIO()
         doc = SimpleDocTemplate(
-            filepath,
+            buf,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -195,37 +348,13 @@ def generate_growth_report_pdf(
         ]
         
         child_table = Table(child_table_data, colWidths=[5*cm, 10*cm])
-        child_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f5f5f5')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e0e0e0'))
-        ]))
+        child_table.setStyle(CHILD_TABLE_STYLE)
         story.append(child_table)
         story.append(Spacer(1, 15))
         
         # === Z-SCORE RESULTS ===
         story.append(Paragraph("📈 Hasil Analisis Z-Score (WHO)", styles['SectionHeader']))
         
-        def format_zscore_cell(z: float) -> Tuple[str, colors.Color]:
-            if z is None:
-                return "-", colors.HexColor('#888888')
-            if z < -3:
-                return f"{z:.2f}", colors.HexColor('#b71c1c')
-            elif z < -2:
-                return f"{z:.2f}", colors.HexColor('#e65100')
-            elif z <= 2:
-                return f"{z:.2f}", colors.HexColor('#2e7d32')
-            elif z <= 3:
-                return f"{z:.2f}", colors.HexColor('#1565c0')
-            else:
-                return f"{z:.2f}", colors.HexColor('#6a1b9a')
-        
         zscore_data = [
             ["Indikator", "Z-Score", "Status"]
         ]
@@ -243,17 +372,7 @@ def generate_growth_report_pdf(
             zscore_data.append([name, z_text, status])
         
         zscore_table = Table(zscore_data, colWidths=[5*cm, 4*cm, 6*cm])
-        zscore_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1565c0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e0e0e0')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
-        ]))
+        zscore_table.setStyle(ZSCORE_TABLE_STYLE)
         story.append(zscore_table)
         story.append(Spacer(1, 15))
         
@@ -274,8 +393,9 @@ def generate_growth_report_pdf(
         # === RECOMMENDATIONS ===
         if recommendations:
             story.append(Paragraph("💡 Rekomendasi", styles['SectionHeader']))
-            for rec in recommendations:
-                story.append(Paragraph(f"• {rec}", styles['BodyText']))
+            # One paragraph for all bullets: a single markup parse and layout
+            bullets = "<br/>".join(f"• {rec}" for rec in recommendations)
+            story.append(Paragraph(bullets, styles['BodyText']))
             story.append(Spacer(1, 10))
         
         # === CHARTS (if available) ===
@@ -283,37 +403,27 @@ def generate_growth_report_pdf(
             story.append(PageBreak())
             story.append(Paragraph("📊 Grafik Pertumbuhan", styles['SectionHeader']))
             
-            for chart_path in chart_paths:
-                if os.path.exists(chart_path):
-                    try:
-                        img = Image(chart_path, width=16*cm, height=10*cm)
-                        story.append(img)
-                        story.append(Spacer(1, 10))
-                    except Exception as e:
-                        print(f"⚠️ Could not add chart {chart_path}: {e}")
-        
-        # === FOOTER ===
-        story.append(Spacer(1, 20))
-        story.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#e0e0e0')))
-        story.append(Paragraph(
-            f"Laporan ini dibuat oleh {APP_TITLE} | Kontak: {CONTACT_WA}",
-            styles['SmallText']
-        ))
-        story.append(Paragraph(
-            "⚠️ Laporan ini bukan pengganti konsultasi medis. "
-            "Selalu konsultasikan dengan tenaga kesehatan untuk evaluasi lebih lanjut.",
-            styles['SmallText']
-        ))
+            # Chart files are stat'ed and opened concurrently; order is kept
+            if len(chart_paths) > 1:
+                with ThreadPoolExecutor(max_workers=CHART_LOAD_WORKERS) as pool:
+                    chart_images = list(pool.map(_load_chart_image, chart_paths))
+            else:
+                chart_images = [_load_chart_image(chart) for chart in chart_paths]
+            
+            for image in chart_images:
+                if image is not None:
+                    story.append(image)
+                    story.append(Spacer(1, 10))
         
-        # Build PDF
-        doc.build(story)
+        # Build PDF (footer is stamped on every page by the page template)
+        doc.build(story, onFirstPage=_draw_report_page, onLaterPages=_draw_report_page)
+        _write_pdf(filepath, buf)
         
         print(f"✅ PDF generated: {filepath}")
         return filepath
         
     except Exception as e:
-        print(f"❌ Error generating PDF: {e}")
-        traceback.print_exc()
+        log_exception("generate_growth_report_pdf", e)
         return None
 
 
@@ -344,8 +454,9 @@ def generate_checklist_pdf(
         filename = f"Checklist_Bulan_{month}_{timestamp}.pdf"
         filepath = os.path.join(OUTPUTS_DIR, filename)
         
+        buf = io.BytesIO()
         doc = SimpleDocTemplate(
-            filepath,
+            buf,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -383,13 +494,13 @@ def generate_checklist_pdf(
         ))
         
         doc.build(story)
+        _write_pdf(filepath, buf)
         
         print(f"✅ Checklist PDF generated: {filepath}")
         return filepath
         
     except Exception as e:
-        print(f"❌ Error generating checklist PDF: {e}")
-        traceback.print_exc()
+        log_exception("generate_checklist_pdf", e)
         return None
 
 
@@ -397,6 +508,59 @@ def generate_checklist_pdf(
 # CSV EXPORT FUNCTIONS
 # ==============================================================================
 
+# Large exports go out in few big writes instead of 8 KiB chunks
+CSV_BUFFER_SIZE = 1 << 20
+
+# CSV header -> record key, in column order
+_GROWTH_CSV_COLUMNS = {
+    'Tanggal Pengukuran': 'tanggal',
+    'Usia (bulan)': 'usia_bulan',
+    'Berat Badan (kg)': 'bb',
+    'Tinggi Badan (cm)': 'tb',
+    'Lingkar Kepala (cm)': 'lk',
+    'WAZ': 'waz',
+    'HAZ': 'haz',
+    'WHZ': 'whz',
+    'Catatan': 'catatan',
+}
+
+_IMMUNIZATION_CSV_COLUMNS = {
+    'Usia (bulan)': 'usia',
+    'Nama Vaksin': 'vaksin',
+    'Status': 'status',
+    'Tanggal Pemberian': 'tanggal',
+    'Catatan': 'catatan',
+}
+
+_IMMUNIZATION_CSV_DEFAULTS = {'status': 'Belum'}
+
+
+def _write_dict_csv(
+    filepath: str,
+    columns: Dict[str, str],
+    records: List[Dict],
+    defaults: Optional[Dict] = None
+) -> None:
+    """
+    Write record dicts to CSV with a single DictWriter.writerows() call
+    
+    Args:
+        filepath: Output CSV path
+        columns: Ordered mapping of header -> record key
+        records: Row dicts; unknown keys are ignored, missing keys are empty
+        defaults: Per-key fallback values for missing keys
+    """
+    keys = list(columns.values())
+    if defaults:
+        records = ({**defaults, **record} for record in records)
+    
+    with open(filepath, 'w', newline='', encoding='utf-8',
+              buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.DictWriter(f, fieldnames=keys, restval='', extrasaction='ignore')
+        writer.writerow(dict(zip(keys, columns)))
+        writer.writerows(records)
+
+
 def export_growth_data_csv(data_list: List[Dict], child_name: str = "Anak") -> Optional[str]:
     """
     Export growth measurement data to CSV
@@ -415,45 +579,46 @@ def export_growth_data_csv(data_list: List[Dict], child_name: str = "Anak") -> O
         filename = f"Data_Pertumbuhan_{child_name.replace(' ', '_')}_{timestamp}.csv"
         filepath = os.path.join(OUTPUTS_DIR, filename)
         
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Header
-            writer.writerow([
-                'Tanggal Pengukuran',
-                'Usia (bulan)',
-                'Berat Badan (kg)',
-                'Tinggi Badan (cm)',
-                'Lingkar Kepala (cm)',
-                'WAZ',
-                'HAZ',
-                'WHZ',
-                'Catatan'
-            ])
-            
-            # Data rows
-            for data in data_list:
-                writer.writerow([
-                    data.get('tanggal', ''),
-                    data.get('usia_bulan', ''),
-                    data.get('bb', ''),
-                    data.get('tb', ''),
-                    data.get('lk', ''),
-                    data.get('waz', ''),
-                    data.get('haz', ''),
-                    data.get('whz', ''),
-                    data.get('catatan', '')
-                ])
+        _write_dict_csv(filepath, _GROWTH_CSV_COLUMNS, data_list)
         
         print(f"✅ CSV generated: {filepath}")
         return filepath
         
     except Exception as e:
-        print(f"❌ Error generating CSV: {e}")
-        traceback.print_exc()
+        log_exception("export_growth_data_csv", e)
         return None
 
 
+def write_columns_csv(filepath: str, columns: Dict[str, "np.ndarray"]) -> str:
+    """
+    Write column arrays to CSV without building a per-row DataFrame
+    
+    Numeric columns are stringified in one vectorized pass (NaN -> empty
+    cell) and the rows are streamed out with a single writerows() call.
+    
+    Args:
+        filepath: Output CSV path
+        columns: Ordered mapping of header -> 1-D array/sequence (equal lengths)
+        
+    Returns:
+        The filepath that was written
+    """
+    text_columns = []
+    for values in columns.values():
+        values = np.asarray(values)
+        if values.dtype.kind == 'f':
+            values = np.where(np.isnan(values), '', values.astype(str))
+        text_columns.append(values.astype(str))
+    
+    with open(filepath, 'w', newline='', encoding='utf-8',
+              buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*text_columns))
+    
+    return filepath
+
+
 def export_immunization_csv(immunization_data: List[Dict], child_name: str = "Anak") -> Optional[str]:
     """
     Export immunization record to CSV
@@ -472,32 +637,14 @@ def export_immunization_csv(immunization_data: List[Dict], child_name: str = "An
         filename = f"Imunisasi_{child_name.replace(' ', '_')}_{timestamp}.csv"
         filepath = os.path.join(OUTPUTS_DIR, filename)
         
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            writer.writerow([
-                'Usia (bulan)',
-                'Nama Vaksin',
-                'Status',
-                'Tanggal Pemberian',
-                'Catatan'
-            ])
-            
-            for record in immunization_data:
-                writer.writerow([
-                    record.get('usia', ''),
-                    record.get('vaksin', ''),
-                    record.get('status', 'Belum'),
-                    record.get('tanggal', ''),
-                    record.get('catatan', '')
-                ])
+        _write_dict_csv(filepath, _IMMUNIZATION_CSV_COLUMNS, immunization_data,
+                        defaults=_IMMUNIZATION_CSV_DEFAULTS)
         
         print(f"✅ Immunization CSV generated: {filepath}")
         return filepath
         
     except Exception as e:
-        print(f"❌ Error generating CSV: {e}")
-        traceback.print_exc()
+        log_exception("export_immunization_csv", e)
         return None
 
 
@@ -7,12 +7,22 @@
 #==============================================================================
 """
 
+import re
 import math
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
 import random
+import calendar
+import itertools
+import threading
 from datetime import datetime, date
 from typing import Optional, Any, Tuple, List
 from functools import lru_cache
-from scipy.special import erf
+
+import numpy as np
 
 import sys
 import os
@@ -20,10 +30,63 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import MOTIVATIONAL_QUOTES, BOUNDS
 
+# ==============================================================================
+# ERROR LOGGING
+# ==============================================================================
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting (incl. tracebacks) to the listener"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Handlers only enqueue records; a background listener formats and writes them
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger = logging.getLogger("anthrohpk")
+logger.setLevel(logging.INFO)
+logger.addHandler(_DeferredQueueHandler(_log_queue))
+logger.propagate = False
+
+# Identical (handler, exception type) tracebacks are logged once per window
+TRACEBACK_WINDOW_SECONDS = 60.0
+_last_traceback: dict = {}
+_traceback_lock = threading.Lock()
+
+
+def log_exception(handler_name: str, error: Exception) -> None:
+    """
+    Log a handler exception without blocking the request thread
+    
+    The full traceback is attached at most once per TRACEBACK_WINDOW_SECONDS
+    for each (handler, exception type); repeats only log the message.
+    
+    Args:
+        handler_name: Name of the failing handler
+        error: Caught exception
+    """
+    key = (handler_name, type(error).__name__)
+    now = time.monotonic()
+    with _traceback_lock:
+        with_traceback = now - _last_traceback.get(key, -TRACEBACK_WINDOW_SECONDS) >= TRACEBACK_WINDOW_SECONDS
+        if with_traceback:
+            _last_traceback[key] = now
+    
+    logger.error(f"❌ Error in {handler_name}: {error}", exc_info=error if with_traceback else None)
+
+
 # ==============================================================================
 # TYPE CONVERSION UTILITIES
 # ==============================================================================
 
+# Plain decimal / scientific numbers; blank and invalid input never reach float()
+_NUMBER_RE = re.compile(r'^[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?$')
+
+
 def as_float(x: Any) -> Optional[float]:
     """
     Safely convert any input to float
@@ -38,12 +101,16 @@ def as_float(x: Any) -> Optional[float]:
         return None
     if isinstance(x, (int, float)):
         return float(x)
-    try:
-        # Handle comma as decimal separator (Indonesian format)
-        clean_str = str(x).replace(",", ".").strip()
-        return float(clean_str)
-    except (ValueError, AttributeError):
+    
+    # Handle comma as decimal separator (Indonesian format)
+    clean_str = str(x).replace(",", ".").strip()
+    if not clean_str or not _NUMBER_RE.match(clean_str):
         return None
+    return float(clean_str)
+
+
+_ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+_DMY_DATE_RE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$')
 
 
 def parse_date(date_str: str) -> Optional[date]:
@@ -60,30 +127,27 @@ def parse_date(date_str: str) -> Optional[date]:
     Returns:
         datetime.date object or None if parsing fails
     """
-    if not date_str or str(date_str).strip() == "":
+    if not date_str:
         return None
     
     s = str(date_str).strip()
     
-    # Try ISO format (YYYY-MM-DD)
-    try:
-        parts = s.split("-")
-        if len(parts) == 3:
-            y, m, d = int(parts[0]), int(parts[1]), int(parts[2])
-            return date(y, m, d)
-    except (ValueError, IndexError):
-        pass
-    
-    # Try Indonesian format (DD/MM/YYYY)
-    try:
-        parts = s.split("/")
-        if len(parts) == 3:
-            d, m, y = int(parts[0]), int(parts[1]), int(parts[2])
-            return date(y, m, d)
-    except (ValueError, IndexError):
-        pass
+    match = _ISO_DATE_RE.match(s)
+    if match:
+        y, m, d = match.groups()
+    else:
+        match = _DMY_DATE_RE.match(s)
+        if not match:
+            return None
+        d, m, y = match.groups()
     
-    return None
+    y, m, d = int(y), int(m), int(d)
+    
+    # Reject impossible calendar dates without raising
+    if y < 1 or not 1 <= m <= 12 or not 1 <= d <= calendar.monthrange(y, m)[1]:
+        return None
+    
+    return date(y, m, d)
 
 
 # ==============================================================================
@@ -219,7 +283,7 @@ def z_to_percentile(z_score: Optional[float]) -> Optional[float]:
         
         # Standard normal cumulative distribution function
         # Φ(z) = 0.5 * (1 + erf(z/√2))
-        percentile = 0.5 * (1.0 + erf(z / math.sqrt(2.0))) * 100.0
+        percentile = 0.5 * (1.0 + math.erf(z / math.sqrt(2.0))) * 100.0
         
         return round(percentile, 1)
     except Exception:
@@ -362,13 +426,80 @@ def validate_anthropometry(age_mo: Optional[float],
     return errors, warnings
 
 
+# Warning bit flags returned per row by validate_anthropometry_vec()
+ANTHRO_WARN_AGE_OVER_60 = 1
+ANTHRO_WARN_WEIGHT_LOW = 2
+ANTHRO_WARN_WEIGHT_HIGH = 4
+ANTHRO_WARN_HEIGHT_LOW = 8
+ANTHRO_WARN_HEIGHT_HIGH = 16
+ANTHRO_WARN_HC_LOW = 32
+ANTHRO_WARN_HC_HIGH = 64
+
+
+def validate_anthropometry_vec(age_mo: np.ndarray,
+                               weight: np.ndarray,
+                               height: np.ndarray,
+                               head_circ: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized validate_anthropometry() for batch (CSV) input
+    
+    Uses the same plausibility ranges as the scalar version; NaN means
+    the measurement is missing and is not checked.
+    
+    Args:
+        age_mo: Array of ages in months
+        weight: Array of weights in kg
+        height: Array of heights/lengths in cm
+        head_circ: Array of head circumferences in cm
+        
+    Returns:
+        Tuple of (invalid_mask, warning_codes) where warning_codes is an
+        int array of ANTHRO_WARN_* bit flags per row
+    """
+    age_mo = np.asarray(age_mo, dtype=np.float64)
+    weight = np.asarray(weight, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    head_circ = np.asarray(head_circ, dtype=np.float64)
+    
+    # NaN compares False, so missing values never trigger a check
+    invalid = np.logical_or.reduce([
+        age_mo < 0,
+        weight < 1.0, weight > 30.0,
+        height < 35, height > 130,
+        head_circ < 20, head_circ > 60,
+    ])
+    
+    weight_ok = (weight >= 1.0) & (weight <= 30.0)
+    height_ok = (height >= 35) & (height <= 130)
+    hc_ok = (head_circ >= 20) & (head_circ <= 60)
+    
+    warning_codes = (
+        (age_mo > 60) * ANTHRO_WARN_AGE_OVER_60
+        | (weight_ok & (weight < 2.0)) * ANTHRO_WARN_WEIGHT_LOW
+        | (weight_ok & (weight > 25.0)) * ANTHRO_WARN_WEIGHT_HIGH
+        | (height_ok & (height < 45)) * ANTHRO_WARN_HEIGHT_LOW
+        | (height_ok & (height > 120)) * ANTHRO_WARN_HEIGHT_HIGH
+        | (hc_ok & (head_circ < 30)) * ANTHRO_WARN_HC_LOW
+        | (hc_ok & (head_circ > 55)) * ANTHRO_WARN_HC_HIGH
+    ).astype(np.int16)
+    
+    return invalid, warning_codes
+
+
 # ==============================================================================
 # MISC UTILITIES
 # ==============================================================================
 
+# Quotes shuffled once at import and then served round-robin
+_QUOTE_ORDER = random.sample(MOTIVATIONAL_QUOTES, len(MOTIVATIONAL_QUOTES))
+_QUOTE_CYCLE = itertools.cycle(_QUOTE_ORDER)
+_quote_lock = threading.Lock()
+
+
 def get_random_quote() -> str:
-    """Get random motivational quote for parents"""
-    return random.choice(MOTIVATIONAL_QUOTES)
+    """Get next motivational quote for parents (shuffled rotation)"""
+    with _quote_lock:
+        return next(_QUOTE_CYCLE)
 
 
 def get_sex_code(sex_text: str) -> str:
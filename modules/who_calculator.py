@@ -8,15 +8,19 @@
 """
 
 import math
+from bisect import bisect_left, bisect_right
 import traceback
-from typing import Dict, Optional
-from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+from functools import lru_cache, partial
+
+import numpy as np
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import CALC_CONFIG
+from config import CALC_CONFIG, BOUNDS
+from modules.utilities import format_zscore
 
 # ==============================================================================
 # WHO CALCULATOR INITIALIZATION
@@ -51,37 +55,133 @@ def is_calculator_available() -> bool:
 
 
 # ==============================================================================
-# SAFE Z-SCORE CALCULATION
+# WHO LMS TABLES (PRELOADED)
 # ==============================================================================
 
-def _safe_z_calc(calc_func, *args) -> Optional[float]:
+# Table step sizes: age tables are keyed per week/month, length/height
+# tables per half centimetre
+_LMS_TABLE_STEPS = {'Month': 1.0, 'Week': 1.0, 'Length': 0.5, 'Height': 0.5}
+_LMS_SEX_CODES = {'boys': 'M', 'girls': 'F'}
+
+# (indicator, sex, age_group) -> (first_key, step, array of L, M, S rows)
+# e.g. LMS_TABLES[('wfa', 'M', '0_5')][2][12] -> L, M, S for boys at 12 months
+LMS_TABLES: Dict[Tuple[str, str, str], Tuple[float, float, np.ndarray]] = {}
+
+
+def _build_lms_tables() -> None:
+    """Convert every table loaded by pygrowup into a contiguous LMS array"""
+    for table_name, table in vars(calc).items():
+        if not isinstance(table, dict) or 'field_name' not in table:
+            continue
+        
+        indicator, sex_name, age_group = table_name.split('_', 2)
+        step = _LMS_TABLE_STEPS[table['field_name']]
+        rows = sorted(
+            (float(key), float(row['L']), float(row['M']), float(row['S']))
+            for key, row in table.items() if key != 'field_name'
+        )
+        start = rows[0][0]
+        lms = np.full((int(round((rows[-1][0] - start) / step)) + 1, 3), np.nan)
+        for key, L, M, S in rows:
+            lms[int(round((key - start) / step))] = (L, M, S)
+        
+        LMS_TABLES[(indicator, _LMS_SEX_CODES[sex_name], age_group)] = (start, step, lms)
+
+
+if calc is not None:
+    try:
+        _build_lms_tables()
+    except Exception as e:
+        print(f"⚠️ LMS table preload error: {e}")
+        traceback.print_exc()
+        LMS_TABLES.clear()
+
+
+# Oldest age (months) with a BMI-for-age table; pygrowup sends older
+# children to the (unloaded) 2-20 year table, so they get no BAZ
+BMIFA_MAX_AGE_MONTHS = 60
+
+
+def _resolve_lms_key(indicator: str,
+                     age_months: float,
+                     sex: str,
+                     height: Optional[float] = None) -> Optional[Tuple[Tuple[str, str, str], float]]:
+    """
+    Pick the WHO table and lookup key for one observation (pygrowup rules)
+    
+    age_months must be the measured age, not one floored to the table
+    month: the BMIFA_MAX_AGE_MONTHS limit is checked on it.
+    
+    Returns:
+        Tuple of (table_key, key) or None if outside the WHO tables
+    """
+    if indicator == 'wfl':
+        if height is None or not 45 <= height <= 120:
+            return None
+        key = math.floor(height * 2 + 0.5) / 2
+        if height > 86:
+            return ('wfh', sex, '2_5'), key
+        return ('wfl', sex, '0_2'), key
+    
+    age_weeks = age_months * 30.4374 / 7
+    if age_months <= 3 and age_weeks <= 13:
+        return (indicator, sex, '0_13'), math.floor(age_weeks)
+    
+    if indicator == 'bmifa':
+        if age_months > BMIFA_MAX_AGE_MONTHS:
+            return None
+        age_group = '0_2' if age_months < 24 else '2_5'
+    else:
+        age_group = '0_5'
+    return (indicator, sex, age_group), math.floor(age_months)
+
+
+def _zscore_lms(indicator: str,
+                measurement: float,
+                age_months: float,
+                sex: str,
+                height: Optional[float] = None) -> Optional[float]:
     """
-    Safely call WHO calculator function with error handling
+    Z-score from the preloaded LMS tables: z = ((y/M)^L - 1) / (S*L)
     
     Args:
-        calc_func: Calculator method to call
-        *args: Arguments to pass to the calculator
+        indicator: 'wfa', 'lhfa', 'wfl', 'bmifa' or 'hcfa'
+        measurement: Measurement value
+        age_months: Age in months
+        sex: 'M' or 'F'
+        height: Length/height in cm (only used by 'wfl')
         
     Returns:
-        Z-score float or None if calculation fails
+        Z-score rounded to 0.01 or None if not computable
     """
-    if calc is None:
-        return None
-    
     try:
-        z = calc_func(*args)
+        if measurement <= 0:
+            return None
         
-        if z is None:
+        resolved = _resolve_lms_key(indicator, age_months, sex.upper(), height)
+        if resolved is None:
             return None
         
-        z_float = float(z)
+        table_key, key = resolved
+        table = LMS_TABLES.get(table_key)
+        if table is None:
+            return None
         
-        # Check for invalid values (NaN or Inf)
-        if math.isnan(z_float) or math.isinf(z_float):
+        start, step, lms = table
+        idx = int(round((key - start) / step))
+        if not 0 <= idx < lms.shape[0]:
             return None
         
-        return z_float
-    except Exception:
+        L, M, S = lms[idx].tolist()
+        if L == 0:
+            z = math.log(measurement / M) / S
+        else:
+            z = ((measurement / M) ** L - 1) / (S * L)
+        
+        if not math.isfinite(z):
+            return None
+        return round(z, 2)
+    except (TypeError, ValueError, OverflowError, ZeroDivisionError, AttributeError):
         return None
 
 
@@ -89,6 +189,51 @@ def _safe_z_calc(calc_func, *args) -> Optional[float]:
 # Z-SCORE CALCULATIONS
 # ==============================================================================
 
+# Sex index by initial (M/L = male, F/P = female, as in the batch path) and
+# the LMS table code per index
+_SEX_IDX = {'M': 0, 'L': 0, 'F': 1, 'P': 1}
+SEX_CODES = ('M', 'F')
+
+class ZScores(NamedTuple):
+    """All WHO z-scores of one child (None = not computable)"""
+    waz: Optional[float]
+    haz: Optional[float]
+    whz: Optional[float]
+    baz: Optional[float]
+    hcz: Optional[float]
+
+
+# Output keys of calculate_all_zscores, in order
+ZSCORE_KEYS = ZScores._fields
+
+_NO_ZSCORES = ZScores(None, None, None, None, None)
+
+# Classifiers and validate_zscores take either form
+ZScoreInput = Union[ZScores, Dict[str, Optional[float]]]
+
+# Distinct (sex, age, measurements) inputs remembered by calculate_all_zscores
+ZSCORE_CACHE_SIZE = 4096
+
+# From this age on every table is keyed by whole month (see _resolve_lms_key)
+MONTHLY_TABLES_FROM_MONTHS = 3
+
+
+def _age_lookup_months(age_months: float) -> float:
+    """
+    Age as the WHO tables see it: floored to whole months from 3 to 60 months
+    
+    Within that range flooring picks the same rows and age groups, so ages
+    like 14.37 and 14.81 share one cache entry. Younger ages stay exact
+    since the weekly 0-13 tables depend on the precise age, and older ones
+    because the BMI table ends at BMIFA_MAX_AGE_MONTHS (60.5 would floor to
+    a valid 60).
+    """
+    if (isinstance(age_months, (int, float))
+            and MONTHLY_TABLES_FROM_MONTHS <= age_months <= BMIFA_MAX_AGE_MONTHS):
+        return float(math.floor(age_months))
+    return age_months
+
+
 def calculate_all_zscores(sex: str, 
                           age_months: float, 
                           weight: Optional[float], 
@@ -97,8 +242,13 @@ def calculate_all_zscores(sex: str,
     """
     Calculate all WHO z-scores for a child
     
+    Repeated inputs are served from an LRU cache; each call returns a new dict.
+    From 3 to 60 months the age is floored to whole months before the
+    lookup, exactly as the WHO tables do, so fractional ages of the same
+    month share a cache entry.
+    
     Args:
-        sex: 'M' (male) or 'F' (female)
+        sex: 'M'/'L' (male) or 'F'/'P' (female); case and full words are accepted
         age_months: Age in months
         weight: Weight in kg
         height: Height/length in cm
@@ -112,282 +262,619 @@ def calculate_all_zscores(sex: str,
             - baz: BMI-for-Age Z-score
             - hcz: Head Circumference-for-Age Z-score
     """
-    results = {
-        'waz': None,
-        'haz': None,
-        'whz': None,
-        'baz': None,
-        'hcz': None
-    }
+    return calculate_zscores(sex, age_months, weight, height, head_circ)._asdict()
+
+
+def calculate_zscores(sex: str,
+                      age_months: float,
+                      weight: Optional[float],
+                      height: Optional[float],
+                      head_circ: Optional[float]) -> ZScores:
+    """
+    calculate_all_zscores returning the (immutable, cached) ZScores tuple
+    
+    The classifiers and validate_zscores accept it directly; use ._asdict()
+    where a dict is needed (JSON, chart payloads).
+    """
+    sex_i = _SEX_IDX.get(sex.strip()[:1].upper()) if isinstance(sex, str) else None
+    if sex_i is None or not LMS_TABLES:
+        return _NO_ZSCORES
     
-    if calc is None:
-        return results
+    return _calculate_zscores_cached(sex_i, _age_lookup_months(age_months),
+                                     weight, height, head_circ)
+
+
+@lru_cache(maxsize=ZSCORE_CACHE_SIZE)
+def _calculate_zscores_cached(sex_i: int,
+                              age_months: float,
+                              weight: Optional[float],
+                              height: Optional[float],
+                              head_circ: Optional[float]) -> ZScores:
+    """Z-scores of one child (a tuple, so cached entries can't be mutated)"""
+    sex = SEX_CODES[sex_i]
+    waz = haz = whz = baz = hcz = None
     
     # Weight-for-Age (WAZ)
     if weight is not None:
-        results['waz'] = _safe_z_calc(calc.wfa, weight, age_months, sex)
+        waz = _zscore_lms('wfa', weight, age_months, sex)
     
     # Height-for-Age (HAZ) / Length-for-Age (LAZ)
     if height is not None:
-        results['haz'] = _safe_z_calc(calc.lhfa, height, age_months, sex)
+        haz = _zscore_lms('lhfa', height, age_months, sex)
     
     # Weight-for-Height (WHZ) / Weight-for-Length (WFL)
     if weight is not None and height is not None:
-        results['whz'] = _safe_z_calc(calc.wfl, weight, age_months, sex, height)
+        whz = _zscore_lms('wfl', weight, age_months, sex, height)
     
     # BMI-for-Age (BAZ)
     if weight is not None and height is not None and height > 0:
-        bmi = weight / ((height / 100) ** 2)
-        results['baz'] = _safe_z_calc(calc.bmifa, bmi, age_months, sex)
+        h_m = height * 0.01
+        bmi = weight / (h_m * h_m)
+        baz = _zscore_lms('bmifa', bmi, age_months, sex)
     
     # Head Circumference-for-Age (HCZ)
     if head_circ is not None:
-        results['hcz'] = _safe_z_calc(calc.hcfa, head_circ, age_months, sex)
+        hcz = _zscore_lms('hcfa', head_circ, age_months, sex)
+    
+    return ZScores(waz, haz, whz, baz, hcz)
+
+
+# ==============================================================================
+# VECTORIZED Z-SCORE CALCULATIONS (BATCH MODE)
+# ==============================================================================
+
+def _lookup_lms(table_key: Tuple[str, str, str], keys: np.ndarray) -> np.ndarray:
+    """
+    Gather L, M, S rows for an array of table keys (NaN where not found)
+    """
+    out = np.full((keys.shape[0], 3), np.nan)
+    table = LMS_TABLES.get(table_key)
+    
+    if table is None or keys.shape[0] == 0:
+        return out
+    
+    start, step, lms = table
+    with np.errstate(invalid='ignore'):
+        idx = np.rint((keys - start) / step)
+    valid = np.isfinite(idx) & (idx >= 0) & (idx < lms.shape[0])
+    out[valid] = lms[idx[valid].astype(np.intp)]
+    return out
+
+
+def _lms_rows_vec(indicator: str,
+                  age_months: np.ndarray,
+                  sex: np.ndarray,
+                  height: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Gather the L, M, S row of every observation (pygrowup table selection rules)
+    
+    Args:
+        indicator: 'wfa', 'lhfa', 'wfl', 'bmifa' or 'hcfa'
+        age_months: Ages in months
+        sex: Array of 'M'/'F' codes
+        height: Length/height in cm (only used by 'wfl')
+        
+    Returns:
+        Array of shape (n, 3) with L, M, S columns (NaN outside the WHO tables)
+    """
+    n = age_months.shape[0]
+    lms = np.full((n, 3), np.nan)
+    
+    age_weeks = age_months * 30.4374 / 7
+    use_weeks = (age_months <= 3) & (age_weeks <= 13)
+    week_keys = np.floor(age_weeks)
+    month_keys = np.floor(age_months)
+    
+    for sex_code in ('M', 'F'):
+        is_sex = sex == sex_code
+        
+        if indicator == 'wfl':
+            # Recumbent length table up to 86 cm, standing height table above
+            in_range = (height >= 45) & (height <= 120)
+            length_keys = np.floor(height * 2 + 0.5) / 2
+            tall = height > 86
+            groups = (
+                (('wfl', sex_code, '0_2'), is_sex & in_range & ~tall, length_keys),
+                (('wfh', sex_code, '2_5'), is_sex & in_range & tall, length_keys),
+            )
+        elif indicator == 'bmifa':
+            groups = (
+                (('bmifa', sex_code, '0_13'), is_sex & use_weeks, week_keys),
+                (('bmifa', sex_code, '0_2'), is_sex & ~use_weeks & (age_months < 24), month_keys),
+                (('bmifa', sex_code, '2_5'), is_sex & (age_months >= 24) & (age_months <= BMIFA_MAX_AGE_MONTHS),
+                 month_keys),
+            )
+        else:
+            groups = (
+                ((indicator, sex_code, '0_13'), is_sex & use_weeks, week_keys),
+                ((indicator, sex_code, '0_5'), is_sex & ~use_weeks, month_keys),
+            )
+        
+        for table_key, mask, keys in groups:
+            if mask.any():
+                lms[mask] = _lookup_lms(table_key, keys[mask])
+    
+    return lms
+
+
+def _zscore_vec(indicator: str,
+                measurement: np.ndarray,
+                age_months: np.ndarray,
+                sex: np.ndarray,
+                height: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vectorized LMS z-score using the same table selection rules as pygrowup
+    
+    Args:
+        indicator: 'wfa', 'lhfa', 'wfl', 'bmifa' or 'hcfa'
+        measurement: Measurement values
+        age_months: Ages in months
+        sex: Array of 'M'/'F' codes
+        height: Length/height in cm (only used by 'wfl')
+        
+    Returns:
+        Array of z-scores rounded to 0.01 (NaN where not computable)
+    """
+    lms = _lms_rows_vec(indicator, age_months, sex, height)
+    L, M, S = lms[:, 0], lms[:, 1], lms[:, 2]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = np.where(measurement > 0, measurement, np.nan)
+        safe_L = np.where(L == 0, 1.0, L)
+        z = np.where(
+            L == 0,
+            np.log(y / M) / S,
+            ((y / M) ** safe_L - 1) / (S * safe_L)
+        )
+    
+    z[~np.isfinite(z)] = np.nan
+    return np.round(z, 2)
+
+
+def calculate_all_zscores_vec(weights,
+                              heights,
+                              head_circs,
+                              age_months,
+                              sex) -> Dict[str, np.ndarray]:
+    """
+    Calculate all WHO z-scores for many children at once
+    
+    Args:
+        weights: Array of weights in kg (NaN for missing)
+        heights: Array of heights/lengths in cm (NaN for missing)
+        head_circs: Array of head circumferences in cm (NaN for missing)
+        age_months: Array of ages in months
+        sex: Array of sex codes/texts ('M'/'F', 'Laki-laki'/'Perempuan'),
+            integer sex indices (0 = male, 1 = female) or a single value
+        
+    Returns:
+        Dictionary with keys waz, haz, whz, baz, hcz holding float arrays (NaN = not available)
+    """
+    w = np.asarray(weights, dtype=np.float64).ravel()
+    n = w.shape[0]
+    h = np.broadcast_to(np.asarray(heights, dtype=np.float64).ravel(), (n,))
+    hc = np.broadcast_to(np.asarray(head_circs, dtype=np.float64).ravel(), (n,))
+    age = np.broadcast_to(np.asarray(age_months, dtype=np.float64).ravel(), (n,))
+    
+    sex = np.asarray(sex).ravel()
+    if sex.dtype.kind in 'iu':
+        is_male = sex == 0
+    else:
+        sex_text = np.char.upper(np.char.strip(sex.astype(str)))
+        is_male = np.char.startswith(sex_text, 'M') | np.char.startswith(sex_text, 'L')
+    sex_codes = np.broadcast_to(np.where(is_male, 'M', 'F'), (n,))
+    
+    if not LMS_TABLES:
+        empty = np.full(n, np.nan)
+        return {key: empty.copy() for key in ('waz', 'haz', 'whz', 'baz', 'hcz')}
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bmi = w / (h * 0.0001 * h)
+    
+    return {
+        'waz': _zscore_vec('wfa', w, age, sex_codes),
+        'haz': _zscore_vec('lhfa', h, age, sex_codes),
+        'whz': _zscore_vec('wfl', w, age, sex_codes, height=h),
+        'baz': _zscore_vec('bmifa', bmi, age, sex_codes),
+        'hcz': _zscore_vec('hcfa', hc, age, sex_codes),
+    }
+
+
+def calculate_all_zscores_batch(sex,
+                                age_months,
+                                weight,
+                                height,
+                                head_circ) -> Dict[str, np.ndarray]:
+    """
+    Batch counterpart of calculate_all_zscores (same argument order)
     
-    return results
+    Args:
+        sex: Sex codes/texts or integer indices (0 = male, 1 = female), per child or one value
+        age_months: Ages in months
+        weight: Weights in kg (NaN for missing)
+        height: Heights/lengths in cm (NaN for missing)
+        head_circ: Head circumferences in cm (NaN for missing)
+        
+    Returns:
+        Dictionary with keys waz, haz, whz, baz, hcz holding float arrays (NaN = not available)
+    """
+    return calculate_all_zscores_vec(weight, height, head_circ, age_months, sex)
 
 
 # ==============================================================================
 # PERMENKES RI 2020 CLASSIFICATION
 # ==============================================================================
 
-def classify_permenkes_2020(z_scores: Dict[str, Optional[float]]) -> Dict[str, str]:
+def classify_permenkes_2020(z_scores: ZScoreInput) -> Dict[str, str]:
     """
     Classify nutritional status according to Permenkes RI No. 2 Tahun 2020
     
     Args:
-        z_scores: Dictionary of z-scores from calculate_all_zscores()
+        z_scores: Z-scores from calculate_all_zscores() (dict) or calculate_zscores()
         
     Returns:
         Dictionary with Permenkes classifications for each index
     """
-    classifications = {}
+    return _classify(z_scores, PERMENKES_TABLE, _ALL_NA_PERMENKES)
+
+
+# Category boundaries per index as (threshold, inclusive); a z-score moves
+# past a boundary when z >= threshold (strict "<" rule) or z > threshold
+# (inclusive "<=" rule), matching the if/elif ladders of the scalar classifiers
+CLASSIFY_BOUNDS = {
+    'waz': ((-3, False), (-2, False), (2, True)),
+    'haz': ((-3, False), (-2, False), (3, True)),
+    'whz': ((-3, False), (-2, False), (2, True), (3, True)),
+    'baz': ((-3, False), (-2, False), (1, True), (2, True), (3, True)),
+    'hcz': ((-2, False), (2, True)),
+}
+
+# CLASSIFY_BOUNDS split into sorted (strict, inclusive) threshold tuples for
+# bisect, plus the same thresholds as arrays for np.searchsorted
+CLASSIFY_EDGES = {
+    index: (
+        tuple(float(t) for t, inclusive in bounds if not inclusive),
+        tuple(float(t) for t, inclusive in bounds if inclusive),
+    )
+    for index, bounds in CLASSIFY_BOUNDS.items()
+}
+_CLASSIFY_EDGE_ARRAYS = {
+    index: (np.array(strict, dtype=np.float64), np.array(inclusive, dtype=np.float64))
+    for index, (strict, inclusive) in CLASSIFY_EDGES.items()
+}
+
+# Labels per category code; the trailing entry is used for missing data
+PERMENKES_LABELS = {
+    'waz': ("Berat Badan Sangat Kurang", "Berat Badan Kurang", "Berat Badan Normal",
+            "Risiko Berat Badan Lebih", "Data Tidak Tersedia"),
+    'haz': ("Sangat Pendek (Severely Stunted)", "Pendek (Stunted)", "Tinggi Badan Normal",
+            "Tinggi Badan Berlebih", "Data Tidak Tersedia"),
+    'whz': ("Gizi Buruk (Severely Wasted)", "Gizi Kurang (Wasted)", "Gizi Baik (Normal)",
+            "Berisiko Gizi Lebih (Possible Risk of Overweight)", "Gizi Lebih (Overweight)",
+            "Data Tidak Tersedia"),
+    'baz': ("Gizi Buruk (Severely Wasted)", "Gizi Kurang (Wasted)", "Gizi Baik (Normal)",
+            "Berisiko Gizi Lebih (Possible Risk of Overweight)", "Gizi Lebih (Overweight)",
+            "Obesitas (Obese)", "Data Tidak Tersedia"),
+    'hcz': ("Mikrosefali (perlu evaluasi)", "Normal", "Makrosefali (perlu evaluasi)",
+            "Data Tidak Tersedia"),
+}
+
+WHO_LABELS = {
+    'waz': ("Severely underweight", "Underweight", "Normal weight", "Overweight", "N/A"),
+    'haz': ("Severely stunted", "Stunted", "Normal height", "Tall", "N/A"),
+    'whz': ("Severely wasted", "Wasted", "Normal", "Risk of overweight", "Overweight", "N/A"),
+    'baz': ("Severely wasted", "Wasted", "Normal", "Risk of overweight", "Overweight",
+            "Obese", "N/A"),
+    'hcz': ("Microcephaly", "Normal", "Macrocephaly", "N/A"),
+}
+
+
+# index -> (strict edges, inclusive edges, labels) for _classify; the hcz
+# "abs(z) <= 2" rule is just the (-2 strict, 2 inclusive) edge pair
+PERMENKES_TABLE = {
+    index: CLASSIFY_EDGES[index] + (labels,) for index, labels in PERMENKES_LABELS.items()
+}
+WHO_TABLE = {
+    index: CLASSIFY_EDGES[index] + (labels,) for index, labels in WHO_LABELS.items()
+}
+
+# Results when no z-score is available (failed entry); callers get copies
+_ALL_NA_PERMENKES = {index: labels[-1] for index, labels in PERMENKES_LABELS.items()}
+_ALL_NA_WHO = {index: labels[-1] for index, labels in WHO_LABELS.items()}
+
+
+def classify_codes_vec(values: np.ndarray, index: str) -> np.ndarray:
+    """
+    Map z-scores to integer category codes for one index
     
-    # Weight-for-Age (BB/U)
-    waz = z_scores.get('waz')
-    if waz is not None and not math.isnan(waz):
-        if waz < -3:
-            classifications['waz'] = "Berat Badan Sangat Kurang"
-        elif waz < -2:
-            classifications['waz'] = "Berat Badan Kurang"
-        elif waz <= 2:
-            classifications['waz'] = "Berat Badan Normal"
-        else:
-            classifications['waz'] = "Risiko Berat Badan Lebih"
-    else:
-        classifications['waz'] = "Data Tidak Tersedia"
-    
-    # Height-for-Age (TB/U)
-    haz = z_scores.get('haz')
-    if haz is not None and not math.isnan(haz):
-        if haz < -3:
-            classifications['haz'] = "Sangat Pendek (Severely Stunted)"
-        elif haz < -2:
-            classifications['haz'] = "Pendek (Stunted)"
-        elif haz <= 3:
-            classifications['haz'] = "Tinggi Badan Normal"
-        else:
-            classifications['haz'] = "Tinggi Badan Berlebih"
-    else:
-        classifications['haz'] = "Data Tidak Tersedia"
-    
-    # Weight-for-Height (BB/TB)
-    whz = z_scores.get('whz')
-    if whz is not None and not math.isnan(whz):
-        if whz < -3:
-            classifications['whz'] = "Gizi Buruk (Severely Wasted)"
-        elif whz < -2:
-            classifications['whz'] = "Gizi Kurang (Wasted)"
-        elif whz <= 2:
-            classifications['whz'] = "Gizi Baik (Normal)"
-        elif whz <= 3:
-            classifications['whz'] = "Berisiko Gizi Lebih (Possible Risk of Overweight)"
-        else:
-            classifications['whz'] = "Gizi Lebih (Overweight)"
-    else:
-        classifications['whz'] = "Data Tidak Tersedia"
-    
-    # BMI-for-Age (IMT/U)
-    baz = z_scores.get('baz')
-    if baz is not None and not math.isnan(baz):
-        if baz < -3:
-            classifications['baz'] = "Gizi Buruk (Severely Wasted)"
-        elif baz < -2:
-            classifications['baz'] = "Gizi Kurang (Wasted)"
-        elif baz <= 1:
-            classifications['baz'] = "Gizi Baik (Normal)"
-        elif baz <= 2:
-            classifications['baz'] = "Berisiko Gizi Lebih (Possible Risk of Overweight)"
-        elif baz <= 3:
-            classifications['baz'] = "Gizi Lebih (Overweight)"
-        else:
-            classifications['baz'] = "Obesitas (Obese)"
-    else:
-        classifications['baz'] = "Data Tidak Tersedia"
-    
-    # Head Circumference-for-Age (LK/U)
-    hcz = z_scores.get('hcz')
-    if hcz is not None and not math.isnan(hcz):
-        if abs(hcz) <= 2:
-            classifications['hcz'] = "Normal"
-        elif hcz < -2:
-            classifications['hcz'] = "Mikrosefali (perlu evaluasi)"
-        else:
-            classifications['hcz'] = "Makrosefali (perlu evaluasi)"
+    Args:
+        values: Array of z-scores (NaN = missing)
+        index: Index key ('waz', 'haz', 'whz', 'baz', 'hcz')
+        
+    Returns:
+        int8 array of category codes, -1 for missing values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    strict, inclusive = _CLASSIFY_EDGE_ARRAYS[index]
+    # Boundaries passed: thresholds <= z (strict rule) plus thresholds < z (inclusive)
+    codes = (np.searchsorted(strict, values, side='right')
+             + np.searchsorted(inclusive, values, side='left')).astype(np.int8)
+    codes[np.isnan(values)] = -1
+    return codes
+
+
+def classify_code(z: Optional[float], index: str) -> int:
+    """
+    Map one z-score to its integer category code (scalar classify_codes_vec)
+    
+    Args:
+        z: Z-score (None or NaN = missing)
+        index: Index key ('waz', 'haz', 'whz', 'baz', 'hcz')
+        
+    Returns:
+        Category code, -1 for missing values
+    """
+    # z != z is the NaN test without a math.isnan call
+    if z is None or z != z:
+        return -1
+    strict, inclusive = CLASSIFY_EDGES[index]
+    # bisect_right counts strict edges <= z (z == -2 leaves "< -2"), bisect_left
+    # counts inclusive edges < z (z == 2 stays in "<= 2")
+    return bisect_right(strict, z) + bisect_left(inclusive, z)
+
+
+def _classify(z_scores: ZScoreInput,
+              table: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[str, ...]]],
+              all_missing: Dict[str, str]) -> Dict[str, str]:
+    """
+    Table-driven classifier shared by every standard
+    
+    Args:
+        z_scores: Z-scores from calculate_all_zscores() (dict) or calculate_zscores()
+        table: index -> (strict edges, inclusive edges, labels), e.g. PERMENKES_TABLE
+        all_missing: The table's result when every z-score is None, e.g. _ALL_NA_PERMENKES
+        
+    Returns:
+        Dictionary with one label per index (the trailing label for missing data)
+    """
+    # Tables list their indices in ZSCORE_KEYS order, matching ZScores fields
+    if isinstance(z_scores, ZScores):
+        z_values = z_scores
     else:
-        classifications['hcz'] = "Data Tidak Tersedia"
+        z_values = [z_scores.get(index) for index in table]
     
+    if all(z is None for z in z_values):
+        return dict(all_missing)
+    
+    classifications = {}
+    for (index, (strict, inclusive, labels)), z in zip(table.items(), z_values):
+        if z is None or z != z:
+            classifications[index] = labels[-1]
+        else:
+            classifications[index] = labels[bisect_right(strict, z) + bisect_left(inclusive, z)]
     return classifications
 
 
+def _label_codes_vec(z_scores: Dict[str, np.ndarray],
+                     labels: Dict[str, Tuple[str, ...]]) -> Dict[str, np.ndarray]:
+    """Translate z-score arrays to label arrays (code -1 picks the N/A label)"""
+    return {
+        index: np.asarray(index_labels)[classify_codes_vec(z_scores[index], index)]
+        for index, index_labels in labels.items()
+    }
+
+
+def classify_permenkes_2020_vec(z_scores: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized Permenkes RI 2020 classification for batch z-score arrays
+    
+    Args:
+        z_scores: Dictionary of z-score arrays from calculate_all_zscores_vec()
+        
+    Returns:
+        Dictionary with arrays of Permenkes classification labels for each index
+    """
+    return _label_codes_vec(z_scores, PERMENKES_LABELS)
+
+
+def classify_who_standards_vec(z_scores: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized WHO Child Growth Standards classification for batch z-score arrays
+    
+    Args:
+        z_scores: Dictionary of z-score arrays from calculate_all_zscores_vec()
+        
+    Returns:
+        Dictionary with arrays of WHO classification labels for each index
+    """
+    return _label_codes_vec(z_scores, WHO_LABELS)
+
+
 # ==============================================================================
 # WHO STANDARDS CLASSIFICATION
 # ==============================================================================
 
-def classify_who_standards(z_scores: Dict[str, Optional[float]]) -> Dict[str, str]:
+def classify_who_standards(z_scores: ZScoreInput) -> Dict[str, str]:
     """
     Classify nutritional status according to WHO Child Growth Standards
     
     Args:
-        z_scores: Dictionary of z-scores from calculate_all_zscores()
+        z_scores: Z-scores from calculate_all_zscores() (dict) or calculate_zscores()
         
     Returns:
         Dictionary with WHO classifications for each index
     """
-    classifications = {}
-    
-    # Weight-for-Age
-    waz = z_scores.get('waz')
-    if waz is not None and not math.isnan(waz):
-        if waz < -3:
-            classifications['waz'] = "Severely underweight"
-        elif waz < -2:
-            classifications['waz'] = "Underweight"
-        elif waz <= 2:
-            classifications['waz'] = "Normal weight"
-        else:
-            classifications['waz'] = "Overweight"
-    else:
-        classifications['waz'] = "N/A"
-    
-    # Height-for-Age
-    haz = z_scores.get('haz')
-    if haz is not None and not math.isnan(haz):
-        if haz < -3:
-            classifications['haz'] = "Severely stunted"
-        elif haz < -2:
-            classifications['haz'] = "Stunted"
-        elif haz <= 3:
-            classifications['haz'] = "Normal height"
-        else:
-            classifications['haz'] = "Tall"
-    else:
-        classifications['haz'] = "N/A"
-    
-    # Weight-for-Height
-    whz = z_scores.get('whz')
-    if whz is not None and not math.isnan(whz):
-        if whz < -3:
-            classifications['whz'] = "Severely wasted"
-        elif whz < -2:
-            classifications['whz'] = "Wasted"
-        elif whz <= 2:
-            classifications['whz'] = "Normal"
-        elif whz <= 3:
-            classifications['whz'] = "Risk of overweight"
-        else:
-            classifications['whz'] = "Overweight"
-    else:
-        classifications['whz'] = "N/A"
-    
-    # BMI-for-Age
-    baz = z_scores.get('baz')
-    if baz is not None and not math.isnan(baz):
-        if baz < -3:
-            classifications['baz'] = "Severely wasted"
-        elif baz < -2:
-            classifications['baz'] = "Wasted"
-        elif baz <= 1:
-            classifications['baz'] = "Normal"
-        elif baz <= 2:
-            classifications['baz'] = "Risk of overweight"
-        elif baz <= 3:
-            classifications['baz'] = "Overweight"
-        else:
-            classifications['baz'] = "Obese"
-    else:
-        classifications['baz'] = "N/A"
-    
-    # Head Circumference-for-Age
-    hcz = z_scores.get('hcz')
-    if hcz is not None and not math.isnan(hcz):
-        if abs(hcz) <= 2:
-            classifications['hcz'] = "Normal"
-        elif hcz < -2:
-            classifications['hcz'] = "Microcephaly"
-        else:
-            classifications['hcz'] = "Macrocephaly"
-    else:
-        classifications['hcz'] = "N/A"
-    
-    return classifications
+    return _classify(z_scores, WHO_TABLE, _ALL_NA_WHO)
 
 
 # ==============================================================================
 # Z-SCORE VALIDATION
 # ==============================================================================
 
-def validate_zscores(z_scores: Dict[str, Optional[float]]) -> tuple:
+# Display names used in validation messages
+_ZNAME_MAP = {
+    'waz': 'WAZ (BB/U)',
+    'haz': 'HAZ (TB/U)',
+    'whz': 'WHZ (BB/TB)',
+    'baz': 'BAZ (IMT/U)',
+    'hcz': 'HCZ (LK/U)'
+}
+
+ZSCORE_WARN_THRESHOLD = 3
+ZSCORE_CRITICAL_THRESHOLD = 5
+
+# bisect_left over these gives 0 = ok, 1 = warning (|Z| > 3), 2 = error (|Z| > 5)
+_SEVERITY_EDGES = (float(ZSCORE_WARN_THRESHOLD), float(ZSCORE_CRITICAL_THRESHOLD))
+
+
+def validate_zscores(z_scores: ZScoreInput) -> tuple:
     """
     Validate z-scores for extreme values that need attention
     
     Args:
-        z_scores: Dictionary of z-scores
+        z_scores: Dictionary of z-scores or a ZScores tuple
         
     Returns:
         Tuple of (errors, warnings)
     """
-    from .utilities import format_zscore
-    
     errors = []
     warnings = []
     
-    warn_threshold = 3
-    critical_threshold = 5
-    
-    for key, z in z_scores.items():
-        if z is None or math.isnan(z):
+    items = zip(ZSCORE_KEYS, z_scores) if isinstance(z_scores, ZScores) else z_scores.items()
+    for key, z in items:
+        # NaN sorts below both edges (severity 0), so only None needs a guard
+        if z is None:
             continue
         
-        name = {
-            'waz': 'WAZ (BB/U)',
-            'haz': 'HAZ (TB/U)',
-            'whz': 'WHZ (BB/TB)',
-            'baz': 'BAZ (IMT/U)',
-            'hcz': 'HCZ (LK/U)'
-        }.get(key, key)
-        
-        abs_z = abs(z)
+        severity = bisect_left(_SEVERITY_EDGES, abs(z))
+        if not severity:
+            continue
         
-        if abs_z > critical_threshold:
-            errors.append(
-                f"🚨 {name} = {format_zscore(z)} sangat ekstrem (|Z| > {critical_threshold}). "
-                f"PENTING: Verifikasi ulang semua pengukuran dan konsultasi dokter anak."
-            )
-        elif abs_z > warn_threshold:
-            warnings.append(
-                f"⚠️ {name} = {format_zscore(z)} di luar rentang umum (|Z| > {warn_threshold}). "
-                f"Verifikasi ulang pengukuran atau konsultasi tenaga kesehatan."
-            )
+        _append_severity_message(errors, warnings, key, z, severity)
     
     return errors, warnings
 
 
+def _append_severity_message(errors: List[str], warnings: List[str],
+                             key: str, z: float, severity: int) -> None:
+    """Add the message for a severity 1 (warning) or 2 (error) z-score"""
+    name = _ZNAME_MAP.get(key, key)
+    
+    if severity == 2:
+        errors.append(
+            f"🚨 {name} = {format_zscore(z)} sangat ekstrem (|Z| > {ZSCORE_CRITICAL_THRESHOLD}). "
+            f"PENTING: Verifikasi ulang semua pengukuran dan konsultasi dokter anak."
+        )
+    else:
+        warnings.append(
+            f"⚠️ {name} = {format_zscore(z)} di luar rentang umum (|Z| > {ZSCORE_WARN_THRESHOLD}). "
+            f"Verifikasi ulang pengukuran atau konsultasi tenaga kesehatan."
+        )
+
+
+# ==============================================================================
+# ONE-PASS REPORT
+# ==============================================================================
+
+class Report(NamedTuple):
+    """Z-scores, both classifications and validation messages of one child"""
+    zscores: Dict[str, Optional[float]]
+    permenkes: Dict[str, str]
+    who: Dict[str, str]
+    errors: List[str]
+    warnings: List[str]
+
+
+# Per index in ZSCORE_KEYS order: (strict edges, inclusive edges, Permenkes
+# labels, WHO labels); both standards share the category edges
+_REPORT_SPECS = tuple(
+    CLASSIFY_EDGES[index] + (PERMENKES_LABELS[index], WHO_LABELS[index])
+    for index in ZSCORE_KEYS
+)
+
+
+def compute_and_classify(sex: str,
+                         age_months: float,
+                         weight: Optional[float],
+                         height: Optional[float],
+                         head_circ: Optional[float]) -> Report:
+    """
+    calculate_all_zscores + both classifiers + validate_zscores in one pass
+    
+    Each z-score is binned once; the category code picks both labels.
+    
+    Args:
+        sex: 'M'/'L' (male) or 'F'/'P' (female)
+        age_months: Age in months
+        weight: Weight in kg
+        height: Height/length in cm
+        head_circ: Head circumference in cm
+        
+    Returns:
+        Report with the same values the four separate calls would return
+    """
+    z_scores = calculate_zscores(sex, age_months, weight, height, head_circ)
+    
+    permenkes = {}
+    who = {}
+    errors = []
+    warnings = []
+    
+    for index, z, (strict, inclusive, permenkes_labels, who_labels) in zip(
+            ZSCORE_KEYS, z_scores, _REPORT_SPECS):
+        if z is None:
+            permenkes[index] = permenkes_labels[-1]
+            who[index] = who_labels[-1]
+            continue
+        
+        code = bisect_right(strict, z) + bisect_left(inclusive, z)
+        permenkes[index] = permenkes_labels[code]
+        who[index] = who_labels[code]
+        
+        severity = bisect_left(_SEVERITY_EDGES, abs(z))
+        if severity:
+            _append_severity_message(errors, warnings, index, z, severity)
+    
+    return Report(z_scores._asdict(), permenkes, who, errors, warnings)
+
+
 # ==============================================================================
 # EASY MODE - NORMAL RANGES REFERENCE
 # ==============================================================================
 
-@lru_cache(maxsize=256)
+def _z_vec_at(indicator: str, age_months: float, sex: str, xs: np.ndarray) -> np.ndarray:
+    """Vectorized z-scores of candidate measurements xs at one age/sex"""
+    return _zscore_vec(indicator, xs, np.full(xs.shape, age_months), np.full(xs.shape, sex))
+
+
+# (range key, LMS indicator, BOUNDS key, decimals, unit)
+_NORMAL_RANGE_SPECS = (
+    ('weight', 'wfa', 'wfa', 2, 'kg'),
+    ('height', 'lhfa', 'hfa', 1, 'cm'),
+    ('head_circ', 'hcfa', 'hcfa', 1, 'cm'),
+)
+
+
+# Ages (months, half-open) covered by the WHO 0-5 year tables per indicator
+_NORMAL_RANGE_AGES = {'wfa': (0.0, 61.0), 'lhfa': (0.0, 61.0), 'hcfa': (0.0, 61.0)}
+
+# (indicator, sex) pairs already reported as uncovered; each is printed once
+_COVERAGE_GAPS = set()
+
+
+def _report_coverage_gap(indicator: str, sex: str, age_months: float) -> None:
+    """Warn once per indicator/sex when an in-range age has no LMS data"""
+    if (indicator, sex) not in _COVERAGE_GAPS:
+        _COVERAGE_GAPS.add((indicator, sex))
+        print(f"⚠️ No LMS coverage for {indicator} ({sex}) at {age_months} months")
+
+
+# (sex, age_months) -> ranges; whole-month callers need 122 entries, and
+# inputs beyond the cap are computed without being stored
+NORMAL_RANGES_CACHE_SIZE = 256
+_NORMAL_RANGES_CACHE: Dict[Tuple[str, float], Dict[str, Dict[str, float]]] = {}
+
+
 def get_normal_ranges(sex: str, age_months: float) -> Dict[str, Dict[str, float]]:
     """
     Get normal ranges for anthropometric measurements at given age
@@ -398,64 +885,61 @@ def get_normal_ranges(sex: str, age_months: float) -> Dict[str, Dict[str, float]
         
     Returns:
         Dictionary with normal ranges for weight, height, head circumference
+        (cached and shared between callers)
     """
-    if calc is None:
+    key = (sex, age_months)
+    ranges = _NORMAL_RANGES_CACHE.get(key)
+    if ranges is None:
+        ranges = _compute_normal_ranges(sex, age_months)
+        if len(_NORMAL_RANGES_CACHE) < NORMAL_RANGES_CACHE_SIZE:
+            _NORMAL_RANGES_CACHE[key] = ranges
+    return ranges
+
+
+def _compute_normal_ranges(sex: str, age_months: float) -> Dict[str, Dict[str, float]]:
+    """Invert the WHO z-scores -2, 0 and +2 into measurement ranges"""
+    sex_code = sex.upper() if isinstance(sex, str) else None
+    if not LMS_TABLES or sex_code not in SEX_CODES:
         return {}
     
-    from .growth_charts import invert_zscore_function
-    from config import BOUNDS
+    from .growth_charts import invert_zscore_targets
     
     ranges = {}
     
-    # Weight-for-Age ranges
-    try:
-        def wfa_func(w):
-            return _safe_z_calc(calc.wfa, w, age_months, sex)
-        
-        lo, hi = BOUNDS['wfa']
-        
-        ranges['weight'] = {
-            'min_normal': round(invert_zscore_function(wfa_func, -2, lo, hi), 2),
-            'median': round(invert_zscore_function(wfa_func, 0, lo, hi), 2),
-            'max_normal': round(invert_zscore_function(wfa_func, 2, lo, hi), 2),
-            'unit': 'kg'
-        }
-    except Exception:
-        pass
-    
-    # Height-for-Age ranges
-    try:
-        def hfa_func(h):
-            return _safe_z_calc(calc.lhfa, h, age_months, sex)
+    for name, indicator, bounds_key, digits, unit in _NORMAL_RANGE_SPECS:
+        age_lo, age_hi = _NORMAL_RANGE_AGES[indicator]
+        if not age_lo <= age_months < age_hi:
+            continue
         
-        lo, hi = BOUNDS['hfa']
+        # Built once per measurement and shared by the three targets;
+        # both read the preloaded LMS tables (same results as pygrowup)
+        z_func = partial(_zscore_lms, indicator, age_months=age_months, sex=sex_code)
+        z_func_vec = partial(_z_vec_at, indicator, float(age_months), sex_code)
+        lo, hi = BOUNDS[bounds_key]
         
-        ranges['height'] = {
-            'min_normal': round(invert_zscore_function(hfa_func, -2, lo, hi), 1),
-            'median': round(invert_zscore_function(hfa_func, 0, lo, hi), 1),
-            'max_normal': round(invert_zscore_function(hfa_func, 2, lo, hi), 1),
-            'unit': 'cm'
-        }
-    except Exception:
-        pass
-    
-    # Head Circumference ranges
-    try:
-        def hcfa_func(hc):
-            return _safe_z_calc(calc.hcfa, hc, age_months, sex)
+        if z_func(lo) is None and z_func(hi) is None:
+            _report_coverage_gap(indicator, sex_code, age_months)
+            continue
         
-        lo, hi = BOUNDS['hcfa']
+        min_normal, median, max_normal = invert_zscore_targets(
+            z_func, (-2, 0, 2), lo, hi, z_func_vec=z_func_vec
+        )
         
-        ranges['head_circ'] = {
-            'min_normal': round(invert_zscore_function(hcfa_func, -2, lo, hi), 1),
-            'median': round(invert_zscore_function(hcfa_func, 0, lo, hi), 1),
-            'max_normal': round(invert_zscore_function(hcfa_func, 2, lo, hi), 1),
-            'unit': 'cm'
+        ranges[name] = {
+            'min_normal': round(min_normal, digits),
+            'median': round(median, digits),
+            'max_normal': round(max_normal, digits),
+            'unit': unit
         }
-    except Exception:
-        pass
     
     return ranges
 
 
+def warm_normal_ranges(max_age_months: int = 60) -> None:
+    """Fill the get_normal_ranges cache for every whole month and both sexes"""
+    for sex in ('M', 'F'):
+        for age in range(max_age_months + 1):
+            get_normal_ranges(sex, age)
+
+
 print("✅ WHO Calculator module loaded")